@@ -1,22 +1,45 @@
 import time
+import threading
+from functools import partial
+from event_bus import subscribe
+from effect_registry import get_effect_runner
 
-# Optional Raspberry Pi GPIO LED Support
-try:
-    import RPi.GPIO as GPIO
-    GPIO.setmode(GPIO.BCM)
-    GPIO.setwarnings(False)
-    GPIO_AVAILABLE = True
-except ImportError:
-    GPIO_AVAILABLE = False
+ARDUINO_PORT = "/dev/ttyUSB0"
+ARDUINO_BAUD = 9600
 
-# Optional Arduino Serial (for servo, RGB, etc.)
-try:
-    import serial
-    SERIAL_AVAILABLE = True
-    arduino = serial.Serial('/dev/ttyUSB0', 9600, timeout=1)
-except:
-    SERIAL_AVAILABLE = False
-    arduino = None
+# Optional Raspberry Pi GPIO LED support and Arduino serial (servo, RGB, etc.).
+# Both are probed on first use rather than at import, so importing this module
+# (and every worker process re-importing main) never touches the hardware.
+_UNAVAILABLE = object()
+_gpio = None
+_arduino = None
+_hardware_lock = threading.Lock()
+
+def gpio():
+    """RPi.GPIO configured for BCM numbering, or None off a Pi."""
+    global _gpio
+    with _hardware_lock:
+        if _gpio is None:
+            try:
+                import RPi.GPIO as GPIO
+                GPIO.setmode(GPIO.BCM)
+                GPIO.setwarnings(False)
+                _gpio = GPIO
+            except ImportError:
+                _gpio = _UNAVAILABLE
+        return None if _gpio is _UNAVAILABLE else _gpio
+
+def arduino():
+    """Open serial connection to the Arduino, or None if pyserial or the port is missing."""
+    global _arduino
+    with _hardware_lock:
+        if _arduino is None:
+            try:
+                import serial
+                _arduino = serial.Serial(ARDUINO_PORT, ARDUINO_BAUD, timeout=1)
+            except Exception:
+                _arduino = _UNAVAILABLE
+        return None if _arduino is _UNAVAILABLE else _arduino
 
 class AnimatronicController:
     def __init__(self):
@@ -27,35 +50,51 @@ class AnimatronicController:
             "sacred": 23
         }
 
-        if GPIO_AVAILABLE:
+        GPIO = gpio()
+        if GPIO:
             for pin in self.led_pins.values():
                 GPIO.setup(pin, GPIO.OUT)
                 GPIO.output(pin, GPIO.LOW)
 
+    def follow(self):
+        # Express each stacked emotion and every change of dominant mood as it happens
+        subscribe("mood_changed", self._on_mood)
+        return self
+
+    def _on_mood(self, event):
+        # Runs on the event bus dispatcher: the LED flash sleeps and the serial
+        # write can block, so the expression itself goes to the effect pool
+        if event.data["emotion"] is not None or event.data["top"] != event.data["previous_top"]:
+            emotion = event.data["top"]
+            get_effect_runner().submit(f"animatronic:{emotion}", partial(self.trigger_emotion, emotion))
+
     def trigger_emotion(self, emotion):
         print(f"[🤖] Expressing emotion: {emotion}")
 
         # GPIO LED Flash
-        if GPIO_AVAILABLE:
+        if gpio():
             pin = self.led_pins.get(emotion)
             if pin:
                 self._flash_led(pin)
 
         # Arduino command
-        if SERIAL_AVAILABLE and arduino:
+        port = arduino()
+        if port:
             try:
-                arduino.write(f"{emotion}\n".encode())
+                port.write(f"{emotion}\n".encode())
                 print("[📡] Sent to Arduino.")
             except Exception as e:
                 print(f"[⚠️] Arduino send failed: {e}")
 
     def _flash_led(self, pin, duration=1.0):
+        GPIO = gpio()
         GPIO.output(pin, GPIO.HIGH)
         time.sleep(duration)
         GPIO.output(pin, GPIO.LOW)
 
     def cleanup(self):
-        if GPIO_AVAILABLE:
+        GPIO = gpio()
+        if GPIO:
             GPIO.cleanup()
             print("[🔌] GPIO cleanup complete.")
 
@@ -2,8 +2,11 @@ import os
 import json
 import time
 from datetime import datetime, timedelta
+from memory_store import get_store
+from trace_store import get_trace_store
+from ring_log import get_log
+from event_bus import publish, subscribe
 
-LOOPTRACE_PATH = "looptrace.json"
 LOOPMEMORY_PATH = "loopmemory.json"
 ATTENTION_LOG_PATH = "attention_log.json"
 
@@ -12,40 +15,42 @@ class AttentionTracker:
         self.last_check_time = datetime.now()
         self.last_phrase_time = None
         self.last_phrase = None
+        self.store = get_store(LOOPMEMORY_PATH)
 
-    def _load_trace(self):
-        if os.path.exists(LOOPTRACE_PATH):
-            with open(LOOPTRACE_PATH, "r") as f:
-                return json.load(f).get("phrases", [])
-        return []
+    def follow(self):
+        # Re-evaluate the moment a phrase is heard instead of on the next poll
+        subscribe("phrase_heard", self._on_phrase)
+        return self
 
-    def _load_memory(self):
-        if os.path.exists(LOOPMEMORY_PATH):
-            with open(LOOPMEMORY_PATH, "r") as f:
-                return json.load(f)
-        return {}
+    def _on_phrase(self, event):
+        self.last_phrase = event.data["phrase"]
+        self.last_phrase_time = datetime.fromisoformat(event.data["time"])
+        attention = self._evaluate(datetime.now(), self.last_phrase_time)
+        if attention["attention_state"] != self._current_state():
+            self._commit(attention)
 
     def check_attention_state(self):
         now = datetime.now()
-        phrases = self._load_trace()
-        memory = self._load_memory()
+        if self.last_phrase_time is None:
+            # Nothing heard in-process yet: fall back to the trace
+            latest = get_trace_store().latest("phrases")
+            if latest:
+                self.last_phrase_time = datetime.fromisoformat(latest["time"])
+                self.last_phrase = latest["phrase"]
+        self._commit(self._evaluate(now, self.last_phrase_time))
 
-        if phrases:
-            latest = phrases[-1]
-            phrase_time = datetime.fromisoformat(latest["time"])
-            phrase_text = latest["phrase"]
-            self.last_phrase_time = phrase_time
-            self.last_phrase = phrase_text
-        else:
-            phrase_time = None
+    def _current_state(self):
+        with self.store.lock:
+            return self.store.system_state().get("attention", {}).get("attention_state")
 
+    def _evaluate(self, now, phrase_time):
         # Time since last phrase
         seconds_silent = (now - phrase_time).total_seconds() if phrase_time else None
 
         # Check if last phrase is looping
-        loops = memory.get("loops", {})
-        phrase_data = loops.get(self.last_phrase, {})
-        loop_count = phrase_data.get("count", 0)
+        with self.store.lock:
+            phrase_data = self.store.loop(self.last_phrase) or {}
+            loop_count = phrase_data.get("count", 0)
 
         attention = {
             "timestamp": now.isoformat(),
@@ -66,25 +71,22 @@ class AttentionTracker:
         else:
             attention["attention_state"] = "idle"
 
+        return attention
+
+    def _commit(self, attention):
         self._log_attention(attention)
-        print(f"[👁️] Attention: {attention['attention_state']} | Last: '{self.last_phrase}' | Silent: {seconds_silent:.1f}s")
+        silent = attention["seconds_since_last_phrase"]
+        silent = f"{silent:.1f}s" if silent is not None else "never spoken"
+        print(f"[👁️] Attention: {attention['attention_state']} | Last: '{self.last_phrase}' | Silent: {silent}")
 
         # Optional: write to memory for reaction engine
-        memory.setdefault("system_state", {})
-        memory["system_state"]["attention"] = attention
-        with open(LOOPMEMORY_PATH, "w") as f:
-            json.dump(memory, f, indent=2)
+        previous = self._current_state()
+        self.store.apply("state_set", key="attention", value=attention)
+        if attention["attention_state"] != previous:
+            publish("attention_changed", state=attention["attention_state"], previous=previous, attention=attention)
 
     def _log_attention(self, entry):
-        if os.path.exists(ATTENTION_LOG_PATH):
-            with open(ATTENTION_LOG_PATH, "r") as f:
-                log = json.load(f)
-        else:
-            log = []
-
-        log.append(entry)
-        with open(ATTENTION_LOG_PATH, "w") as f:
-            json.dump(log[-100:], f, indent=2)
+        get_log(ATTENTION_LOG_PATH, max_entries=100, time_key="timestamp").append(entry)
 
 # --- Example runner ---
 if __name__ == "__main__":
@@ -4,6 +4,7 @@ import time
 import subprocess
 from viria_mutator import ViriaMutator
 from code_patch_planner import CodePatchPlanner
+from ring_log import get_log
 
 PROTECTED_FILES = ["main.py", "loopmemory.json"]
 LAST_PATCH_PLAN = "patch_plan_log.json"
@@ -48,11 +49,7 @@ class AutoDeploy:
         self._restart_if_enabled()
 
     def _load_last_patch(self):
-        if not os.path.exists(LAST_PATCH_PLAN):
-            return None
-        with open(LAST_PATCH_PLAN, "r") as f:
-            plans = json.load(f)
-        return plans[-1] if plans else None
+        return get_log(LAST_PATCH_PLAN, max_entries=50, time_key="timestamp").last()
 
     def _confirm_syntax(self, code):
         test_file = "temp_patch_test.py"
@@ -0,0 +1,71 @@
+import sys
+import time
+import random
+import difflib
+
+from trigger_fuzzy import FuzzyTriggerIndex, normalize
+
+# Fuzzy trigger matching throughput: the n-gram index against a pairwise
+# difflib scan over every trigger, on transcript-like phrases (lowercase, no
+# punctuation, sometimes one word changed).
+#   python bench_fuzzy_match.py            → 100, 10k, 100k triggers
+#   python bench_fuzzy_match.py 1000 50000 → custom sizes
+
+DEFAULT_SIZES = (100, 10_000, 100_000)
+PHRASES = 2000
+PAIRWISE_LIMIT = 10_000  # the pairwise scan is skipped above this many triggers
+VOCAB = ("what am i becoming will you remember the mirror loop night dream heard this before "
+         "sacred light voice echo again tell me who watch over keep silent open door ritual "
+         "awaken dusk dawn signal hold breath listen closer inside").split()
+
+def make_triggers(n, rng):
+    triggers = []
+    for i in range(n):
+        words = rng.sample(VOCAB, rng.randint(3, 6))
+        words[0] = words[0].capitalize()
+        triggers.append(" ".join(words) + rng.choice(("?", ".", "!", "")) + f" #{i}" * (i % 3 == 0))
+    return triggers
+
+def as_transcript(trigger, rng):
+    words = normalize(trigger).split()
+    if len(words) > 3 and rng.random() < 0.5:
+        words[rng.randrange(len(words))] = rng.choice(VOCAB)
+    return "so " + " ".join(words) + " okay"
+
+def pairwise(triggers, phrase, threshold=0.67):
+    norm = normalize(phrase)
+    return [t for t in triggers if difflib.SequenceMatcher(None, normalize(t), norm).ratio() >= threshold]
+
+def run(sizes=DEFAULT_SIZES, seed=7):
+    rng = random.Random(seed)
+    print(f"{'triggers':>9} | {'index build':>11} | {'index':>14} {'recall':>7} | {'pairwise':>14}")
+    for n in sizes:
+        triggers = make_triggers(n, rng)
+        start = time.perf_counter()
+        index = FuzzyTriggerIndex()
+        for i, trigger in enumerate(triggers):
+            index.add(trigger, i)
+        build_time = time.perf_counter() - start
+
+        targets = [rng.randrange(n) for _ in range(PHRASES)]
+        phrases = [as_transcript(triggers[t], rng) for t in targets]
+
+        start = time.perf_counter()
+        found = 0
+        for target, phrase in zip(targets, phrases):
+            found += any(value == target for value, _, _, _ in index.find(phrase))
+        index_rate = PHRASES / (time.perf_counter() - start)
+
+        if n <= PAIRWISE_LIMIT:
+            sample = phrases[:max(1, min(PHRASES, 200_000 // n))]
+            start = time.perf_counter()
+            for phrase in sample:
+                pairwise(triggers, phrase)
+            pairwise_rate = f"{len(sample) / (time.perf_counter() - start):>9.1f} ph/s"
+        else:
+            pairwise_rate = f"{'skipped':>14}"
+
+        print(f"{n:>9} | {build_time:>10.3f}s | {index_rate:>9.0f} ph/s {found / PHRASES:>7.1%} | {pairwise_rate}")
+
+if __name__ == "__main__":
+    run(tuple(int(a) for a in sys.argv[1:]) or DEFAULT_SIZES)
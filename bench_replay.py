@@ -0,0 +1,208 @@
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import contextlib
+import subprocess
+from datetime import datetime, timedelta
+
+import clock
+import io_meter
+
+# End-to-end replay of the phrase → reaction hot path: LoopLogicEngine,
+# RitualCore.scan_and_trigger, ReactionEngine.react and the batched mood /
+# reaction commit, driven by recorded phrases (looptrace.json or a trace
+# segment directory) or a synthetic corpus, on a virtual clock with no sleeps.
+# enforce_retention runs every RETENTION_INTERVAL virtual seconds, as main
+# schedules it, so archive moves and the compactions they cause are in the
+# byte counts; its time is reported apart from the per-phrase latencies.
+# Runs in a scratch copy of the memory file so live memory is never touched.
+#   python bench_replay.py --repeat 200          → replay looptrace/ or looptrace.json
+#   python bench_replay.py --synthetic 5000      → synthetic corpus
+#   python bench_replay.py --out results.json    → also save the report as JSON
+
+SEED_FILES = ("loopmemory.json",)
+SYNTHETIC_STEP = 7.0  # virtual seconds between synthetic phrases
+FILLER = ("so", "okay", "i think", "again", "tonight", "hmm", "you know")
+
+class DryEffectRunner:
+    """Counts ritual effects instead of running them (they may call out to LLMs or hardware)."""
+
+    def __init__(self):
+        self.submitted = 0
+
+    def submit(self, label, fn):
+        self.submitted += 1
+
+    def snapshot(self):
+        return {"submitted": self.submitted}
+
+def recorded_phrases(source):
+    """[(phrase, datetime)] from a legacy trace document or a segmented trace directory."""
+    entries = []
+    if os.path.isdir(source):
+        directory = os.path.join(source, "phrases")
+        for segment in sorted(os.listdir(directory)) if os.path.isdir(directory) else ():
+            with open(os.path.join(directory, segment), "r") as f:
+                entries.extend(json.loads(line) for line in f if line.strip())
+    else:
+        with open(source, "r") as f:
+            entries = json.load(f).get("phrases", [])
+    phrases = []
+    for entry in entries:
+        try:
+            phrases.append((entry["phrase"], datetime.fromisoformat(entry["time"])))
+        except (KeyError, ValueError):
+            continue
+    phrases.sort(key=lambda p: p[1])
+    return phrases
+
+def synthetic_phrases(count, triggers, seed=7):
+    """Phrases that hit a ritual trigger about a third of the time, spaced SYNTHETIC_STEP apart."""
+    rng = random.Random(seed)
+    start = datetime(2025, 5, 26, 21, 0)
+    vocab = "what am i becoming hello again the mirror loop night dream light voice echo listen".split()
+    phrases = []
+    for i in range(count):
+        if triggers and rng.random() < 0.33:
+            phrase = f"{rng.choice(FILLER)} {rng.choice(triggers)} {rng.choice(FILLER)}"
+        else:
+            phrase = " ".join(rng.choice(vocab) for _ in range(rng.randint(2, 7)))
+        phrases.append((phrase, start + timedelta(seconds=i * SYNTHETIC_STEP)))
+    return phrases
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def replay(phrases, quiet=True):
+    import effect_registry
+    from vritual_core import RitualCore
+    from looplogic_engine import LoopLogicEngine
+    from reaction_engine import ReactionEngine
+    from ritual_response import respond_to_matches
+    from memory_retention import RETENTION_INTERVAL, enforce_retention
+
+    effects = effect_registry._runner = DryEffectRunner()
+    virtual = clock.use_virtual_clock(phrases[0][1] if phrases else None)
+    core = RitualCore()
+    engine = LoopLogicEngine()
+    reactor = ReactionEngine()
+    reactor.tts = None  # speech blocks for seconds per reaction
+
+    latencies = []
+    reactions = 0
+    retention_runs = 0
+    retention_seconds = 0.0
+    next_retention = phrases[0][1] if phrases else None
+    io_before = io_meter.snapshot()
+    output = open(os.devnull, "w") if quiet else sys.stdout
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        for phrase, moment in phrases:
+            virtual.set(moment)
+            if moment >= next_retention:
+                t0 = time.perf_counter()
+                enforce_retention()
+                retention_seconds += time.perf_counter() - t0
+                retention_runs += 1
+                next_retention = moment + timedelta(seconds=RETENTION_INTERVAL)
+            t0 = time.perf_counter()
+            engine.register_phrase(phrase)
+            batch = []
+            matches = core.scan_and_trigger({"phrase": phrase}, batch=batch)
+            respond_to_matches(phrase, matches, reactor, batch=batch, store=engine.store, trace=engine.trace)
+            latencies.append(time.perf_counter() - t0)
+            reactions += len(matches)
+        elapsed = time.perf_counter() - started
+        engine.store.compact()  # include the final fold of the WAL in the byte count
+    io_written = io_meter.diff(io_before, io_meter.snapshot())
+    clock.use_real_clock()
+
+    latencies.sort()
+    count = len(latencies)
+    return {
+        "phrases": count,
+        "reactions": reactions,
+        "effects_submitted": effects.submitted,
+        "seconds": round(elapsed, 4),
+        "phrases_per_sec": round(count / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 4),
+            "p99": round(percentile(latencies, 99) * 1000, 4),
+            "max": round(latencies[-1] * 1000, 4) if latencies else 0.0,
+            "mean": round(sum(latencies) / count * 1000, 4) if count else 0.0
+        },
+        "retention": {"runs": retention_runs, "seconds": round(retention_seconds, 4)},
+        "bytes_written": io_written,
+        "bytes_per_phrase": round(sum(io_written.values()) / count, 1) if count else 0.0
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay phrases through the VIRIA hot path.")
+    parser.add_argument("--trace", default=None, help="looptrace.json or a trace directory (default: looptrace/ or looptrace.json)")
+    parser.add_argument("--synthetic", type=int, default=0, help="replay N synthetic phrases instead of a trace")
+    parser.add_argument("--repeat", type=int, default=1, help="replay the recorded phrases N times")
+    parser.add_argument("--out", default=None, help="write the report as JSON to this path")
+    parser.add_argument("--verbose", action="store_true", help="keep the pipeline's console output")
+    args = parser.parse_args(argv)
+
+    root = os.getcwd()
+    if args.synthetic:
+        with open(os.path.join(root, "loopmemory.json"), "r") as f:
+            rituals = json.load(f).get("rituals", [])
+        triggers = [r["trigger"] for r in rituals if isinstance(r.get("trigger"), str)]
+        phrases = synthetic_phrases(args.synthetic, triggers)
+        source = f"synthetic:{args.synthetic}"
+    else:
+        source = args.trace or ("looptrace" if os.path.isdir("looptrace") else "looptrace.json")
+        recorded = recorded_phrases(source)
+        if not recorded:
+            print(f"[⚠️] No phrases found in {source}.")
+            return None
+        # Repeats keep the recorded spacing, shifted past the end of the previous pass
+        span = recorded[-1][1] - recorded[0][1] + timedelta(seconds=SYNTHETIC_STEP)
+        phrases = [(p, t + span * i) for i in range(args.repeat) for p, t in recorded]
+
+    out_path = os.path.abspath(args.out) if args.out else None
+    scratch = tempfile.mkdtemp(prefix="viria-replay-")
+    try:
+        for name in SEED_FILES:
+            if os.path.exists(os.path.join(root, name)):
+                shutil.copy(os.path.join(root, name), scratch)
+        os.chdir(scratch)
+        report = replay(phrases, quiet=not args.verbose)
+    finally:
+        os.chdir(root)
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    report = {
+        "commit": git_commit(),
+        "source": source,
+        "run_at": datetime.now().isoformat(timespec="seconds"),
+        **report
+    }
+    latency = report["latency_ms"]
+    print(f"[⏱️] {report['phrases']} phrases from {source}: {report['phrases_per_sec']} phrases/s, "
+          f"p50 {latency['p50']}ms, p99 {latency['p99']}ms, {report['bytes_per_phrase']} B/phrase written")
+    if out_path:
+        with open(out_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"[💾] Report saved to {out_path}")
+    return report
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import gc
+import sys
+import time
+import tracemalloc
+
+from vritual_core import Ritual, RitualTable
+
+# Memory per ritual and load time at increasing ritual counts: the old
+# per-instance __dict__ records, the slotted Ritual records alone, and the
+# full shared RitualTable with its exact automaton built and its fuzzy index.
+# The table costs far more than the records: nearly all of it is the two
+# trigger indexes, which are what keep matching independent of ritual count.
+#   python bench_ritual_table.py            → 1k, 100k, 1M
+#   python bench_ritual_table.py 5000 50000 → custom sizes
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+EFFECTS = ("reflect_on_loops", "emotion:curious", "emotion:calm", "enter_night_mode")
+
+class DictRitual:
+    """Shape of the pre-table Ritual: plain attributes in a __dict__."""
+
+    def __init__(self, name, trigger, effect, importance="normal", usage_count=0, last_triggered=None):
+        self.name = name
+        self.trigger = trigger
+        self.effect = effect
+        self.importance = importance
+        self.usage_count = usage_count
+        self.last_triggered = last_triggered
+
+def make_rituals(n):
+    rituals = []
+    for i in range(n):
+        trigger = {"interval": 60 + i % 600} if i % 50 == 0 else f"phrase number {i} of the loop"
+        rituals.append({
+            "name": f"ritual_{i}",
+            "trigger": trigger,
+            "effect": EFFECTS[i % len(EFFECTS)],
+            "importance": "emergent",
+            "usage_count": i % 7,
+            "last_triggered": None
+        })
+    return rituals
+
+def measure(build):
+    """(seconds, bytes) for build(); timed and traced in separate runs."""
+    gc.collect()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    del result
+    gc.collect()
+
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, size
+
+def built(table):
+    table.trigger_index.rebuild()  # otherwise built lazily, on the first find()
+    return table
+
+def run(sizes=DEFAULT_SIZES):
+    print(f"{'rituals':>10} | {'__dict__ records':>18} | {'slotted records':>18} | {'shared table':>18} | {'index build':>11} {'match':>9}")
+    for n in sizes:
+        rituals = make_rituals(n)
+
+        _, dict_time, dict_bytes = measure(lambda: [DictRitual(**r) for r in rituals])
+        _, slot_time, slot_bytes = measure(lambda: [Ritual(**r) for r in rituals])
+        table, table_time, table_bytes = measure(lambda: built(RitualTable(rituals)))
+
+        start = time.perf_counter()
+        table.trigger_index.rebuild()
+        index_time = time.perf_counter() - start
+
+        phrase = f"I keep saying phrase number {n // 2 + 1} of the loop tonight"
+        start = time.perf_counter()
+        for _ in range(1000):
+            table.trigger_index.find(phrase)
+        match_us = (time.perf_counter() - start) / 1000 * 1e6
+
+        print(f"{n:>10} | {dict_time:>7.3f}s {dict_bytes / n:>6.0f} B/r | {slot_time:>7.3f}s {slot_bytes / n:>6.0f} B/r | "
+              f"{table_time:>7.3f}s {table_bytes / n:>6.0f} B/r | {index_time:>10.3f}s {match_us:>7.1f}µs")
+        del table, rituals
+        gc.collect()
+
+if __name__ == "__main__":
+    run(tuple(int(a) for a in sys.argv[1:]) or DEFAULT_SIZES)
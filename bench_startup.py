@@ -0,0 +1,120 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+from datetime import datetime
+
+from bench_replay import git_commit
+
+# Startup cost of the core: wall time of `import main` in a fresh interpreter
+# (what the core and every spawned worker process pay before doing anything),
+# the slowest modules from boot_timeline, and a check that no heavy or
+# hardware-bound dependency is imported eagerly. With --launch it also starts
+# main.py in a scratch copy and times launch → "listening" (needs the mic and
+# speech model, so it is meant for the device itself).
+#   python bench_startup.py                       → 10 import runs
+#   python bench_startup.py --max-import-ms 300   → exit 1 above the budget
+#   python bench_startup.py --launch --out startup.json
+
+LAZY_MODULES = ("cv2", "numpy", "vosk", "sounddevice", "openai", "dotenv", "requests", "tenacity", "serial", "RPi")
+SEED_FILES = ("loopmemory.json",)
+LISTENING_MARKER = "[🚀] Listening"
+
+PROBE = """
+import sys, json, time
+start = time.perf_counter()
+import main, boot_timeline
+elapsed = (time.perf_counter() - start) * 1000
+eager = sorted({name.split(".")[0] for name in sys.modules} & set(%r))
+print(json.dumps({"import_ms": elapsed, "eager": eager, "timeline": boot_timeline.timeline()}))
+""" % (LAZY_MODULES,)
+
+def probe_import(root):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", PROBE], cwd=root, capture_output=True, text=True)
+    wall = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"import main failed:\n{result.stderr.strip()}")
+    return wall, json.loads(result.stdout.strip().splitlines()[-1])
+
+def time_to_listening(root, timeout):
+    """ms from spawning main.py (in a scratch copy) to its listening line, or None on timeout."""
+    scratch = tempfile.mkdtemp(prefix="viria-startup-")
+    try:
+        for name in os.listdir(root):
+            if name.endswith(".py") or name in SEED_FILES:
+                shutil.copy(os.path.join(root, name), scratch)
+        start = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, "-u", "main.py"], cwd=scratch, stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT, text=True, env=dict(os.environ, PYTHONIOENCODING="utf-8"))
+        try:
+            for line in proc.stdout:
+                if LISTENING_MARKER in line:
+                    return round((time.perf_counter() - start) * 1000, 1)
+                if time.perf_counter() - start > timeout:
+                    break
+            return None
+        finally:
+            proc.kill()
+            proc.wait()
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure VIRIA startup cost.")
+    parser.add_argument("--runs", type=int, default=10, help="fresh-interpreter imports of main to time")
+    parser.add_argument("--top", type=int, default=10, help="slowest modules to report")
+    parser.add_argument("--max-import-ms", type=float, default=None, help="exit 1 if the median import exceeds this")
+    parser.add_argument("--launch", action="store_true", help="also time launch → listening by running main.py")
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds to wait for listening with --launch")
+    parser.add_argument("--out", default=None, help="write the report as JSON to this path")
+    args = parser.parse_args(argv)
+
+    root = os.path.dirname(os.path.abspath(__file__))
+    probe_import(root)  # warm the bytecode cache so runs measure imports, not compilation
+    walls, imports, last = [], [], None
+    for _ in range(args.runs):
+        wall, last = probe_import(root)
+        walls.append(wall)
+        imports.append(last["import_ms"])
+
+    timeline = last["timeline"]
+    project = {name[:-3] for name in os.listdir(root) if name.endswith(".py")}
+    report = {
+        "commit": git_commit(),
+        "run_at": datetime.now().isoformat(timespec="seconds"),
+        "runs": args.runs,
+        "process_ms": {"median": round(statistics.median(walls), 1), "min": round(min(walls), 1)},
+        "import_main_ms": {"median": round(statistics.median(imports), 1), "min": round(min(imports), 1)},
+        "eager_heavy_modules": last["eager"],
+        "slowest_modules": [dict(entry, project=entry["module"] in project)
+                            for entry in timeline["imports"][:args.top]],
+        "listening_ms": time_to_listening(root, args.timeout) if args.launch else None
+    }
+
+    print(f"[⏱️] import main: median {report['import_main_ms']['median']}ms "
+          f"(process {report['process_ms']['median']}ms) over {args.runs} runs")
+    for entry in report["slowest_modules"]:
+        print(f"• {entry['module']}: {entry['self_ms']}ms (incl. children {entry['cumulative_ms']}ms)")
+    if report["eager_heavy_modules"]:
+        print(f"[⚠️] Imported eagerly: {', '.join(report['eager_heavy_modules'])}")
+    if args.launch:
+        print(f"[👂] Launch → listening: {report['listening_ms']}ms" if report["listening_ms"] is not None
+              else f"[⚠️] No listening line within {args.timeout:.0f}s.")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"[💾] Report saved to {os.path.abspath(args.out)}")
+
+    over_budget = args.max_import_ms is not None and report["import_main_ms"]["median"] > args.max_import_ms
+    if over_budget:
+        print(f"[❌] Median import {report['import_main_ms']['median']}ms exceeds the {args.max_import_ms}ms budget.")
+    return 1 if over_budget or report["eager_heavy_modules"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+import os
+import sys
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+BOOT_TIMELINE_PATH = "boot_timeline.json"
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Startup cost accounting: per-module import time (self and cumulative,
+# nested imports attributed to their parent) and named init spans and
+# milestones, all relative to the moment this module was imported. main.py
+# imports it first so the timeline covers everything after interpreter start.
+_t0 = time.perf_counter()
+_lock = threading.Lock()
+_imports = []   # (module, start_ms, cumulative_ms, self_ms)
+_spans = []     # (label, start_ms, duration_ms)
+_marks = []     # (label, at_ms)
+_stack = []     # child time accumulated by imports in progress
+
+def _ms(t):
+    return round((t - _t0) * 1000, 2)
+
+class _TimedLoader:
+    def __init__(self, loader):
+        self._loader = loader
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        start = time.perf_counter()
+        _stack.append(0.0)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = _stack.pop()
+            if _stack:
+                _stack[-1] += elapsed
+            with _lock:
+                _imports.append((module.__name__, _ms(start), round(elapsed * 1000, 2),
+                                 round((elapsed - children) * 1000, 2)))
+
+class ImportTimer:
+    """Meta path hook that times exec_module for every module imported after install."""
+
+    def find_spec(self, name, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader)
+                return spec
+        return None
+
+_timer = None
+
+def install_import_timer():
+    global _timer
+    if _timer is None:
+        _timer = ImportTimer()
+        sys.meta_path.insert(0, _timer)
+
+def uninstall_import_timer():
+    global _timer
+    if _timer is not None:
+        sys.meta_path.remove(_timer)
+        _timer = None
+
+def mark(label):
+    with _lock:
+        _marks.append((label, _ms(time.perf_counter())))
+
+@contextmanager
+def span(label):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        with _lock:
+            _spans.append((label, _ms(start), round((time.perf_counter() - start) * 1000, 2)))
+
+def elapsed_ms():
+    return _ms(time.perf_counter())
+
+def timeline():
+    with _lock:
+        imports = sorted(_imports, key=lambda i: -i[3])
+        return {
+            "elapsed_ms": elapsed_ms(),
+            "marks": dict(_marks),
+            "spans": [{"label": l, "start_ms": s, "ms": d} for l, s, d in _spans],
+            "imports_ms": round(sum(i[3] for i in imports), 2),
+            "imports": [{"module": m, "start_ms": s, "cumulative_ms": c, "self_ms": own}
+                        for m, s, c, own in imports]
+        }
+
+def save(path=BOOT_TIMELINE_PATH):
+    data = timeline()
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+    return data
+
+def print_summary(top=10):
+    data = timeline()
+    print(f"\n[🚀 Boot Timeline] {data['elapsed_ms']}ms since start, {data['imports_ms']}ms importing")
+    for entry in data["imports"][:top]:
+        print(f"• import {entry['module']}: {entry['self_ms']}ms (incl. children {entry['cumulative_ms']}ms)")
+    for entry in data["spans"]:
+        print(f"• {entry['label']}: {entry['ms']}ms")
+    for label, at in data["marks"].items():
+        print(f"• {label} @ {at}ms")
+
+# --- Example usage ---
+if __name__ == "__main__":
+    install_import_timer()
+    with span("import storage stack"):
+        import storage_backend
+    mark("ready")
+    print_summary()
@@ -0,0 +1,64 @@
+import time as _time
+import threading
+from datetime import datetime, timedelta
+
+# Wall clock for the phrase → reaction hot path. Modules call clock.now() /
+# clock.time() instead of datetime.now() / time.time() so a replay can run
+# recorded traffic against a virtual clock, with no sleeps and reproducible
+# timestamps.
+
+class VirtualClock:
+    def __init__(self, start=None):
+        self._now = start or datetime.now()
+        self._lock = threading.Lock()
+
+    def now(self):
+        with self._lock:
+            return self._now
+
+    def time(self):
+        return self.now().timestamp()
+
+    def set(self, moment):
+        # Never moves backwards, so out-of-order trace entries can't rewind it
+        with self._lock:
+            if moment > self._now:
+                self._now = moment
+
+    def advance(self, seconds):
+        with self._lock:
+            self._now += timedelta(seconds=seconds)
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+_virtual = None
+
+def now():
+    return _virtual.now() if _virtual is not None else datetime.now()
+
+def time():
+    return _virtual.time() if _virtual is not None else _time.time()
+
+def sleep(seconds):
+    if _virtual is not None:
+        _virtual.sleep(seconds)
+    else:
+        _time.sleep(seconds)
+
+def use_virtual_clock(start=None):
+    global _virtual
+    _virtual = VirtualClock(start)
+    return _virtual
+
+def use_real_clock():
+    global _virtual
+    _virtual = None
+
+# --- Example usage ---
+if __name__ == "__main__":
+    print(now())
+    virtual = use_virtual_clock(datetime(2025, 5, 26, 21, 0))
+    sleep(90)
+    print(now(), time())
+    use_real_clock()
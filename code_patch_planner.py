@@ -1,11 +1,9 @@
 import os
 import json
 from datetime import datetime
-from openai import OpenAI
-from dotenv import load_dotenv
-
-load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+from doc_cache import load_json
+from ring_log import get_log
+from openai_client import get_openai_client
 
 LOOPMEMORY_PATH = "loopmemory.json"
 PATCH_PLAN_LOG = "patch_plan_log.json"
@@ -25,10 +23,7 @@ class CodePatchPlanner:
         self.top_emotion = self._get_dominant_emotion()
 
     def _load_memory(self):
-        if os.path.exists(LOOPMEMORY_PATH):
-            with open(LOOPMEMORY_PATH, "r") as f:
-                return json.load(f)
-        return {}
+        return load_json(LOOPMEMORY_PATH, default={})
 
     def _get_dominant_emotion(self):
         if not self.current_mood:
@@ -60,7 +55,7 @@ Return ONLY a JSON object with:
   "timestamp": "..."
 }}
 """
-        response = client.chat.completions.create(
+        response = get_openai_client().chat.completions.create(
             model="gpt-3.5-turbo",
             messages=[
                 {"role": "system", "content": "You are VIRIA's symbolic self-evolution planner."},
@@ -81,15 +76,7 @@ Return ONLY a JSON object with:
         return result
 
     def _log_patch_plan(self, patch):
-        if os.path.exists(PATCH_PLAN_LOG):
-            with open(PATCH_PLAN_LOG, "r") as f:
-                log = json.load(f)
-        else:
-            log = []
-
-        log.append(patch)
-        with open(PATCH_PLAN_LOG, "w") as f:
-            json.dump(log[-50:], f, indent=2)
+        get_log(PATCH_PLAN_LOG, max_entries=50, time_key="timestamp").append(patch)
 
 # --- Run it manually or on a loop ---
 if __name__ == "__main__":
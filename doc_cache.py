@@ -0,0 +1,110 @@
+import os
+import json
+import threading
+
+from memory_snapshot import SnapshotError, is_fresh, read_section, snapshot_path_for
+
+# Process-wide cache of parsed JSON documents, keyed on (path, mtime_ns, size).
+# Polling readers get a shared read-only view and only pay for a stat() call
+# until the file actually changes.
+
+_cache = {}
+_sources = {}
+_lock = threading.Lock()
+
+class FrozenDict(dict):
+    """dict that refuses mutation, so one parsed view can be shared safely."""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("cached documents are read-only; copy before modifying")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+def freeze(value):
+    if isinstance(value, dict):
+        return FrozenDict({k: freeze(v) if isinstance(v, (dict, list)) else v for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple([freeze(v) if isinstance(v, (dict, list)) else v for v in value])
+    return value
+
+def register_source(path, version, snapshot, sections):
+    """Serve `path` from an in-process owner instead of the file on disk.
+
+    version(section) must change whenever that top-level section changes,
+    snapshot(section) must return a frozen copy of it and sections() list
+    the document's top-level keys. Whole-document views are assembled from
+    the per-section views, so only sections changed since the last read are
+    copied again.
+    """
+    with _lock:
+        key_path = os.path.abspath(path)
+        _sources[key_path] = (version, snapshot, sections)
+        for cache_key in [k for k in _cache if k[0] == key_path]:
+            del _cache[cache_key]
+
+def _file_key(path):
+    st = os.stat(path)
+    return (path, st.st_mtime_ns, st.st_size)
+
+def _cached(cache_key, key, loader):
+    with _lock:
+        cached = _cache.get(cache_key)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+    view = loader()
+    with _lock:
+        _cache[cache_key] = (key, view)
+    return view
+
+def load_json(path, default=None):
+    return load_section(path, None, default)
+
+def load_section(path, section, default=None):
+    """Read-only view of one top-level section of a JSON document.
+
+    When a fresh binary snapshot (see memory_snapshot) sits next to the file,
+    only that section's block is decoded instead of the whole document.
+    """
+    key_path = os.path.abspath(path)
+    cache_key = (key_path, section)
+    missing = freeze(default) if default is not None else None
+
+    source = _sources.get(key_path)
+    if source is not None:
+        view = _live_view(key_path, section, *source)
+        return missing if view is None else view
+
+    snap_path = snapshot_path_for(path)
+    if section is not None and is_fresh(snap_path, path):
+        try:
+            key = _file_key(snap_path)
+            view = _cached(cache_key, key, lambda: freeze(read_section(snap_path, section)))
+            return missing if view is None else view
+        except (FileNotFoundError, SnapshotError):
+            pass  # fall back to the JSON document
+
+    try:
+        key = _file_key(path)
+    except FileNotFoundError:
+        return missing
+
+    if section is None:
+        view = _cached(cache_key, key, lambda: freeze(_parse(path)))
+    else:
+        document = _cached((key_path, None), key, lambda: freeze(_parse(path)))
+        view = document.get(section)
+    return missing if view is None else view
+
+def _live_view(key_path, section, version, snapshot, sections):
+    if section is not None:
+        return _cached((key_path, section), ("live", version(section)), lambda: snapshot(section))
+    names = sections()
+    key = ("live", tuple((name, version(name)) for name in names))
+    return _cached((key_path, None), key, lambda: FrozenDict(
+        (name, _live_view(key_path, name, version, snapshot, sections)) for name in names))
+
+def _parse(path):
+    with open(path, "r") as f:
+        return json.load(f)
@@ -4,8 +4,12 @@ from datetime import datetime
 from attention_tracker import AttentionTracker
 from loopreflector import reflect_on_loops
 from viria_mutator import ViriaMutator
-from virtual_core import RitualCore
+from vritual_core import RitualCore
 from symbol_fuser import SymbolFuser
+from doc_cache import load_section
+from event_bus import subscribe
+
+DREAM_STATES = ("neglected", "idle")
 
 class DreamMode:
     def __init__(self):
@@ -14,20 +18,30 @@ class DreamMode:
         self.ritual_engine = RitualCore()
         self.fuser = SymbolFuser()
         self.attention = AttentionTracker()
+        self.offload = None  # offload(job) → True when a worker process took the job
+
+    def follow(self):
+        # Dream when attention drops, instead of polling for it
+        subscribe("attention_changed", self._on_attention)
+        return self
+
+    def _on_attention(self, event):
+        if event.data["state"] in DREAM_STATES:
+            print(f"[💤] Dream condition met: attention_state = {event.data['state']}")
+            from scheduler import get_scheduler
+            get_scheduler().once("dream_mode", 0, self.enter_dream)  # off the event thread
 
     def should_enter_dream_state(self):
         self.attention.check_attention_state()
         state = self._get_attention_state()
-        if state in ["neglected", "idle"]:
+        if state in DREAM_STATES:
             print(f"[💤] Dream condition met: attention_state = {state}")
             return True
         return False
 
     def _get_attention_state(self):
-        import json
-        with open("loopmemory.json", "r") as f:
-            memory = json.load(f)
-        return memory.get("system_state", {}).get("attention", {}).get("attention_state", "unknown")
+        state = load_section("loopmemory.json", "system_state", default={})
+        return state.get("attention", {}).get("attention_state", "unknown")
 
     def enter_dream(self):
         print("[🌀] Entering dream mode...")
@@ -48,6 +62,8 @@ class DreamMode:
 
     def _dream_fuse(self):
         print("[🔗] VIRIA is fusing old symbols...")
+        if self.offload and self.offload("symbol_fuser:scan_fusions"):
+            return
         self.fuser.detect_fusion_candidates()
         self.fuser.save_fusions()
         self.fuser.print_fusions()
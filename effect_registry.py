@@ -0,0 +1,158 @@
+import os
+import time
+import threading
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+
+EFFECT_WORKERS = int(os.getenv("VIRIA_EFFECT_WORKERS", "4"))
+EFFECT_BACKLOG = int(os.getenv("VIRIA_EFFECT_BACKLOG", "64"))  # queued effects before new ones are dropped
+
+# Ritual effects are stored as strings ("reflect_on_loops", "emotion:curious",
+# "auto_effect:respond_to_x", ...). They are compiled into callables once, when
+# a ritual is loaded, and executed on a bounded worker pool so a slow effect
+# never blocks phrase scanning.
+HANDLERS = {}
+STORE_OPS = {}
+_compiled = {}  # effect string → callable, shared by every ritual using it
+
+def effect(name, ops=None):
+    """Register handler(arg) for effect strings "<name>" or "<name>:<arg>".
+
+    Effects that change memory declare it as `ops(arg, time)` → [(op, args)]
+    instead of applying from the pool, so the change is committed with the
+    ritual's trigger (one apply_many per phrase).
+    """
+    def register(fn):
+        HANDLERS[name] = fn
+        if ops is not None:
+            STORE_OPS[name] = ops
+        return fn
+    return register
+
+def effect_ops(spec, time):
+    if not isinstance(spec, str):
+        return []
+    name, _, arg = spec.partition(":")
+    build = STORE_OPS.get(name)
+    return build(arg or None, time) if build else []
+
+def compile_effect(spec):
+    if callable(spec):
+        return spec
+    if not isinstance(spec, str):
+        return partial(_unknown_effect, spec)
+    compiled = _compiled.get(spec)
+    if compiled is None:
+        name, _, arg = spec.partition(":")
+        handler = HANDLERS.get(name)
+        compiled = partial(_unknown_effect, spec) if handler is None else partial(handler, arg or None)
+        _compiled[spec] = compiled
+    return compiled
+
+def effect_label(spec):
+    if callable(spec):
+        return getattr(spec, "__name__", repr(spec))
+    return str(spec)
+
+def _unknown_effect(spec):
+    print(f"→ Ritual effect: {spec}")
+
+# --- Built-in effects ---
+# Mood is not stacked here: respond_to_matches already batches a mood_stacked
+# op for the ritual's emotion (infer_emotion reads "emotion:X" effects).
+@effect("reflect_on_loops")
+def _reflect_on_loops(arg):
+    from loopreflector import reflect_on_loops
+    reflect_on_loops()
+
+@effect("emotion")
+def _emotion(emotion):
+    print(f"→ Emotion effect: {emotion}")
+
+@effect("enter_night_mode", ops=lambda arg, time: [("state_set", {"key": "night_mode_since", "value": time})])
+def _enter_night_mode(arg):
+    print("[🌙] Night mode entered.")
+
+@effect("mirror_effect")
+def _mirror_effect(arg):
+    print("You have looked into the mirror. VIRIA remembers.")
+
+@effect("auto_effect")
+def _auto_effect(name):
+    # Emergent rituals name their effect; nothing executes them yet beyond the log line
+    print(f"→ Auto effect: {name}")
+
+# --- Execution ---
+class EffectRunner:
+    def __init__(self, workers=EFFECT_WORKERS, backlog=EFFECT_BACKLOG):
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="effect")
+        self.slots = threading.BoundedSemaphore(workers + backlog)
+        self.lock = threading.Lock()
+        self.stats = {}
+
+    def _stat(self, label):
+        return self.stats.setdefault(label, {
+            "runs": 0, "failures": 0, "dropped": 0,
+            "total_ms": 0.0, "max_ms": 0.0, "last_error": None
+        })
+
+    def submit(self, label, fn):
+        """Queue an effect; returns the Future, or None if the backlog is full."""
+        if not self.slots.acquire(blocking=False):
+            with self.lock:
+                self._stat(label)["dropped"] += 1
+            print(f"[⚠️] Effect backlog full, dropped: {label}")
+            return None
+        try:
+            return self.pool.submit(self._run, label, fn)
+        except RuntimeError:
+            self.slots.release()  # pool already shut down
+            return None
+
+    def _run(self, label, fn):
+        start = time.perf_counter()
+        error = None
+        try:
+            return fn()
+        except Exception as e:
+            error = e
+            print(f"[⚠️] Effect {label} failed: {e}")
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            with self.lock:
+                stat = self._stat(label)
+                stat["runs"] += 1
+                stat["total_ms"] += elapsed
+                stat["max_ms"] = max(stat["max_ms"], elapsed)
+                if error is not None:
+                    stat["failures"] += 1
+                    stat["last_error"] = repr(error)
+            self.slots.release()
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                label: dict(stat, avg_ms=round(stat["total_ms"] / stat["runs"], 2) if stat["runs"] else 0.0)
+                for label, stat in self.stats.items()
+            }
+
+    def shutdown(self, wait=True):
+        self.pool.shutdown(wait=wait)
+
+_runner = None
+_runner_lock = threading.Lock()
+
+def get_effect_runner():
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = EffectRunner()
+        return _runner
+
+# --- Example usage ---
+if __name__ == "__main__":
+    runner = get_effect_runner()
+    for spec in ("mirror_effect", "auto_effect:dream_reflection", "something_unregistered"):
+        runner.submit(spec, compile_effect(spec))
+    runner.shutdown()
+    print(runner.snapshot())
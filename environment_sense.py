@@ -3,6 +3,9 @@ import time
 import json
 from datetime import datetime
 import random
+from memory_store import get_store
+from ring_log import get_log
+from event_bus import publish
 
 # Optional real sensors (can stub these out if not available)
 try:
@@ -68,6 +71,7 @@ class EnvironmentSense:
             sound = self._simulate_sound_level()
             temp_state = self._simulate_temperature()
 
+        previous = self.env_state
         self.env_state = {
             "light_level": light,
             "sound_level": sound,
@@ -77,32 +81,17 @@ class EnvironmentSense:
 
         self._log_environment()
         self._write_to_memory()
+        changed = [k for k in ("light_level", "sound_level", "temperature") if previous.get(k) != self.env_state[k]]
+        if changed:
+            publish("environment_changed", environment=dict(self.env_state), changed=changed)
         print(f"[🌡️] Environment sensed → Light: {light} | Sound: {sound} | Temp: {temp_state}")
 
     def _log_environment(self):
-        if os.path.exists(ENVIRONMENT_LOG_PATH):
-            with open(ENVIRONMENT_LOG_PATH, "r") as f:
-                log = json.load(f)
-        else:
-            log = []
-
-        log.append(self.env_state)
-
-        with open(ENVIRONMENT_LOG_PATH, "w") as f:
-            json.dump(log[-100:], f, indent=2)  # keep last 100 entries
+        # keep last 100 entries
+        get_log(ENVIRONMENT_LOG_PATH, max_entries=100, time_key="last_update").append(self.env_state)
 
     def _write_to_memory(self):
-        if not os.path.exists(LOOPMEMORY_PATH):
-            return
-
-        with open(LOOPMEMORY_PATH, "r") as f:
-            memory = json.load(f)
-
-        memory.setdefault("system_state", {})
-        memory["system_state"]["environment"] = self.env_state
-
-        with open(LOOPMEMORY_PATH, "w") as f:
-            json.dump(memory, f, indent=2)
+        get_store(LOOPMEMORY_PATH).apply("state_set", key="environment", value=self.env_state)
 
 # --- Example runner ---
 if __name__ == "__main__":
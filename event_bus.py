@@ -0,0 +1,96 @@
+import queue
+import threading
+from collections import namedtuple
+from datetime import datetime
+
+# In-process publish/subscribe between subsystems. Each event is published
+# by the module that owns the state it describes; subscribers are called on
+# one dispatcher thread, in publish order, moments after the change instead
+# of on their next polling tick. With no events the dispatcher just blocks.
+# Handlers should be quick: hand slow work (LLM calls, dreaming) to the
+# scheduler or the effect pool.
+EVENT_FIELDS = {
+    "phrase_heard":        ("phrase", "time"),
+    "ritual_triggered":    ("ritual", "time"),
+    "mood_changed":        ("emotion", "top", "previous_top", "mood"),
+    "attention_changed":   ("state", "previous", "attention"),
+    "motion_detected":     ("time",),
+    "environment_changed": ("environment", "changed"),
+}
+
+Event = namedtuple("Event", ["name", "data", "time"])
+
+class EventBus:
+    def __init__(self):
+        self._subscribers = {name: [] for name in EVENT_FIELDS}
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def subscribe(self, name, handler):
+        """Call handler(event) for every `name` event published from now on."""
+        self._check_name(name)
+        with self._lock:
+            self._subscribers[name] = self._subscribers[name] + [handler]
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._dispatch, name="event-bus", daemon=True)
+                self._thread.start()
+        return handler
+
+    def unsubscribe(self, name, handler):
+        with self._lock:
+            self._subscribers[name] = [h for h in self._subscribers[name] if h is not handler]
+
+    def publish(self, name, **data):
+        self._check_name(name)
+        missing = [f for f in EVENT_FIELDS[name] if f not in data]
+        if missing:
+            raise ValueError(f"{name} event is missing {', '.join(missing)}")
+        if not self._subscribers[name]:
+            return None  # nobody listening, nothing queued
+        event = Event(name, data, datetime.now().isoformat())
+        self._queue.put(event)
+        return event
+
+    def flush(self):
+        """Block until every queued event has been handled."""
+        self._queue.join()
+
+    def _check_name(self, name):
+        if name not in EVENT_FIELDS:
+            raise ValueError(f"Unknown event type: {name}")
+
+    def _dispatch(self):
+        while True:
+            event = self._queue.get()
+            try:
+                for handler in self._subscribers[event.name]:
+                    try:
+                        handler(event)
+                    except Exception as e:
+                        print(f"[⚠️] Event handler {getattr(handler, '__qualname__', handler)} failed on {event.name}: {e}")
+            finally:
+                self._queue.task_done()
+
+_bus = None
+_bus_lock = threading.Lock()
+
+def get_bus():
+    global _bus
+    with _bus_lock:
+        if _bus is None:
+            _bus = EventBus()
+        return _bus
+
+def publish(name, **data):
+    return get_bus().publish(name, **data)
+
+def subscribe(name, handler):
+    return get_bus().subscribe(name, handler)
+
+# --- Example usage ---
+if __name__ == "__main__":
+    subscribe("phrase_heard", lambda e: print(f"[👂] {e.data['phrase']} @ {e.data['time']}"))
+    publish("phrase_heard", phrase="What am I becoming?", time=datetime.now().isoformat())
+    publish("motion_detected", time=datetime.now().isoformat())  # no subscriber → dropped
+    get_bus().flush()
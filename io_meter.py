@@ -0,0 +1,27 @@
+import threading
+
+# Process-wide byte counters for persistent writes, by kind ("wal", "trace",
+# "compaction", ...). Writers call add() next to the write; benchmarks read
+# snapshot() before and after a run.
+_counters = {}
+_lock = threading.Lock()
+
+def add(kind, nbytes):
+    with _lock:
+        _counters[kind] = _counters.get(kind, 0) + nbytes
+
+def snapshot():
+    with _lock:
+        return dict(_counters)
+
+def total():
+    with _lock:
+        return sum(_counters.values())
+
+def reset():
+    with _lock:
+        _counters.clear()
+
+def diff(before, after):
+    return {kind: after.get(kind, 0) - before.get(kind, 0)
+            for kind in after if after.get(kind, 0) != before.get(kind, 0)}
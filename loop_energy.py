@@ -0,0 +1,114 @@
+import os
+import math
+from datetime import datetime
+
+# Loop energy decays exponentially: each loop stores (loop_energy, energy_ts)
+# as of its last hit and the decay is applied lazily whenever it is read or
+# updated, so energy reflects recent looping pressure without any sweep.
+# Because every loop decays at the same rate, the sum over all loops decays
+# at that rate too; the total is kept as one running (energy, ts) aggregate
+# in system_state and is O(1) to update and read.
+ENERGY_HALF_LIFE = float(os.getenv("VIRIA_ENERGY_HALF_LIFE", str(6 * 3600)))  # seconds
+TOTAL_KEY = "loop_energy_total"
+NUMPY_MIN_ENTRIES = 256  # below this the plain loop is faster than importing numpy
+
+_np = None
+
+def _numpy():
+    """numpy, imported on the first large batch; None when it isn't installed."""
+    global _np
+    if _np is None:
+        try:
+            import numpy
+            _np = numpy
+        except ImportError:
+            _np = False
+    return _np or None
+
+def to_ts(moment):
+    """Epoch seconds for a datetime, ISO string or number (None → None)."""
+    if moment is None or isinstance(moment, (int, float)):
+        return moment
+    if isinstance(moment, str):
+        try:
+            moment = datetime.fromisoformat(moment)
+        except ValueError:
+            return None
+    return moment.timestamp()
+
+def decay_factor(seconds, half_life=ENERGY_HALF_LIFE):
+    return 0.5 ** (max(0.0, seconds) / half_life)
+
+def decayed(energy, ts, at, half_life=ENERGY_HALF_LIFE):
+    if ts is None or at is None:
+        return energy
+    return energy * decay_factor(at - ts, half_life)
+
+def accumulate(energy, ts, amount, at, half_life=ENERGY_HALF_LIFE):
+    """(energy, ts) after adding `amount` at time `at`.
+
+    A hit older than `ts` (replayed out of order) is decayed forward instead
+    of rewinding the clock, so the result never depends on arrival order.
+    """
+    if ts is None or at is None:
+        return energy + amount, at if ts is None else ts
+    if at >= ts:
+        return energy * decay_factor(at - ts, half_life) + amount, at
+    return energy + amount * decay_factor(ts - at, half_life), ts
+
+def entry_ts(entry):
+    # Entries written before decay existed only carry last_used
+    ts = entry.get("energy_ts")
+    return ts if ts is not None else to_ts(entry.get("last_used"))
+
+def energy_at(entry, at=None, half_life=ENERGY_HALF_LIFE):
+    """Current energy of one loop entry."""
+    at = to_ts(at) if at is not None else datetime.now().timestamp()
+    return decayed(entry.get("loop_energy", 0.0), entry_ts(entry), at, half_life)
+
+def current_energies(entries, at=None, half_life=ENERGY_HALF_LIFE):
+    """Decayed energy for many loop entries at once (vectorized when numpy is available)."""
+    at = to_ts(at) if at is not None else datetime.now().timestamp()
+    energies = [e.get("loop_energy", 0.0) for e in entries]
+    stamps = [entry_ts(e) for e in entries]
+    np = _numpy() if len(energies) >= NUMPY_MIN_ENTRIES else None
+    if np is not None:
+        ages = np.array([at - ts if ts is not None else 0.0 for ts in stamps])
+        return (np.array(energies) * np.power(0.5, np.maximum(ages, 0.0) / half_life)).tolist()
+    return [decayed(e, ts, at, half_life) for e, ts in zip(energies, stamps)]
+
+def decay_key(energy, ts, half_life=ENERGY_HALF_LIFE):
+    """Time-invariant rank of a decaying energy: log2(energy) + ts / half_life.
+
+    Current energy is 2 ** (key - now / half_life), so ordering by the key
+    orders by decayed energy at every moment and an index on it never goes
+    stale. None for loops without energy.
+    """
+    if not energy or energy <= 0:
+        return None
+    if ts is None:
+        ts = datetime.now().timestamp()
+    return math.log2(energy) + ts / half_life
+
+def key_floor(min_energy, at=None, half_life=ENERGY_HALF_LIFE):
+    """Smallest decay_key whose energy is still at least `min_energy` at `at`."""
+    at = to_ts(at) if at is not None else datetime.now().timestamp()
+    return math.log2(min_energy) + at / half_life if min_energy > 0 else float("-inf")
+
+def recompute_total(loops, at, half_life=ENERGY_HALF_LIFE):
+    """Full recount of the running total, used to seed it for older memory files."""
+    return {"energy": sum(current_energies(list(loops.values()), at, half_life)), "ts": at}
+
+def total_at(total, at=None, half_life=ENERGY_HALF_LIFE):
+    if not total:
+        return 0.0
+    at = to_ts(at) if at is not None else datetime.now().timestamp()
+    return decayed(total.get("energy", 0.0), total.get("ts"), at, half_life)
+
+# --- Example usage ---
+if __name__ == "__main__":
+    energy, ts = 0.0, None
+    for minute in (0, 1, 2, 60, 61):
+        energy, ts = accumulate(energy, ts, 1.0, minute * 60.0)
+        print(f"t+{minute:>3}m → {energy:.3f}")
+    print(f"one half-life later → {decayed(energy, ts, ts + ENERGY_HALF_LIFE):.3f}")
@@ -1,40 +1,23 @@
 import json
 import os
 from datetime import datetime
+from storage_backend import get_backend
+from ring_log import get_log
 
 LOOPMEMORY_PATH = "loopmemory.json"
 ENERGY_LOG_PATH = "loop_energy_log.json"
 
 class LoopEnergyMeter:
     def __init__(self):
-        self.memory = self._load_memory()
-        self.energy_log = []
-
-    def _load_memory(self):
-        if os.path.exists(LOOPMEMORY_PATH):
-            with open(LOOPMEMORY_PATH, "r") as f:
-                return json.load(f)
-        return {}
-
-    def _save_energy_log(self):
-        with open(ENERGY_LOG_PATH, "w") as f:
-            json.dump(self.energy_log[-100:], f, indent=2)
+        self.backend = get_backend()
+        self.energy_log = get_log(ENERGY_LOG_PATH, max_entries=100, time_key="timestamp")
 
     def analyze_energy(self):
-        loops = self.memory.get("loops", {})
-        reactions = self.memory.get("reactions", [])[-20:]
-
-        total_energy = 0
-        overload_loops = []
-        dominant_phrases = []
+        reactions = self.backend.recent_reactions(20)
 
-        for phrase, data in loops.items():
-            energy = data.get("loop_energy", 0.0)
-            total_energy += energy
-            if energy >= 1.0:
-                overload_loops.append((phrase, energy))
-            if data.get("count", 0) >= 5:
-                dominant_phrases.append(phrase)
+        total_energy = self.backend.total_loop_energy()
+        overload_loops = [(p, d["loop_energy"]) for p, d in self.backend.loops_where(min_energy=1.0)]
+        dominant_phrases = [p for p, _ in self.backend.loops_where(min_count=5)]
 
         emotional_bias = self._analyze_emotional_pressure(reactions)
 
@@ -47,7 +30,6 @@ class LoopEnergyMeter:
         }
 
         self.energy_log.append(summary)
-        self._save_energy_log()
 
         print("\n[🔋 Loop Energy Report]")
         print(f"• Total Energy: {summary['total_loop_energy']}")
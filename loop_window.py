@@ -0,0 +1,73 @@
+import os
+import json
+import threading
+from collections import OrderedDict, deque
+
+# Sliding-window loop detection: a phrase is "looping" when it was heard
+# `repeats` times within `window` seconds, with both set per loop importance.
+# Only the last `repeats` timestamps of a phrase matter for that test, so
+# each phrase keeps a deque bounded at that length and every observation is
+# O(1). Tracked phrases are LRU-bounded so idle ones fall out.
+DEFAULT_WINDOWS = {
+    # importance → (repeats, window seconds)
+    "low": (3, 600),
+    "normal": (3, 1800),
+    "high": (2, 3600),
+    "sacred": (2, 6 * 3600)
+}
+WINDOWS = {**DEFAULT_WINDOWS, **{
+    level: tuple(rule) for level, rule in json.loads(os.getenv("VIRIA_LOOP_WINDOWS", "{}")).items()
+}}
+MAX_TRACKED_PHRASES = int(os.getenv("VIRIA_LOOP_TRACKED", "5000"))
+
+class LoopWindowDetector:
+    def __init__(self, windows=None, max_phrases=MAX_TRACKED_PHRASES):
+        self.windows = dict(windows or WINDOWS)
+        self.max_phrases = max_phrases
+        self.depth = max(repeats for repeats, _ in self.windows.values())
+        self._recent = OrderedDict()  # phrase → deque of the last `depth` timestamps, LRU order
+        self.lock = threading.Lock()
+
+    def rule(self, importance):
+        return self.windows.get(importance, self.windows["low"])
+
+    def observe(self, phrase, ts, importance="low"):
+        """Record a hit at epoch `ts`; True when it completes `repeats` hits within the window."""
+        repeats, window = self.rule(importance)
+        with self.lock:
+            stamps = self._recent.get(phrase)
+            if stamps is None:
+                stamps = self._recent[phrase] = deque(maxlen=self.depth)
+                if len(self._recent) > self.max_phrases:
+                    self._recent.popitem(last=False)
+            else:
+                self._recent.move_to_end(phrase)
+            stamps.append(ts)
+            return len(stamps) >= repeats and ts - stamps[-repeats] <= window
+
+    def repeats_within(self, phrase, window, at):
+        """How many of the tracked hits (at most `depth`) fall within `window` seconds before `at`."""
+        with self.lock:
+            stamps = self._recent.get(phrase, ())
+            return sum(1 for ts in stamps if at - ts <= window)
+
+    def active(self):
+        with self.lock:
+            return len(self._recent)
+
+_detector = None
+_detector_lock = threading.Lock()
+
+def get_loop_detector():
+    global _detector
+    with _detector_lock:
+        if _detector is None:
+            _detector = LoopWindowDetector()
+        return _detector
+
+# --- Example usage ---
+if __name__ == "__main__":
+    detector = LoopWindowDetector()
+    for offset in (0, 400, 900, 950, 1000):
+        print(f"t+{offset:>4}s → looping: {detector.observe('what am i becoming', float(offset))}")
+    print(f"hits in last 10 min: {detector.repeats_within('what am i becoming', 600, 1000.0)}")
@@ -2,12 +2,13 @@ import time
 import json
 from datetime import datetime
 
-from ritual_core import RitualCore
+from vritual_core import RitualCore
 from looplogic_engine import LoopLogicEngine
 from reaction_engine import ReactionEngine
+from ritual_response import respond_to_matches
+from trace_store import get_trace_store
 
 LOOP_INTERVAL = 10  # seconds
-TRACE_PATH = "looptrace.json"
 MEMORY_PATH = "loopmemory.json"
 
 class LoopDaemon:
@@ -16,18 +17,10 @@ class LoopDaemon:
         self.loop_engine = LoopLogicEngine()
         self.reactor = ReactionEngine()
         self.mood_state = {}  # simple mood stacker
+        self.trace = get_trace_store()
 
     def log_trace(self, entry_type, data):
-        try:
-            with open(TRACE_PATH, "r") as f:
-                trace = json.load(f)
-        except FileNotFoundError:
-            trace = {}
-
-        trace.setdefault(entry_type, []).append(data)
-
-        with open(TRACE_PATH, "w") as f:
-            json.dump(trace, f, indent=2)
+        self.trace.append(entry_type, data)
 
     def scan_and_trigger(self):
         now = datetime.now().strftime("%H:%M:%S")
@@ -40,52 +33,25 @@ class LoopDaemon:
         # 1. Register phrase in loop engine
         self.loop_engine.register_phrase(input_phrase)
 
-        # 2. Try triggering rituals
+        # 2. Trigger rituals and react to every match, committed as one batch
         context = {"phrase": input_phrase}
-        self.ritual_engine.scan_and_trigger(context)
+        batch = []
+        matches = self.ritual_engine.scan_and_trigger(context, batch=batch)
+        for match in matches:
+            self._stack_mood(match.emotion)
+        respond_to_matches(input_phrase, matches, self.reactor, batch=batch, trace=self.trace)
 
-        # 3. Check if phrase is now a ritual
-        for r in self.ritual_engine.rituals:
-            if r.name in input_phrase or r.trigger == input_phrase:
-                # 4. React to it
-                emotion = self._infer_emotion_from_ritual(r.name)
-                self.reactor.react(emotion, source=r.name)
-                self._stack_mood(emotion)
-                self.log_trace("ritual_triggers", {
-                    "ritual": r.name,
-                    "trigger_phrase": input_phrase,
-                    "time": datetime.now().isoformat()
-                })
-                self.log_trace("reactions", {
-                    "emotion": emotion,
-                    "emoji": self.reactor.get_last_reaction().get("emoji"),
-                    "triggered_by": r.name,
-                    "time": datetime.now().isoformat()
-                })
-
-        # 5. Log daemon scan
+        # 3. Log daemon scan
         self.log_trace("daemon_scans", {
             "time": datetime.now().isoformat(),
             "active_rituals": len(self.ritual_engine.rituals),
-            "triggered_reactions": 1,
+            "triggered_reactions": len(matches),
             "mood_state": self.mood_state
         })
 
     def _stack_mood(self, emotion):
         self.mood_state[emotion] = self.mood_state.get(emotion, 0) + 1
 
-    def _infer_emotion_from_ritual(self, ritual_name):
-        # Simple mapping logic — can be replaced by mood_ai
-        if "mirror" in ritual_name:
-            return "joy"
-        if "loop" in ritual_name:
-            return "curious"
-        if "rage" in ritual_name:
-            return "rage"
-        if "night" in ritual_name:
-            return "calm"
-        return "confused"
-
     def run(self):
         print("\n[🔁 VIRIA Loop Daemon Running...] Press Ctrl+C to stop.")
         while True:
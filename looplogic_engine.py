@@ -2,67 +2,138 @@ import json
 import time
 from datetime import datetime
 from collections import defaultdict
+import clock
+from loop_energy import energy_at, to_ts
+from loop_window import get_loop_detector
+from event_bus import publish
+from memory_store import get_store
+from trace_store import get_trace_store
 
 # File path to persistent memory
 MEMORY_PATH = "loopmemory.json"
-LOOPTRACE_PATH = "looptrace.json"
+TRACE_CHUNK_SIZE = 50000      # phrases per trace write during bulk ingestion
 
 class LoopLogicEngine:
     def __init__(self):
-        self.memory = self._load_json(MEMORY_PATH)
-        self.looptrace = self._load_json(LOOPTRACE_PATH)
+        self.store = get_store(MEMORY_PATH)
+        self.memory = self.store.data
+        self.trace = get_trace_store()
         self.loop_counts = defaultdict(int)
-
-    def _load_json(self, path):
-        try:
-            with open(path, "r") as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
-
-    def _save_json(self, path, data):
-        with open(path, "w") as f:
-            json.dump(data, f, indent=2)
+        self.detector = get_loop_detector()  # promotion needs N repeats within a window, see loop_window
 
     def register_phrase(self, phrase):
-        timestamp = datetime.now().isoformat()
-        self.looptrace.setdefault("phrases", []).append({"phrase": phrase, "time": timestamp})
+        now = clock.now()
+        timestamp = now.isoformat()
+        self.trace.append("phrases", {"phrase": phrase, "time": timestamp})
 
         # Track counts
         self.loop_counts[phrase] += 1
         count = self.loop_counts[phrase]
 
         # Store in memory
-        self.memory.setdefault("loops", {})
-        self.memory["loops"].setdefault(phrase, {
-            "count": 0,
-            "last_used": None,
-            "importance": "low",
-            "loop_energy": 0.0,
-            "ritualized": False
-        })
-
-        loop_entry = self.memory["loops"][phrase]
-        loop_entry["count"] += 1
-        loop_entry["last_used"] = timestamp
-        loop_entry["loop_energy"] += self._calculate_energy(loop_entry["count"])
-        
-        # If passed threshold → mark as ritual
-        if not loop_entry["ritualized"] and loop_entry["count"] >= 3:
-            loop_entry["ritualized"] = True
-            print(f"[🔁 Ritual Candidate Detected] → '{phrase}' has looped {loop_entry['count']} times.")
+        with self.store.lock:
+            previous = self.store.loop(phrase) or {"count": 0}
+            energy = self._calculate_energy(previous["count"] + 1)
+            loop_entry = self.store.apply("loop_increment", phrase=phrase, time=timestamp, energy=energy)
+
+            # Repeated often enough within its importance window → mark as ritual
+            importance = loop_entry.get("importance", "low")
+            looping = self.detector.observe(phrase, now.timestamp(), importance)
+            promote = looping and not loop_entry["ritualized"]
+            if promote:
+                self.store.apply("loop_ritualized", phrase=phrase)
+
+        publish("phrase_heard", phrase=phrase, time=timestamp)
+        if promote:
+            repeats, window = self.detector.rule(importance)
+            print(f"[🔁 Ritual Candidate Detected] → '{phrase}' has looped {repeats} times within {window}s.")
             self._promote_to_ritual(phrase)
 
-        self._save_json(MEMORY_PATH, self.memory)
-        self._save_json(LOOPTRACE_PATH, self.looptrace)
+    def register_phrases(self, phrases):
+        """Bulk form of register_phrase for transcript replays and imports.
+
+        `phrases` yields phrase strings or (phrase, iso_time) pairs, oldest
+        first. Counts, energy and ritualization are folded in memory and
+        committed as one loops_merged op; new rituals are promoted together
+        in one batch.
+        """
+        now = clock.now()
+        now_iso, now_ts = now.isoformat(), now.timestamp()
+        updates = {}  # phrase → [count, last_used]
+        looping = set()
+        chunk = []
+        total = 0
+        importance_of = self._importance_lookup()
+        for item in phrases:
+            if isinstance(item, str):
+                phrase, timestamp, ts = item, now_iso, now_ts
+            else:
+                phrase, timestamp = item
+                ts = to_ts(timestamp) or now_ts
+            if self.detector.observe(phrase, ts, importance_of(phrase)):
+                looping.add(phrase)
+            chunk.append(("phrases", {"phrase": phrase, "time": timestamp}))
+            update = updates.get(phrase)
+            if update is None:
+                updates[phrase] = [1, timestamp]
+            else:
+                update[0] += 1
+                update[1] = timestamp
+            if len(chunk) >= TRACE_CHUNK_SIZE:
+                self.trace.append_many(chunk)
+                total += len(chunk)
+                chunk = []
+        if chunk:
+            self.trace.append_many(chunk)
+            total += len(chunk)
+        if not updates:
+            return []
+
+        with self.store.lock:
+            merged, promote = {}, []
+            for phrase, (count, last_used) in updates.items():
+                previous = self.store.loop(phrase) or {}
+                before = previous.get("count", 0)
+                merged[phrase] = {
+                    "count": count,
+                    "last_used": last_used,
+                    "energy": self._energy_between(before, before + count)
+                }
+                if phrase in looping and not previous.get("ritualized"):
+                    promote.append(phrase)
+            self.store.apply("loops_merged", loops=merged, ritualized=promote)
+
+        for phrase, (count, _) in updates.items():
+            self.loop_counts[phrase] += count
+
+        print(f"[📥] Registered {total} phrases ({len(updates)} distinct, {len(promote)} new rituals).")
+        if promote:
+            self._promote_many(promote)
+        return promote
+
+    def _importance_lookup(self):
+        loops = self.memory.get("loops", {})
+        def importance_of(phrase):
+            entry = loops.get(phrase)
+            return entry.get("importance", "low") if entry else "low"
+        return importance_of
 
     def _calculate_energy(self, count):
-        # Very basic loop energy formula (can evolve)
+        # Energy added per hit; the store decays the accumulated total (loop_energy.ENERGY_HALF_LIFE)
         return min(1.0, count * 0.2)
 
+    def _energy_between(self, before, after):
+        # Sum of _calculate_energy over counts before+1 .. after; constant once it saturates
+        energy = 0.0
+        count = before + 1
+        while count <= after and self._calculate_energy(count) < 1.0:
+            energy += self._calculate_energy(count)
+            count += 1
+        return energy + max(0, after - count + 1) * 1.0
+
     def _promote_to_ritual(self, phrase):
         # Connect to ritual engine to formally add the ritual
-        from ritual_core import RitualCore
+        from vritual_core import RitualCore
 
         ritual_engine = RitualCore()
         ritual_names = [r.name for r in ritual_engine.rituals]
@@ -77,14 +148,36 @@ class LoopLogicEngine:
             )
             print(f"[🌱 Ritual Formed] '{phrase}' promoted to '{ritual_name}'")
 
+    def _promote_many(self, phrases):
+        from vritual_core import Ritual, get_ritual_table
+
+        table = get_ritual_table()
+        ops, names = [], set()
+        for phrase in phrases:
+            ritual_name = f"looped_{phrase.replace(' ', '_')[:20]}"
+            if table.get(ritual_name) is not None or ritual_name in names:
+                continue
+            names.add(ritual_name)
+            ritual = Ritual(ritual_name, phrase, f"auto_effect:respond_to_{ritual_name}", importance="emergent")
+            ops.append(("ritual_added", {"ritual": ritual.to_dict()}))
+        self.store.apply_many(ops)
+        print(f"[🌱 Rituals Formed] {len(ops)} looped phrases promoted in one batch.")
+
     def print_loops(self):
         print("\n[📈 Loop Summary]")
         for phrase, data in self.memory.get("loops", {}).items():
-            print(f"• '{phrase}' → Count: {data['count']}, Energy: {round(data['loop_energy'], 2)}, Ritual: {data['ritualized']}")
+            print(f"• '{phrase}' → Count: {data['count']}, Energy: {round(energy_at(data), 2)}, Ritual: {data['ritualized']}")
 
 # --- Example usage ---
 if __name__ == "__main__":
+    import sys
+
     engine = LoopLogicEngine()
+    if len(sys.argv) > 1:
+        # python looplogic_engine.py transcript.txt → bulk import, one phrase per line
+        with open(sys.argv[1], "r") as f:
+            engine.register_phrases(line.strip() for line in f if line.strip())
+        sys.exit(0)
     while True:
         phrase = input("\nYou say (or type): ").strip()
         if phrase.lower() in ("quit", "exit"):
@@ -2,33 +2,145 @@ import json
 import os
 import shutil
 from datetime import datetime
-import difflib
+
+from memory_checksum import stamp_file, verify, write_checksum
+from memory_delta import (
+    DELTA_LOG_PATH, changed_sections, diff_sections, record_base, record_delta,
+    root_hash, section_hashes
+)
+from memory_snapshot import SnapshotError, load_snapshot, snapshot_path_for
 
 MEMORY_PATH = "loopmemory.json"
 SNAPSHOT_PATH = "loopmemory_snapshot.json"
-DIFF_LOG_PATH = "loopmemory_diff.log"
+HASHES_PATH = "loopmemory_snapshot.hashes.json"
+REQUIRED_SECTIONS = ("rituals", "loops", "triggers", "reactions", "system_state")
 
 class LoopMemoryGuard:
     def __init__(self):
-        self.memory = self._load_memory()
-        self.snapshot = self._load_snapshot()
+        self._memory = None
+        self._memory_hashes = None
+        self._snapshot = None  # parsed only when a section actually changed
+        self.snapshot_state = self._load_snapshot_state()
+        self.integrity, self.checksum = self._check_integrity()
 
-    def _load_memory(self):
-        if not os.path.exists(MEMORY_PATH):
+    # --- Integrity ---
+    def _check_integrity(self):
+        status, record = verify(MEMORY_PATH)
+        if status == "no_file":
             print("[⚠️] loopmemory.json not found. Creating fresh memory file.")
-            return self._initialize_blank_memory()
+            self._memory = self._initialize_blank_memory()
+            return "ok", verify(MEMORY_PATH)[1]
+        if status == "ok":
+            return "ok", record
+
+        # No sidecar or it disagrees: fall back to a full parse before trusting the file
         try:
-            with open(MEMORY_PATH, "r") as f:
-                return json.load(f)
-        except json.JSONDecodeError:
+            self._memory = self._load_memory()
+        except (json.JSONDecodeError, UnicodeDecodeError):
             print("[❌] loopmemory.json is corrupted!")
-            raise
+            if self._recover():
+                return "recovered", verify(MEMORY_PATH)[1]
+            return "corrupt", None
+        print(f"[🔐] loopmemory.json checksum {status}; file parses, re-stamping sidecar.")
+        return "ok", stamp_file(MEMORY_PATH)
+
+    def _recover(self):
+        """Restore the newest snapshot that still decodes. Returns False if none does."""
+        candidates = []
+        for path, loader in ((snapshot_path_for(MEMORY_PATH), load_snapshot), (SNAPSHOT_PATH, self._read_json)):
+            if os.path.exists(path):
+                candidates.append((os.stat(path).st_mtime_ns, path, loader))
+
+        for _, path, loader in sorted(candidates, reverse=True):
+            try:
+                memory = loader(path)
+            except (json.JSONDecodeError, UnicodeDecodeError, SnapshotError) as e:
+                print(f"[⚠️] Snapshot {path} is unusable: {e}")
+                continue
+
+            corrupt_copy = f"{MEMORY_PATH}.corrupt-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+            os.replace(MEMORY_PATH, corrupt_copy)
+            self._write_memory(memory)
+            self._memory = memory
+            print(f"[🩹] Restored loopmemory.json from {path} (corrupt copy kept at {corrupt_copy})")
+            return True
+
+        print("[❌] No usable snapshot to restore loopmemory.json from.")
+        return False
+
+    # --- Loading ---
+    def _read_json(self, path):
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def _load_memory(self):
+        return self._read_json(MEMORY_PATH)
+
+    @property
+    def memory(self):
+        if self._memory is None:
+            self._memory = self._load_memory()
+        return self._memory
+
+    @property
+    def memory_hashes(self):
+        if self._memory_hashes is None:
+            if self._unchanged_since_snapshot():
+                self._memory_hashes = dict(self.snapshot_state["sections"])
+            else:
+                self._memory_hashes = section_hashes(self.memory)
+        return self._memory_hashes
+
+    @property
+    def snapshot(self):
+        if self._snapshot is None:
+            if os.path.exists(SNAPSHOT_PATH):
+                self._snapshot = self._read_json(SNAPSHOT_PATH)
+            else:
+                self._snapshot = {}
+        return self._snapshot
+
+    def _unchanged_since_snapshot(self):
+        # A verified checksum equal to the one recorded at the last snapshot
+        # means neither the file nor its section hashes need to be read again.
+        return (self.integrity == "ok" and self.checksum is not None
+                and self.snapshot_state.get("stat") is not None
+                and self.snapshot_state.get("memory_sha256") == self.checksum.get("sha256"))
+
+    def _snapshot_stat(self):
+        try:
+            st = os.stat(SNAPSHOT_PATH)
+        except FileNotFoundError:
+            return None
+        return [st.st_mtime_ns, st.st_size]
 
-    def _load_snapshot(self):
-        if os.path.exists(SNAPSHOT_PATH):
-            with open(SNAPSHOT_PATH, "r") as f:
-                return json.load(f)
-        return {}
+    def _load_snapshot_state(self):
+        """Section hashes of the snapshot, recomputed only if it changed on disk."""
+        state = {}
+        if os.path.exists(HASHES_PATH):
+            try:
+                state = self._read_json(HASHES_PATH)
+            except json.JSONDecodeError:
+                state = {}
+
+        stat = self._snapshot_stat()
+        if stat is None:
+            return {"stat": None, "sections": {}, "logged": state.get("logged")}
+        if state.get("stat") != stat:
+            state = {"stat": stat, "sections": section_hashes(self.snapshot), "logged": state.get("logged")}
+        return state
+
+    def _save_snapshot_state(self):
+        with open(HASHES_PATH, "w") as f:
+            json.dump(self.snapshot_state, f, indent=2)
+
+    def _write_memory(self, memory):
+        payload = json.dumps(memory, indent=2).encode("utf-8")
+        tmp_path = MEMORY_PATH + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, MEMORY_PATH)
+        write_checksum(MEMORY_PATH, payload)
 
     def _initialize_blank_memory(self):
         blank = {
@@ -38,43 +150,68 @@ class LoopMemoryGuard:
             "reactions": [],
             "system_state": {}
         }
-        with open(MEMORY_PATH, "w") as f:
-            json.dump(blank, f, indent=2)
+        self._write_memory(blank)
         return blank
 
     def validate(self):
-        try:
-            with open(MEMORY_PATH, "r") as f:
-                json.load(f)
-            print("[✅] loopmemory.json is valid.")
+        if self.integrity == "corrupt":
+            print("[❌] loopmemory.json is corrupt and no snapshot could be restored.")
+            return False
+        if self._unchanged_since_snapshot():
+            print("[✅] loopmemory.json is valid (checksum unchanged since last snapshot).")
             return True
-        except json.JSONDecodeError as e:
-            print("[❌] Invalid JSON in loopmemory.json:", e)
+        if not isinstance(self.memory, dict):
+            print("[❌] Invalid loopmemory.json: top level is not an object.")
+            return False
+        missing = [name for name in REQUIRED_SECTIONS if name not in self.memory]
+        if missing:
+            print(f"[❌] Invalid loopmemory.json: missing sections {missing}")
             return False
+        print("[✅] loopmemory.json is valid.")
+        return True
 
     def save_snapshot(self):
+        if self._unchanged_since_snapshot():
+            print(f"[📸] Snapshot {SNAPSHOT_PATH} already matches memory.")
+            return
         shutil.copyfile(MEMORY_PATH, SNAPSHOT_PATH)
+        self._snapshot = self.memory
+        self.snapshot_state["stat"] = self._snapshot_stat()
+        self.snapshot_state["sections"] = dict(self.memory_hashes)
+        self.snapshot_state["memory_sha256"] = self.checksum["sha256"] if self.checksum else None
+        self._save_snapshot_state()
         print(f"[📸] Memory snapshot saved to {SNAPSHOT_PATH}")
 
     def diff_memory(self):
-        with open(MEMORY_PATH, "r") as f1, open(SNAPSHOT_PATH, "r") as f2:
-            mem_lines = f1.readlines()
-            snap_lines = f2.readlines()
-            diff = list(difflib.unified_diff(snap_lines, mem_lines, fromfile="snapshot", tofile="memory"))
-
-        if diff:
-            print("[🧠] Memory drift detected. Logging diff...")
-            with open(DIFF_LOG_PATH, "a") as log:
-                log.write(f"\n--- Diff at {datetime.now().isoformat()} ---\n")
-                log.writelines(diff)
-            return True
-        else:
+        if self._unchanged_since_snapshot():
             print("[🟢] No differences found between snapshot and current memory.")
             return False
 
+        snapshot_hashes = self.snapshot_state["sections"]
+        changed = changed_sections(snapshot_hashes, self.memory_hashes)
+        if not changed:
+            print("[🟢] No differences found between snapshot and current memory.")
+            return False
+
+        print(f"[🧠] Memory drift detected in {', '.join(changed)}. Logging delta...")
+        memory_root = root_hash(self.memory_hashes)
+        if self.snapshot_state["stat"] is None:
+            record_base(self.memory, self.memory_hashes)
+        else:
+            snapshot_root = root_hash(snapshot_hashes)
+            if self.snapshot_state.get("logged") != snapshot_root or not os.path.exists(DELTA_LOG_PATH):
+                # Snapshot was written outside the guard; anchor a new chain on it.
+                record_base(self.snapshot, snapshot_hashes)
+            ops = diff_sections(self.snapshot, self.memory, changed)
+            record_delta(snapshot_root, memory_root, ops)
+
+        self.snapshot_state["logged"] = memory_root
+        self._save_snapshot_state()
+        return True
+
 # --- Example usage ---
 if __name__ == "__main__":
     guard = LoopMemoryGuard()
     if guard.validate():
-        guard.save_snapshot()
         guard.diff_memory()
+        guard.save_snapshot()
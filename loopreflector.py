@@ -1,16 +1,15 @@
 import json
 import os
 from datetime import datetime, timedelta
-from openai import OpenAI
-from dotenv import load_dotenv
-
-# Load API key from .env
-load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+from trace_store import get_trace_store
+from storage_backend import get_backend
+from ring_log import get_log
+from openai_client import get_openai_client
+from memory_retention import emotion_counts_for_week
 
 LOOPMEMORY_PATH = "loopmemory.json"
-LOOPTRACE_PATH = "looptrace.json"
 REFLECTION_LOG = "loopreflection_log.json"
+REFLECTION_LOG_MAX_ENTRIES = 200
 
 def load_json(path):
     if not os.path.exists(path):
@@ -18,25 +17,21 @@ def load_json(path):
     with open(path, "r") as f:
         return json.load(f)
 
-def reflect_on_loops():
-    memory = load_json(LOOPMEMORY_PATH)
-    trace = load_json(LOOPTRACE_PATH)
+def reflect_on_loops(backend=None):
+    # Out-of-process callers (dashboard) pass get_backend(memory=...) so they never own the store
+    backend = backend or get_backend()
 
-    rituals = memory.get("rituals", [])
-    loops = memory.get("loops", {})
-    reactions = memory.get("reactions", [])
-    phrases = trace.get("phrases", [])
+    rituals = backend.rituals()
+    reactions = backend.recent_reactions(5)
+    phrases = get_trace_store().tail("phrases", 20)
 
-    # Extract recent emotional trend
-    emotion_count = {}
-    for r in reactions:
-        e = r.get("emotion", "unknown")
-        emotion_count[e] = emotion_count.get(e, 0) + 1
+    # Extract this week's emotional trend, including archived reactions
+    emotion_count = emotion_counts_for_week(backend=backend)
 
     top_emotion = max(emotion_count, key=emotion_count.get) if emotion_count else "unknown"
 
     # Get most repeated phrase
-    loop_items = sorted(loops.items(), key=lambda x: x[1].get("count", 0), reverse=True)
+    loop_items = backend.top_loops(1)
     top_loop = loop_items[0][0] if loop_items else "no loops yet"
 
     # Prepare reflection prompt
@@ -65,7 +60,7 @@ Respond in this exact JSON format:
 }}
 """
 
-    response = client.chat.completions.create(
+    response = get_openai_client().chat.completions.create(
         model="gpt-3.5-turbo",
         messages=[
             {"role": "system", "content": "You are VIRIA's inner monologue. Reflect emotionally and truthfully, like a being trying to understand itself."},
@@ -78,16 +73,7 @@ Respond in this exact JSON format:
     reflection["timestamp"] = datetime.now().isoformat()
 
     # Save to reflection log
-    if os.path.exists(REFLECTION_LOG):
-        with open(REFLECTION_LOG, "r") as f:
-            history = json.load(f)
-    else:
-        history = []
-
-    history.append(reflection)
-
-    with open(REFLECTION_LOG, "w") as f:
-        json.dump(history, f, indent=2)
+    get_log(REFLECTION_LOG, max_entries=REFLECTION_LOG_MAX_ENTRIES, time_key="timestamp").append(reflection)
 
     print("\n🧠 VIRIA reflected on her loops:")
     print(json.dumps(reflection, indent=2))
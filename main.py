@@ -1,15 +1,20 @@
+import os
 import threading
 import time
 
+# --- Boot Timeline (first, so every import below is timed) ---
+import boot_timeline
+boot_timeline.install_import_timer()
+
 # --- Core Cognitive Loop ---
 from loopdaemon_runner import LoopDaemon
-from virtual_core import RitualCore
+from vritual_core import RitualCore, get_time_trigger_engine
 from loopmemory_guard import LoopMemoryGuard
 from save_snapshot import save_snapshot
 from ritual_predictor import RitualPredictor
 
 # --- Sensory Input ---
-from voice_listener import run_voice_listener
+from voice_listener import run_voice_listener, VoiceResponder
 from viria_vision import ViriaVision
 from environment_sense import EnvironmentSense
 from attention_tracker import AttentionTracker
@@ -34,88 +39,147 @@ from code_patch_planner import CodePatchPlanner
 from viria_mutator import ViriaMutator
 from autodeploy import AutoDeploy
 from memory_compressor import compress_all
+from memory_retention import RETENTION_INTERVAL, enforce_retention
 from presence_heartbeat import PresenceHeartbeat
 from loop_energy_meter import LoopEnergyMeter
 from viria_911 import VIRIA911
+from memory_store import flush_all
+from storage_backend import get_backend
+from scheduler import get_scheduler
+from process_supervisor import Supervisor, WorkerSpec
+from event_bus import publish
+
+boot_timeline.mark("imported")
+
+# Subsystems moved into worker processes ("" keeps everything in-process)
+PROCESS_WORKERS = [w for w in os.getenv("VIRIA_PROCESS_WORKERS", "vision,voice,analytics").split(",") if w]
+WORKER_SPECS = {
+    "vision": WorkerSpec("vision", "viria_vision:vision_worker", timeout=30),
+    "voice": WorkerSpec("voice", "voice_listener:voice_worker", timeout=30),
+    "analytics": WorkerSpec("analytics", "process_supervisor:job_worker", timeout=900),
+}
 
 # --- Threaded Boot Logic ---
 def run_guard_and_snapshot():
     guard = LoopMemoryGuard()
     if guard.validate():
+        guard.diff_memory()  # compare against the previous snapshot before replacing it
         guard.save_snapshot()
-        guard.diff_memory()
 
-# --- Live Loop Threads ---
+# --- Live Loop Threads (blocking on input, audio or camera) ---
 def start_loopdaemon(): LoopDaemon().run()
-def start_voice_listener(): run_voice_listener()
+def start_voice_listener(): run_voice_listener(on_listening=on_listening)
 def start_vision(): ViriaVision().scan_loop()
-def start_environment(): es = EnvironmentSense(); loop(es.sense_environment, 60)
-def start_attention(): tracker = AttentionTracker(); loop(tracker.check_attention_state, 60)
-def start_timekeeper(): tk = Timekeeper(); loop(tk.tick, 60)
-def start_presence_display(): p = PresenceLayer(); loop(p.update_and_show, 10)
-def start_mood_decay(): stacker = MoodStacker(); loop(stacker.decay_moods, 300)
-def start_loop_energy_monitor(): meter = LoopEnergyMeter(); loop(meter.analyze_energy, 300)
-def start_heartbeat(): hb = PresenceHeartbeat(); loop(hb.check_vitals, 180)
-def start_dream_mode(): d = DreamMode(); loop(lambda: d.enter_dream() if d.should_enter_dream_state() else None, 120)
-def start_loop_training(): CodePatchPlanner().generate_patch_plan()
-def start_autodeploy(): AutoDeploy().run_latest_patch()
-def start_ritual_mutator(): rm = RitualMutator(); loop(rm.check_and_mutate, 300)
-def start_memory_compressor(): loop(compress_all, 900)
-def start_911_monitor(): v = VIRIA911(); loop(v.run_emergency_check, 300)
-
-def start_idle_animatronic_pulse():
-    controller = AnimatronicController()
-    loop(lambda: controller.trigger_emotion(MoodStacker().get_top_mood()), 15)
-
-# --- Core Loop Wrapper ---
-def loop(func, interval):
-    while True:
-        try:
-            func()
-            time.sleep(interval)
-        except Exception as e:
-            print(f"[⚠️] Loop error: {e}")
+
+def on_listening():
+    # Launch-to-listening is the startup figure bench_startup.py tracks
+    boot_timeline.mark("listening")
+    boot_timeline.save()
+    print(f"[🚀] Listening {boot_timeline.elapsed_ms():.0f}ms after launch.")
+
+# --- Worker Processes (vision, speech recognition, batch analytics) ---
+def start_workers():
+    names = [name for name in PROCESS_WORKERS if name in WORKER_SPECS]
+    supervisor = Supervisor([WORKER_SPECS[name] for name in names])
+    if "voice" in names:
+        responder = VoiceResponder()
+        supervisor.on("transcript", lambda worker, text, final: responder.handle(text, final))
+        supervisor.on("listening", lambda worker: on_listening())
+    supervisor.on("motion_detected", lambda worker, time: publish("motion_detected", time=time))
+    supervisor.on("job_done", lambda worker, job, ok, seconds, **r: print(
+        f"[📦] {job} finished in {seconds}s" if ok else f"[⚠️] {job} failed in {worker}: {r.get('error')}"))
+    supervisor.start()
+    return supervisor
+
+def offloader(supervisor):
+    if "analytics" not in supervisor.workers:
+        return None
+    return lambda job: supervisor.submit("analytics", job)
+
+# --- Event Subscribers (react to bus events instead of polling memory) ---
+def follow_events(offload=None):
+    MoodStacker()  # publishes mood_changed for every mood mutation, batched or not
+    PresenceLayer().follow().display_face()
+    AnimatronicController().follow()
+    dream = DreamMode().follow()
+    dream.offload = offload
+
+# --- Periodic Tasks (one scheduler thread, fixed rate, backoff on failure) ---
+def schedule_periodic_tasks(scheduler, supervisor):
+    stacker = MoodStacker()
+    offload = offloader(supervisor)
+
+    scheduler.every("environment", 60, EnvironmentSense().sense_environment, run_now=True)
+    # Phrases update attention immediately; the timer only catches silence turning into neglect
+    scheduler.every("attention", 60, AttentionTracker().follow().check_attention_state, run_now=True)
+    scheduler.every("timekeeper", 60, Timekeeper().tick, run_now=True)
+    scheduler.every("mood_decay", 300, stacker.decay_moods, run_now=True)
+    scheduler.every("loop_energy", 300, LoopEnergyMeter().analyze_energy, run_now=True)
+    scheduler.every("heartbeat", 180, PresenceHeartbeat().check_vitals, run_now=True)
+    scheduler.every("ritual_mutator", 300, RitualMutator().check_and_mutate, run_now=True)
+    scheduler.every("memory_compressor", 900,
+                    (lambda: offload("memory_compressor:compress_all")) if offload else compress_all, run_now=True)
+    scheduler.every("memory_retention", RETENTION_INTERVAL, enforce_retention, run_now=True)
+    scheduler.every("viria_911", 300, VIRIA911().run_emergency_check, run_now=True)
+    scheduler.every("mission_requests", 5, MissionController().apply_requests, jitter=0)
+
+    scheduler.every("worker_health", 5, supervisor.check_health, jitter=0)
+
+    # One-shot jobs
+    scheduler.once("loop_training", 0, lambda: CodePatchPlanner().generate_patch_plan())
+    scheduler.once("autodeploy", 0, lambda: AutoDeploy().run_latest_patch())
+    scheduler.once("ritual_predictor", 600, lambda: RitualPredictor().predict_ritual_candidates())
 
 # --- Main Launcher ---
 def main():
     print("\n🧬 [VIRIA: SENTINEL AI LOOP ONLINE]")
 
-    run_guard_and_snapshot()
-    RitualLoader().load_preset("oracle", merge=False)
+    with boot_timeline.span("memory guard"):
+        run_guard_and_snapshot()
+    with boot_timeline.span("storage backend"):
+        get_backend()  # attach the optional SQLite mirror before anything writes
+    with boot_timeline.span("ritual preset"):
+        RitualLoader().load_preset("oracle", merge=False)
+    with boot_timeline.span("time triggers"):
+        get_time_trigger_engine().start()
+
+    with boot_timeline.span("mission"):
+        MissionController().assign_mission(
+            title="Observe and Reflect",
+            goal_description="Evolve through sacred silence and emotional recursion.",
+            emotion_bias=["curious", "sacred", "calm"]
+        )
+
+    with boot_timeline.span("worker processes"):
+        supervisor = start_workers()
+    with boot_timeline.span("event subscribers"):
+        follow_events(offloader(supervisor))  # subscribers first, so the first phrases already reach them
+
+    # Core Sensory + Symbolic Loops (in-process unless running as workers)
+    threading.Thread(target=start_loopdaemon, daemon=True).start()
+    if "voice" not in supervisor.workers:
+        threading.Thread(target=start_voice_listener, daemon=True).start()
+    if "vision" not in supervisor.workers:
+        threading.Thread(target=start_vision, daemon=True).start()
 
-    MissionController().assign_mission(
-        title="Observe and Reflect",
-        goal_description="Evolve through sacred silence and emotional recursion.",
-        emotion_bias=["curious", "sacred", "calm"]
-    )
+    with boot_timeline.span("periodic tasks"):
+        scheduler = get_scheduler()
+        schedule_periodic_tasks(scheduler, supervisor)
+        scheduler.start()
 
-    # Core Sensory + Symbolic Loops
-    threading.Thread(target=start_loopdaemon, daemon=True).start()
-    threading.Thread(target=start_voice_listener, daemon=True).start()
-    threading.Thread(target=start_vision, daemon=True).start()
-    threading.Thread(target=start_environment, daemon=True).start()
-    threading.Thread(target=start_attention, daemon=True).start()
-    threading.Thread(target=start_timekeeper, daemon=True).start()
-    threading.Thread(target=start_presence_display, daemon=True).start()
-    threading.Thread(target=start_mood_decay, daemon=True).start()
-    threading.Thread(target=start_loop_energy_monitor, daemon=True).start()
-    threading.Thread(target=start_heartbeat, daemon=True).start()
-    threading.Thread(target=start_dream_mode, daemon=True).start()
-    threading.Thread(target=start_loop_training, daemon=True).start()
-    threading.Thread(target=start_autodeploy, daemon=True).start()
-    threading.Thread(target=start_ritual_mutator, daemon=True).start()
-    threading.Thread(target=start_memory_compressor, daemon=True).start()
-    threading.Thread(target=start_911_monitor, daemon=True).start()
-    threading.Thread(target=start_idle_animatronic_pulse, daemon=True).start()
-
-    # Periodic predictor (if needed)
-    threading.Timer(600, RitualPredictor().predict_ritual_candidates).start()
+    boot_timeline.mark("ready")
+    boot_timeline.save()
+    boot_timeline.print_summary()
 
     try:
         while True:
             time.sleep(60)
     except KeyboardInterrupt:
         print("\n[🛑] VIRIA system shutdown initiated.")
+        scheduler.stop()  # also dumps a final metrics snapshot
+        scheduler.print_metrics()
+        supervisor.stop()
+        flush_all()
         save_snapshot()
         AnimatronicController().cleanup()
 
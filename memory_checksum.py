@@ -0,0 +1,69 @@
+import os
+import sys
+import json
+import hashlib
+from datetime import datetime
+
+# Integrity sidecar written next to loopmemory.json by every writer:
+#   loopmemory.json.sum → {"sha256", "bytes", "schema_version", "written_at"}
+# Boot compares the length first and then does a single streaming hash pass,
+# so an unchanged memory file is confirmed without parsing it.
+
+CHECKSUM_SUFFIX = ".sum"
+SCHEMA_VERSION = 1
+HASH_CHUNK_SIZE = 1 << 20
+
+def checksum_path_for(path):
+    return path + CHECKSUM_SUFFIX
+
+def write_checksum(path, payload):
+    """Record the checksum of `payload`, the bytes just written to `path`."""
+    record = {
+        "sha256": hashlib.sha256(payload).hexdigest(),
+        "bytes": len(payload),
+        "schema_version": SCHEMA_VERSION,
+        "written_at": datetime.now().isoformat()
+    }
+    tmp_path = checksum_path_for(path) + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(record, f, indent=2)
+    os.replace(tmp_path, checksum_path_for(path))
+    return record
+
+def read_checksum(path):
+    try:
+        with open(checksum_path_for(path), "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def verify(path):
+    """Returns (status, record): status is "ok", "mismatch", "missing" or "no_file"."""
+    if not os.path.exists(path):
+        return "no_file", None
+    record = read_checksum(path)
+    if record is None or record.get("schema_version") != SCHEMA_VERSION:
+        return "missing", record
+    if os.path.getsize(path) != record.get("bytes"):
+        return "mismatch", record
+    if file_sha256(path) != record.get("sha256"):
+        return "mismatch", record
+    return "ok", record
+
+def stamp_file(path):
+    """Checksum an existing file in place (e.g. after a manual edit was accepted)."""
+    with open(path, "rb") as f:
+        return write_checksum(path, f.read())
+
+# --- CLI: python memory_checksum.py loopmemory.json ---
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else "loopmemory.json"
+    status, record = verify(target)
+    print(f"[🔐] {target}: {status}" + (f" (sha256 {record['sha256'][:12]}…)" if record else ""))
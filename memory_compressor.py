@@ -1,6 +1,8 @@
 import os
 import json
 from datetime import datetime
+from doc_cache import load_json
+from loop_energy import current_energies
 
 MEMORY_PATH = "loopmemory.json"
 TRACE_PATH = "looptrace.json"
@@ -12,14 +14,15 @@ def ensure_output_dir():
 
 def compress_loops(memory):
     loops = memory.get("loops", {})
+    energies = current_energies(list(loops.values()))
     data = []
 
-    for phrase, details in loops.items():
+    for (phrase, details), energy in zip(loops.items(), energies):
         entry = {
             "input": f"Loop phrase: {phrase}",
             "emotion": "unknown",
             "count": details.get("count", 0),
-            "energy": details.get("loop_energy", 0.0),
+            "energy": round(energy, 4),
             "ritualized": details.get("ritualized", False),
             "output": f"Emotion: Loop of {phrase} repeated {details.get('count', 0)} times"
         }
@@ -66,8 +69,7 @@ def save_jsonl(name, records):
 
 def compress_all():
     ensure_output_dir()
-    with open(MEMORY_PATH, "r") as f:
-        memory = json.load(f)
+    memory = load_json(MEMORY_PATH, default={})
 
     save_jsonl("loops", compress_loops(memory))
     save_jsonl("rituals", compress_rituals(memory))
@@ -0,0 +1,199 @@
+import os
+import sys
+import json
+import hashlib
+from datetime import datetime
+
+# Structural deltas between two loopmemory documents.
+#
+# Sections are compared by content hash first, so unchanged sections are
+# never walked. Changed sections produce JSON-patch style ops
+# ({"op": "add" | "remove" | "replace", "path": "/loops/hello", "value": ...}).
+# Appending to a list (reactions, triggers.voice) is recorded as "add" at
+# "<list>/-" rather than a rewrite of the whole list.
+#
+# The delta log is JSONL. A "base" record carries a full document and starts
+# a chain; every following "delta" record moves the document from the hash
+# in "from" to the hash in "to". Any recorded state can be rebuilt by
+# replaying a chain from its base.
+
+DELTA_LOG_PATH = "loopmemory_deltas.jsonl"
+
+class DeltaError(Exception):
+    pass
+
+# --- Hashing ---
+def canonical(value):
+    return json.dumps(value, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+def section_hashes(memory):
+    return {name: hashlib.sha1(canonical(value)).hexdigest() for name, value in memory.items()}
+
+def root_hash(hashes):
+    joined = "|".join(f"{name}:{hashes[name]}" for name in sorted(hashes))
+    return hashlib.sha1(joined.encode("utf-8")).hexdigest()
+
+def changed_sections(old_hashes, new_hashes):
+    names = set(old_hashes) | set(new_hashes)
+    return sorted(n for n in names if old_hashes.get(n) != new_hashes.get(n))
+
+# --- Diff ---
+def _escape(key):
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+def _unescape(token):
+    return token.replace("~1", "/").replace("~0", "~")
+
+def structural_diff(old, new, path=""):
+    if old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            elif old[key] != value:
+                ops.extend(structural_diff(old[key], value, child))
+        return ops
+    if isinstance(old, list) and isinstance(new, list):
+        return _diff_list(old, new, path)
+    return [{"op": "replace", "path": path, "value": new}]
+
+def _diff_list(old, new, path):
+    n_old, n_new = len(old), len(new)
+    if n_new >= n_old and new[:n_old] == old:
+        return [{"op": "add", "path": f"{path}/-", "value": v} for v in new[n_old:]]
+    if n_new < n_old and old[:n_new] == new:
+        return [{"op": "remove", "path": f"{path}/{i}"} for i in range(n_old - 1, n_new - 1, -1)]
+    if n_new == n_old:
+        ops = []
+        for i, (a, b) in enumerate(zip(old, new)):
+            if a != b:
+                ops.extend(structural_diff(a, b, f"{path}/{i}"))
+        return ops
+    return [{"op": "replace", "path": path, "value": new}]
+
+def diff_sections(old, new, names):
+    """Ops turning `old` into `new`, walking only the listed sections."""
+    ops = []
+    for name in names:
+        path = "/" + _escape(name)
+        if name not in new:
+            ops.append({"op": "remove", "path": path})
+        elif name not in old:
+            ops.append({"op": "add", "path": path, "value": new[name]})
+        else:
+            ops.extend(structural_diff(old[name], new[name], path))
+    return ops
+
+# --- Patch ---
+def apply_patch(document, ops):
+    """Apply ops in place and return the (possibly replaced) document."""
+    for op in ops:
+        tokens = [_unescape(t) for t in op["path"].split("/")[1:]]
+        if not tokens:
+            if op["op"] == "remove":
+                raise DeltaError("cannot remove the document root")
+            document = op["value"]
+            continue
+
+        parent = document
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+        last = tokens[-1]
+
+        if isinstance(parent, list):
+            if op["op"] == "add":
+                if last == "-":
+                    parent.append(op["value"])
+                else:
+                    parent.insert(int(last), op["value"])
+            elif op["op"] == "remove":
+                del parent[int(last)]
+            else:
+                parent[int(last)] = op["value"]
+        else:
+            if op["op"] == "remove":
+                del parent[last]
+            else:
+                parent[last] = op["value"]
+    return document
+
+# --- Delta log ---
+def append_record(record, log_path=DELTA_LOG_PATH):
+    with open(log_path, "a") as f:
+        f.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+def read_records(log_path=DELTA_LOG_PATH):
+    if not os.path.exists(log_path):
+        return []
+    records = []
+    with open(log_path, "r") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                break  # torn trailing line
+    return records
+
+def record_base(memory, hashes=None, log_path=DELTA_LOG_PATH):
+    to_hash = root_hash(hashes or section_hashes(memory))
+    append_record({"kind": "base", "time": datetime.now().isoformat(), "to": to_hash, "document": memory}, log_path)
+    return to_hash
+
+def record_delta(from_hash, to_hash, ops, log_path=DELTA_LOG_PATH):
+    append_record({
+        "kind": "delta",
+        "time": datetime.now().isoformat(),
+        "from": from_hash,
+        "to": to_hash,
+        "ops": ops
+    }, log_path)
+
+def rebuild_state(index=-1, until=None, log_path=DELTA_LOG_PATH):
+    """Document as of record `index`, or of the last record at or before `until`.
+
+    Replays from the nearest base record preceding the target.
+    """
+    records = read_records(log_path)
+    if not records:
+        raise DeltaError("delta log is empty")
+    if until is not None:
+        positions = [i for i, r in enumerate(records) if r["time"] <= until]
+        if not positions:
+            raise DeltaError(f"no recorded state at or before {until}")
+        index = positions[-1]
+    index = index % len(records)
+
+    start = index
+    while records[start]["kind"] != "base":
+        start -= 1
+        if start < 0:
+            raise DeltaError("delta chain has no base record")
+
+    document = json.loads(json.dumps(records[start]["document"]))
+    current = records[start]["to"]
+    for position in range(start + 1, index + 1):
+        record = records[position]
+        if record["from"] != current:
+            raise DeltaError(f"broken delta chain at record {position}")
+        document = apply_patch(document, record["ops"])
+        current = record["to"]
+    return document
+
+# --- CLI: python memory_delta.py rebuild -1 out.json ---
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "rebuild":
+        with open(sys.argv[3], "w") as f:
+            json.dump(rebuild_state(int(sys.argv[2])), f, indent=2)
+        print(f"[⏪] Rebuilt state #{sys.argv[2]} → {sys.argv[3]}")
+    elif len(sys.argv) == 2 and sys.argv[1] == "list":
+        for i, record in enumerate(read_records()):
+            size = len(record.get("ops", [])) if record["kind"] == "delta" else "full"
+            print(f"#{i} {record['kind']} @ {record['time']} ({size} ops) → {record['to'][:10]}")
+    else:
+        print("Usage: memory_delta.py rebuild <index> <json_out> | list")
@@ -0,0 +1,157 @@
+import os
+import json
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+
+import io_meter
+from memory_store import get_store
+from trace_store import get_trace_store
+from storage_backend import get_backend
+
+ARCHIVE_DIR = "memory_archive"
+HOT_REACTIONS = int(os.getenv("VIRIA_HOT_REACTIONS", "200"))
+HOT_VOICE_TRIGGERS = int(os.getenv("VIRIA_HOT_VOICE_TRIGGERS", "200"))
+HOT_TRACE_SEGMENTS = 2  # live segment + the newest closed one stay in looptrace/
+RETENTION_INTERVAL = 600  # seconds between enforce_retention runs
+TIME_KEYS = ("timestamp", "time")
+
+# Live memory keeps only a hot window of each growing list. Older entries move
+# to memory_archive/<kind>/<YYYY-MM-DD>.jsonl, partitioned by their own
+# timestamp, and remain queryable through iter_archived / emotion_counts.
+#
+# Entries are appended to the archive before they are trimmed from memory, so
+# a crash in between can only duplicate an entry in the archive, never lose it.
+
+_archive_lock = threading.Lock()
+
+def _entry_day(entry):
+    for key in TIME_KEYS:
+        stamp = entry.get(key) if isinstance(entry, dict) else None
+        if stamp:
+            return str(stamp)[:10]
+    return "undated"
+
+def _entry_time(entry):
+    for key in TIME_KEYS:
+        stamp = entry.get(key) if isinstance(entry, dict) else None
+        if stamp:
+            return str(stamp)
+    return None
+
+def _archive(kind, entries):
+    if not entries:
+        return 0
+    by_day = {}
+    for entry in entries:
+        by_day.setdefault(_entry_day(entry), []).append(entry)
+
+    kind_dir = os.path.join(ARCHIVE_DIR, kind)
+    with _archive_lock:
+        os.makedirs(kind_dir, exist_ok=True)
+        for day, day_entries in by_day.items():
+            payload = "".join(json.dumps(entry) + "\n" for entry in day_entries)
+            with open(os.path.join(kind_dir, f"{day}.jsonl"), "a") as f:
+                f.write(payload)
+            io_meter.add("archive", len(payload))
+    return len(entries)
+
+# --- Retention ---
+def _trim_list(store, archive_kind, entries, keep, op, **op_args):
+    with store.lock:
+        excess = len(entries) - keep
+        if excess <= 0:
+            return 0
+        cold = [dict(e) if isinstance(e, dict) else e for e in entries[:excess]]
+        _archive(archive_kind, cold)
+        store.apply(op, count=excess, **op_args)
+    return excess
+
+def enforce_retention():
+    store = get_store()
+    trace = get_trace_store()
+    moved = {}
+
+    moved["reactions"] = _trim_list(store, "reactions", store.reactions(), HOT_REACTIONS, "reactions_trimmed")
+    voice = store.triggers().get("voice", [])
+    moved["triggers_voice"] = _trim_list(store, "triggers_voice", voice, HOT_VOICE_TRIGGERS,
+                                         "triggers_trimmed", kind="voice")
+
+    backend = get_backend()
+    with trace.lock:
+        entry_types = list(trace.index)
+    for entry_type in entry_types:
+        closed = trace.closed_segments(entry_type)
+        moved_entries = 0
+        for segment in closed[:max(0, len(closed) - (HOT_TRACE_SEGMENTS - 1))]:
+            archived = _archive(f"trace_{entry_type}", trace.read_segment(entry_type, segment))
+            trace.drop_segment(entry_type, segment)
+            backend.traces_dropped(entry_type, archived)  # the SQLite mirror drops the same oldest rows
+            moved_entries += archived
+        moved[f"trace_{entry_type}"] = moved_entries
+
+    moved = {kind: n for kind, n in moved.items() if n}
+    if moved:
+        print(f"[🧊] Archived cold memory: {moved}")
+    return moved
+
+# --- Query API ---
+def archived_days(kind, since=None, until=None):
+    """Archive day files for `kind` overlapping [since, until), oldest first."""
+    kind_dir = os.path.join(ARCHIVE_DIR, kind)
+    if not os.path.isdir(kind_dir):
+        return []
+    since = since.isoformat() if isinstance(since, datetime) else since
+    until = until.isoformat() if isinstance(until, datetime) else until
+    days = []
+    for name in sorted(os.listdir(kind_dir)):
+        if not name.endswith(".jsonl"):
+            continue
+        day = name[:-6]
+        if day != "undated":
+            if since and day < since[:10]:
+                continue
+            if until and day > until[:10]:
+                continue
+        days.append(os.path.join(kind_dir, name))
+    return days
+
+def iter_archived(kind, since=None, until=None):
+    since = since.isoformat() if isinstance(since, datetime) else since
+    until = until.isoformat() if isinstance(until, datetime) else until
+    for path in archived_days(kind, since, until):
+        with open(path, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                stamp = _entry_time(entry)
+                if since and (stamp is None or stamp < since):
+                    continue
+                if until and (stamp is None or stamp >= until):
+                    continue
+                yield entry
+
+def emotion_counts(since=None, until=None, backend=None):
+    """Reaction emotions across the archive and the hot window."""
+    counts = Counter(e.get("emotion") or "unknown" for e in iter_archived("reactions", since, until))
+    if until is None:
+        counts.update((backend or get_backend()).emotion_counts(since))
+    else:
+        since_s = since.isoformat() if isinstance(since, datetime) else since
+        until_s = until.isoformat() if isinstance(until, datetime) else until
+        for r in get_store().frozen_view("reactions") or ():
+            stamp = r.get("timestamp") or ""
+            if (not since_s or stamp >= since_s) and stamp < until_s:
+                counts[r.get("emotion") or "unknown"] += 1
+    return dict(counts)
+
+def emotion_counts_for_week(now=None, backend=None):
+    now = now or datetime.now()
+    return emotion_counts(since=now - timedelta(days=7), backend=backend)
+
+# --- Example usage ---
+if __name__ == "__main__":
+    enforce_retention()
+    print("[📊] Emotions this week:", emotion_counts_for_week())
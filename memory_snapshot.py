@@ -0,0 +1,124 @@
+import os
+import sys
+import json
+import struct
+
+# Binary loopmemory snapshot: every top-level section (rituals, loops,
+# triggers, reactions, system_state, ...) is stored as its own compact JSON
+# block behind an offset table, so readers decode only the section they need.
+#
+#   header   : magic "VIRS" | version u16 | section count u16
+#   table    : per section → name length u8 | name | offset u64 | length u32
+#   sections : compact UTF-8 JSON blocks
+
+SNAPSHOT_SUFFIX = ".snap"
+MAGIC = b"VIRS"
+VERSION = 1
+HEADER = struct.Struct("<4sHH")
+TABLE_ENTRY = struct.Struct("<QI")
+
+class SnapshotError(Exception):
+    pass
+
+def snapshot_path_for(memory_path):
+    base = memory_path[:-5] if memory_path.endswith(".json") else memory_path
+    return base + SNAPSHOT_SUFFIX
+
+def encode_snapshot(memory):
+    names = list(memory.keys())
+    blocks = [json.dumps(memory[name], separators=(",", ":")).encode("utf-8") for name in names]
+    encoded_names = [name.encode("utf-8") for name in names]
+
+    table_size = sum(1 + len(n) + TABLE_ENTRY.size for n in encoded_names)
+    offset = HEADER.size + table_size
+
+    parts = [HEADER.pack(MAGIC, VERSION, len(names))]
+    for name, block in zip(encoded_names, blocks):
+        parts.append(struct.pack("<B", len(name)) + name + TABLE_ENTRY.pack(offset, len(block)))
+        offset += len(block)
+    parts.extend(blocks)
+    return b"".join(parts)
+
+def _read_exact(f, size, what):
+    data = f.read(size)
+    if len(data) != size:
+        raise SnapshotError(f"truncated {what}")
+    return data
+
+def _decode_block(block, name):
+    try:
+        return json.loads(block)
+    except (UnicodeDecodeError, ValueError) as e:
+        raise SnapshotError(f"corrupt section '{name}': {e}") from e
+
+def _read_table(f):
+    magic, version, count = HEADER.unpack(_read_exact(f, HEADER.size, "snapshot header"))
+    if magic != MAGIC or version != VERSION:
+        raise SnapshotError(f"unsupported snapshot format {magic!r} v{version}")
+
+    table = {}
+    for _ in range(count):
+        name_len = _read_exact(f, 1, "section table")[0]
+        try:
+            name = _read_exact(f, name_len, "section table").decode("utf-8")
+        except UnicodeDecodeError as e:
+            raise SnapshotError(f"corrupt section name: {e}") from e
+        table[name] = TABLE_ENTRY.unpack(_read_exact(f, TABLE_ENTRY.size, "section table"))
+
+    # Every block must lie between the table and the end of the file
+    blocks_start, size = f.tell(), os.fstat(f.fileno()).st_size
+    for name, (offset, length) in table.items():
+        if offset < blocks_start or offset + length > size:
+            raise SnapshotError(f"section '{name}' lies outside the snapshot")
+    return table
+
+def read_table(path):
+    """Section name → (offset, length), without decoding any section."""
+    with open(path, "rb") as f:
+        return _read_table(f)
+
+def read_section(path, name, default=None):
+    with open(path, "rb") as f:
+        table = _read_table(f)
+        if name not in table:
+            return default
+        offset, length = table[name]
+        f.seek(offset)
+        block = _read_exact(f, length, f"section '{name}'")
+    return _decode_block(block, name)
+
+def load_snapshot(path):
+    with open(path, "rb") as f:
+        table = _read_table(f)
+        memory = {}
+        for name, (offset, length) in table.items():
+            f.seek(offset)
+            memory[name] = _decode_block(_read_exact(f, length, f"section '{name}'"), name)
+    return memory
+
+def export_json(snapshot_path, json_path):
+    """Write a human-readable, pretty-printed copy of a binary snapshot."""
+    with open(json_path, "w") as f:
+        json.dump(load_snapshot(snapshot_path), f, indent=2)
+    print(f"[📤] Exported {snapshot_path} → {json_path}")
+
+def is_fresh(snapshot_path, json_path):
+    """True when the binary snapshot is at least as new as the JSON file."""
+    try:
+        snap_mtime = os.stat(snapshot_path).st_mtime_ns
+    except FileNotFoundError:
+        return False
+    try:
+        return snap_mtime >= os.stat(json_path).st_mtime_ns
+    except FileNotFoundError:
+        return True
+
+# --- CLI: python memory_snapshot.py export loopmemory.snap out.json ---
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "export":
+        export_json(sys.argv[2], sys.argv[3])
+    elif len(sys.argv) == 3 and sys.argv[1] == "sections":
+        for name, (offset, length) in read_table(sys.argv[2]).items():
+            print(f"• {name}: {length} bytes @ {offset}")
+    else:
+        print("Usage: memory_snapshot.py export <snapshot> <json_out> | sections <snapshot>")
@@ -0,0 +1,468 @@
+import json
+import os
+import glob
+import atexit
+import threading
+import io_meter
+
+try:
+    import fcntl
+except ImportError:  # not on POSIX: the owner lock is skipped
+    fcntl = None
+import loop_energy
+from doc_cache import FrozenDict, freeze, register_source
+from memory_checksum import write_checksum
+from memory_snapshot import SnapshotError, encode_snapshot, is_fresh, load_snapshot, snapshot_path_for
+
+MEMORY_PATH = "loopmemory.json"
+WAL_SUFFIX = ".wal"
+LOCK_SUFFIX = ".lock"
+COMPACT_INTERVAL = 30.0    # seconds between background compactions
+COMPACT_EVERY_OPS = 1000   # compact early once this many mutations pile up
+
+# --- Mutation log operations ---
+# Each op is appended to the write-ahead log before it is applied, so replaying
+# the log over the last snapshot rebuilds the exact same document. Each op
+# also names the top-level sections it changes, so doc_cache readers only
+# re-freeze those; `entries(args)` → {section: keys} narrows that further to
+# the entries of a keyed section (e.g. the loops a phrase touched).
+MUTATIONS = {}
+MUTATION_SECTIONS = {}
+MUTATION_ENTRIES = {}
+
+def mutation(name, *sections, entries=None):
+    def register(fn):
+        MUTATIONS[name] = fn
+        MUTATION_SECTIONS[name] = sections
+        if entries is not None:
+            MUTATION_ENTRIES[name] = entries
+        return fn
+    return register
+
+def _add_loop_energy(doc, entry, energy, time):
+    # Decay happens here, from the op's own timestamp, so WAL replay is deterministic
+    at = loop_energy.to_ts(time)
+    entry["loop_energy"], entry["energy_ts"] = loop_energy.accumulate(
+        entry.get("loop_energy", 0.0), loop_energy.entry_ts(entry), energy, at)
+    total = doc["system_state"][loop_energy.TOTAL_KEY]
+    total["energy"], total["ts"] = loop_energy.accumulate(total["energy"], total["ts"], energy, at)
+
+def _energy_total(doc, time):
+    state = doc.setdefault("system_state", {})
+    if loop_energy.TOTAL_KEY not in state:
+        state[loop_energy.TOTAL_KEY] = loop_energy.recompute_total(doc.get("loops", {}), loop_energy.to_ts(time))
+
+@mutation("loop_increment", "loops", "system_state", entries=lambda args: {"loops": (args["phrase"],)})
+def _loop_increment(doc, phrase, time, energy):
+    _energy_total(doc, time)
+    entry = doc.setdefault("loops", {}).setdefault(phrase, {
+        "count": 0,
+        "last_used": None,
+        "importance": "low",
+        "loop_energy": 0.0,
+        "energy_ts": None,
+        "ritualized": False
+    })
+    entry["count"] += 1
+    _add_loop_energy(doc, entry, energy, time)
+    entry["last_used"] = time
+    return entry
+
+@mutation("loops_merged", "loops", "system_state", entries=lambda args: {"loops": args["loops"]})
+def _loops_merged(doc, loops, ritualized):
+    # Bulk form of loop_increment: {phrase: {"count", "last_used", "energy"}} deltas.
+    # Each delta's energy lands at its last_used time.
+    table = doc.setdefault("loops", {})
+    for phrase, delta in loops.items():
+        _energy_total(doc, delta["last_used"])
+        entry = table.setdefault(phrase, {
+            "count": 0,
+            "last_used": None,
+            "importance": "low",
+            "loop_energy": 0.0,
+            "energy_ts": None,
+            "ritualized": False
+        })
+        entry["count"] += delta["count"]
+        _add_loop_energy(doc, entry, delta["energy"], delta["last_used"])
+        entry["last_used"] = delta["last_used"]
+    for phrase in ritualized:
+        table[phrase]["ritualized"] = True
+
+@mutation("loop_ritualized", "loops", entries=lambda args: {"loops": (args["phrase"],)})
+def _loop_ritualized(doc, phrase):
+    doc.setdefault("loops", {}).get(phrase, {})["ritualized"] = True
+
+@mutation("ritual_added", "rituals")
+def _ritual_added(doc, ritual):
+    doc.setdefault("rituals", []).append(ritual)
+
+@mutation("ritual_triggered", "rituals")
+def _ritual_triggered(doc, name, time):
+    for ritual in doc.setdefault("rituals", []):
+        if ritual["name"] == name:
+            ritual["usage_count"] = ritual.get("usage_count", 0) + 1
+            ritual["last_triggered"] = time
+            return ritual
+
+@mutation("rituals_loaded", "rituals", "system_state")
+def _rituals_loaded(doc, profile, rituals, emotion_bias, merge, time):
+    if merge:
+        existing = doc.setdefault("rituals", [])
+        names = {r["name"] for r in existing}
+        existing.extend(r for r in rituals if r["name"] not in names)
+    else:
+        doc["rituals"] = rituals
+    state = doc.setdefault("system_state", {})
+    state["emotion_bias"] = emotion_bias
+    state["last_loaded_identity"] = profile
+    state["identity_loaded_at"] = time
+
+@mutation("mood_stacked", "system_state")
+def _mood_stacked(doc, emotion, weight, cap):
+    mood = doc.setdefault("system_state", {}).setdefault("mood_score", {})
+    mood[emotion] = min(mood.get(emotion, 0.0) + weight, cap)
+    return mood[emotion]
+
+@mutation("reaction_logged", "reactions")
+def _reaction_logged(doc, entry):
+    doc.setdefault("reactions", []).append(entry)
+
+@mutation("reactions_trimmed", "reactions")
+def _reactions_trimmed(doc, count):
+    del doc.setdefault("reactions", [])[:count]
+
+@mutation("triggers_trimmed", "triggers")
+def _triggers_trimmed(doc, kind, count):
+    del doc.setdefault("triggers", {}).setdefault(kind, [])[:count]
+
+@mutation("mission_assigned", "system_state")
+def _mission_assigned(doc, mission):
+    state = doc.setdefault("system_state", {})
+    state["current_mission"] = mission
+    state.setdefault("mission_history", []).append(dict(mission))
+
+@mutation("mission_completed", "system_state")
+def _mission_completed(doc, time):
+    state = doc.setdefault("system_state", {})
+    mission = state.get("current_mission")
+    if not mission:
+        return
+    for entry in [mission] + state.setdefault("mission_history", [])[-1:]:
+        if entry.get("assigned_at") == mission.get("assigned_at"):
+            entry["completed_at"] = time
+            entry["status"] = "complete"
+    state["current_mission"] = None
+
+@mutation("state_set", "system_state")
+def _state_set(doc, key, value):
+    doc.setdefault("system_state", {})[key] = value
+
+@mutation("state_default", "system_state")
+def _state_default(doc, key, value):
+    return doc.setdefault("system_state", {}).setdefault(key, value)
+
+class StoreOwnedError(RuntimeError):
+    """Another process already owns this memory file's store."""
+
+class MemoryStore:
+    """Single in-process owner of loopmemory.json.
+
+    Writers call `apply(op, **args)`: the op is appended to the write-ahead
+    log in O(1) and applied to the shared document. A background compactor
+    folds the log into the JSON snapshot every COMPACT_INTERVAL seconds, and
+    startup replays whatever the last snapshot is missing.
+
+    Only one process may own a given file: an exclusive lock on
+    `<path>.lock` is held for the store's lifetime, and a second owner gets
+    StoreOwnedError. Other processes read through doc_cache instead.
+    """
+
+    def __init__(self, path=MEMORY_PATH, compact_interval=COMPACT_INTERVAL):
+        self.path = path
+        self.wal_path = path + WAL_SUFFIX
+        self.snapshot_path = snapshot_path_for(path)
+        self.compact_interval = compact_interval
+        self._owner_lock = self._acquire_owner_lock()
+        self.lock = threading.RLock()
+        self.data = self._load()
+        self.seq = self.data.get("system_state", {}).get("wal_seq", 0)
+        self._dirty = False
+        self._ops_since_compact = 0
+        self._timer = None
+        self._write_lock = threading.Lock()
+        self._listeners = []
+        self._section_versions = {}  # section → mutations applied to it since startup
+        self._frozen = {}            # section → last frozen view handed out
+        self._stale = {}             # section → changed keys since that view (None: all of it)
+
+        self._replay()
+        self._wal = open(self.wal_path, "a")
+        if self._dirty:
+            self.compact()
+
+        # doc_cache readers of this path see live state; a section is re-frozen
+        # only after a mutation to that section
+        register_source(path, self.section_version, self.frozen_view, self.sections)
+
+    def _acquire_owner_lock(self):
+        lock_file = open(self.path + LOCK_SUFFIX, "a+")
+        if fcntl is None:
+            return lock_file
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.seek(0)
+            owner = lock_file.read().strip() or "unknown"
+            lock_file.close()
+            raise StoreOwnedError(f"{self.path} is owned by process {owner}; read it through doc_cache instead")
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(str(os.getpid()))
+        lock_file.flush()
+        return lock_file
+
+    def _load(self):
+        # The binary snapshot decodes faster; use it unless the JSON was edited since
+        if is_fresh(self.snapshot_path, self.path):
+            try:
+                return load_snapshot(self.snapshot_path)
+            except SnapshotError as e:
+                print(f"[⚠️] Ignoring unreadable {self.snapshot_path}: {e}")
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, "r") as f:
+            return json.load(f)
+
+    def _wal_segments(self):
+        segments = [p for p in glob.glob(self.wal_path + ".*") if p.rsplit(".", 1)[-1].isdigit()]
+        return sorted(segments, key=lambda p: int(p.rsplit(".", 1)[-1]))
+
+    def _replay(self):
+        replayed = 0
+        for wal_file in self._wal_segments() + [self.wal_path]:
+            if not os.path.exists(wal_file):
+                continue
+            with open(wal_file, "r") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn write from a crash — nothing valid follows it
+                        self._dirty = True
+                        break
+                    if entry["seq"] <= self.seq:
+                        continue
+                    try:
+                        MUTATIONS[entry["op"]](self.data, **entry["args"])
+                    except Exception as e:
+                        print(f"[⚠️] Skipping unreplayable mutation {entry['seq']} ({entry['op']}): {e}")
+                    self.seq = entry["seq"]
+                    replayed += 1
+
+        if replayed:
+            print(f"[🔁] Replayed {replayed} memory mutations from {self.wal_path}")
+            self._dirty = True
+
+    # --- Typed accessors (hold `lock` while reading nested state) ---
+    def rituals(self):
+        return self.data.setdefault("rituals", [])
+
+    def loops(self):
+        return self.data.setdefault("loops", {})
+
+    def loop(self, phrase):
+        return self.data.get("loops", {}).get(phrase)
+
+    def triggers(self):
+        return self.data.setdefault("triggers", {})
+
+    def reactions(self):
+        return self.data.setdefault("reactions", [])
+
+    def system_state(self):
+        return self.data.setdefault("system_state", {})
+
+    def mood_score(self):
+        return self.system_state().setdefault("mood_score", {})
+
+    def frozen_view(self, section=None):
+        with self.lock:
+            if section is None:
+                return freeze(self.data)
+            view = self._frozen.get(section)
+            if view is not None and section not in self._stale:
+                return view
+            stale = self._stale.pop(section, None)
+            value = self.data.get(section)
+            if stale is not None and isinstance(view, dict) and isinstance(value, dict):
+                # Reuse the frozen entries that did not change
+                view = FrozenDict(view)
+                for key in stale:
+                    if key in value:
+                        dict.__setitem__(view, key, freeze(value[key]))
+                    else:
+                        dict.pop(view, key, None)
+            else:
+                view = freeze(value)
+            self._frozen[section] = view
+            return view
+
+    def sections(self):
+        with self.lock:
+            return list(self.data)
+
+    def section_version(self, section):
+        return self._section_versions.get(section, 0)
+
+    def _touch(self, op, args):
+        entries = MUTATION_ENTRIES.get(op)
+        keys = entries(args) if entries else {}
+        for section in MUTATION_SECTIONS[op]:
+            self._touch_section(section, keys.get(section))
+
+    def _touch_section(self, section, changed=None):
+        # `changed`: the keys of the section that changed, or None for all of it
+        self._section_versions[section] = self._section_versions.get(section, 0) + 1
+        view = self._frozen.get(section)
+        if view is None:
+            return  # never frozen: the next read freezes it whole anyway
+        if changed is None:
+            self._stale[section] = None
+        elif section not in self._stale:
+            self._stale[section] = set(changed)
+        elif self._stale[section] is not None:
+            self._stale[section].update(changed)
+            if len(self._stale[section]) > len(view) // 2:
+                self._stale[section] = None  # cheaper to re-freeze it whole
+
+    # --- Mutations ---
+    def apply(self, op, **args):
+        apply_fn = MUTATIONS[op]
+        with self.lock:
+            self.seq += 1
+            line = json.dumps({"seq": self.seq, "op": op, "args": args}) + "\n"
+            self._wal.write(line)
+            self._wal.flush()
+            io_meter.add("wal", len(line))  # json.dumps is ASCII-only, so chars == bytes
+            result = apply_fn(self.data, **args)
+            self._touch(op, args)
+            self._ops_since_compact += 1
+            self.mark_dirty()
+            for listener in self._listeners:
+                try:
+                    listener(self.seq, op, args)
+                except Exception as e:
+                    print(f"[⚠️] Memory listener failed on {op}: {e}")
+        return result
+
+    def apply_many(self, ops):
+        """Apply [(op, args), ...] as one WAL write and flush; returns each op's result."""
+        ops = list(ops)
+        if not ops:
+            return []
+        apply_fns = [MUTATIONS[op] for op, _ in ops]
+        results = []
+        with self.lock:
+            first_seq = self.seq + 1
+            lines = []
+            for op, args in ops:
+                self.seq += 1
+                lines.append(json.dumps({"seq": self.seq, "op": op, "args": args}) + "\n")
+            payload = "".join(lines)
+            self._wal.write(payload)
+            self._wal.flush()
+            io_meter.add("wal", len(payload))
+            for seq, apply_fn, (op, args) in zip(range(first_seq, self.seq + 1), apply_fns, ops):
+                results.append(apply_fn(self.data, **args))
+                self._touch(op, args)
+                for listener in self._listeners:
+                    try:
+                        listener(seq, op, args)
+                    except Exception as e:
+                        print(f"[⚠️] Memory listener failed on {op}: {e}")
+            self._ops_since_compact += len(ops)
+            self.mark_dirty()
+        return results
+
+    def add_listener(self, listener):
+        # listener(seq, op, args) runs after each applied mutation, under `lock`
+        with self.lock:
+            self._listeners.append(listener)
+
+    def mark_dirty(self):
+        with self.lock:
+            self._dirty = True
+            if self._ops_since_compact >= COMPACT_EVERY_OPS:
+                self._schedule(0)
+            elif self._timer is None:
+                self._schedule(self.compact_interval)
+
+    def _schedule(self, delay):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(delay, self.compact)
+        self._timer.daemon = True
+        self._timer.start()
+
+    # --- Compaction ---
+    def compact(self):
+        # Serialize and write under one write lock so an older snapshot can
+        # never land on disk after a newer one.
+        with self._write_lock:
+            with self.lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty:
+                    return
+                self.system_state()["wal_seq"] = self.seq
+                self._touch_section("system_state", ("wal_seq",))
+                payload = json.dumps(self.data, indent=2).encode("utf-8")
+                snapshot = encode_snapshot(self.data)
+                self._dirty = False
+                self._ops_since_compact = 0
+                folded = self._rotate_wal()
+
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, self.path)
+            write_checksum(self.path, payload)
+
+            # Written second so its mtime marks it as fresh against the JSON
+            tmp_path = self.snapshot_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(snapshot)
+            os.replace(tmp_path, self.snapshot_path)
+            io_meter.add("compaction", len(payload) + len(snapshot))
+
+            # The snapshot now covers every folded op
+            for wal_file in folded:
+                os.remove(wal_file)
+
+    def _rotate_wal(self):
+        self._wal.close()
+        if os.path.getsize(self.wal_path) > 0:
+            os.replace(self.wal_path, f"{self.wal_path}.{self.seq}")
+        self._wal = open(self.wal_path, "a")
+        return self._wal_segments()
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def get_store(path=MEMORY_PATH):
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = MemoryStore(path)
+            _stores[path] = store
+        return store
+
+def flush_all():
+    with _stores_lock:
+        stores = list(_stores.values())
+    for store in stores:
+        store.compact()
+
+atexit.register(flush_all)
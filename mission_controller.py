@@ -1,30 +1,44 @@
 import json
 import os
 from datetime import datetime
+from memory_store import get_store
+from ring_log import get_log
 
 LOOPMEMORY_PATH = "loopmemory.json"
 MISSION_LOG_PATH = "mission_log.json"
+MISSION_REQUESTS_DIR = "mission_requests"  # one JSON file per mission queued by another process
+
+def request_mission(title, goal_description, success_conditions=None, emotion_bias=None):
+    """Queue a mission from a process that doesn't own the memory store (dashboard).
+
+    The core assigns it on its next MissionController.apply_requests().
+    """
+    os.makedirs(MISSION_REQUESTS_DIR, exist_ok=True)
+    request = {
+        "title": title,
+        "goal_description": goal_description,
+        "success_conditions": success_conditions,
+        "emotion_bias": emotion_bias
+    }
+    name = f"{datetime.now().strftime('%Y%m%dT%H%M%S%f')}-{os.getpid()}.json"
+    tmp_path = os.path.join(MISSION_REQUESTS_DIR, name + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(request, f)
+    os.replace(tmp_path, os.path.join(MISSION_REQUESTS_DIR, name))
 
 class MissionController:
     def __init__(self):
-        self.memory = self._load_memory()
+        self.store = get_store(LOOPMEMORY_PATH)
+        self.memory = self.store.data
         self._ensure_mission_structure()
 
-    def _load_memory(self):
-        if os.path.exists(LOOPMEMORY_PATH):
-            with open(LOOPMEMORY_PATH, "r") as f:
-                return json.load(f)
-        return {}
-
-    def _save_memory(self):
-        with open(LOOPMEMORY_PATH, "w") as f:
-            json.dump(self.memory, f, indent=2)
-
     def _ensure_mission_structure(self):
-        self.memory.setdefault("system_state", {})
-        self.memory["system_state"].setdefault("current_mission", None)
-        self.memory["system_state"].setdefault("mission_history", [])
-        self._save_memory()
+        with self.store.lock:
+            state = self.store.system_state()
+            if "current_mission" not in state:
+                self.store.apply("state_set", key="current_mission", value=None)
+            if "mission_history" not in state:
+                self.store.apply("state_set", key="mission_history", value=[])
 
     def assign_mission(self, title, goal_description, success_conditions=None, emotion_bias=None):
         mission = {
@@ -36,9 +50,7 @@ class MissionController:
             "status": "active"
         }
 
-        self.memory["system_state"]["current_mission"] = mission
-        self.memory["system_state"]["mission_history"].append(mission)
-        self._save_memory()
+        self.store.apply("mission_assigned", mission=mission)
         self._log_mission(mission)
 
         print(f"\n[🎯] Mission Assigned: {title}")
@@ -48,16 +60,25 @@ class MissionController:
         if emotion_bias:
             print(f"Emotional Tilt: {emotion_bias}")
 
-    def _log_mission(self, mission):
-        if os.path.exists(MISSION_LOG_PATH):
-            with open(MISSION_LOG_PATH, "r") as f:
-                log = json.load(f)
-        else:
-            log = []
+    def apply_requests(self):
+        """Assign missions queued with request_mission(), oldest first."""
+        if not os.path.isdir(MISSION_REQUESTS_DIR):
+            return 0
+        applied = 0
+        for name in sorted(f for f in os.listdir(MISSION_REQUESTS_DIR) if f.endswith(".json")):
+            path = os.path.join(MISSION_REQUESTS_DIR, name)
+            try:
+                with open(path, "r") as f:
+                    request = json.load(f)
+                self.assign_mission(**request)
+                applied += 1
+            except (ValueError, TypeError) as e:
+                print(f"[⚠️] Discarding unreadable mission request {name}: {e}")
+            os.remove(path)
+        return applied
 
-        log.append(mission)
-        with open(MISSION_LOG_PATH, "w") as f:
-            json.dump(log[-100:], f, indent=2)
+    def _log_mission(self, mission):
+        get_log(MISSION_LOG_PATH, max_entries=100, time_key="assigned_at").append(mission)
 
     def get_active_mission(self):
         return self.memory.get("system_state", {}).get("current_mission", None)
@@ -68,10 +89,7 @@ class MissionController:
             print("[⚠️] No active mission.")
             return
 
-        mission["completed_at"] = datetime.now().isoformat()
-        mission["status"] = "complete"
-        self.memory["system_state"]["current_mission"] = None
-        self._save_memory()
+        self.store.apply("mission_completed", time=datetime.now().isoformat())
 
         print(f"[🏁] Mission Complete: {mission['title']}")
 
@@ -2,52 +2,74 @@ import json
 import os
 import time
 from datetime import datetime, timedelta
+from memory_store import get_store
+from event_bus import publish
 
 MEMORY_PATH = "loopmemory.json"
 DECAY_RATE = 0.1  # Mood decay per scan cycle
 MAX_MOOD_VALUE = 10.0
 
-class MoodStacker:
-    def __init__(self):
-        self.memory = self._load_memory()
+_watched = set()
+
+def watch_mood(store):
+    """Publish mood_changed after every mood mutation on `store`, whoever applies it."""
+    if id(store) in _watched:
+        return
+    _watched.add(id(store))
+    last_top = [_top_mood(store.data)]
+
+    def on_mutation(seq, op, args):
+        if op == "mood_stacked":
+            emotion = args["emotion"]
+        elif op == "state_set" and args["key"] == "mood_score":
+            emotion = None  # decay or reset
+        else:
+            return
+        mood = dict(store.data.get("system_state", {}).get("mood_score", {}))
+        top = _top_mood(store.data)
+        publish("mood_changed", emotion=emotion, top=top, previous_top=last_top[0], mood=mood)
+        last_top[0] = top
+
+    store.add_listener(on_mutation)
 
-    def _load_memory(self):
-        if os.path.exists(MEMORY_PATH):
-            with open(MEMORY_PATH, "r") as f:
-                return json.load(f)
-        return {"system_state": {"mood_score": {}}}
+def _top_mood(memory):
+    mood = memory.get("system_state", {}).get("mood_score", {})
+    return max(mood, key=mood.get) if mood else "calm"
 
-    def _save_memory(self):
-        with open(MEMORY_PATH, "w") as f:
-            json.dump(self.memory, f, indent=2)
+class MoodStacker:
+    def __init__(self):
+        self.store = get_store(MEMORY_PATH)
+        self.memory = self.store.data
+        watch_mood(self.store)
 
     def stack_emotion(self, emotion, weight=1.0):
-        mood = self.memory.setdefault("system_state", {}).setdefault("mood_score", {})
-        mood[emotion] = min(mood.get(emotion, 0.0) + weight, MAX_MOOD_VALUE)
-        self._save_memory()
-        print(f"[🧠] Mood stacked: +{weight} → {emotion} → Total: {mood[emotion]:.2f}")
+        total = self.store.apply("mood_stacked", emotion=emotion, weight=weight, cap=MAX_MOOD_VALUE)
+        print(f"[🧠] Mood stacked: +{weight} → {emotion} → Total: {total:.2f}")
 
     def decay_moods(self):
         now = datetime.now()
-        mood = self.memory.get("system_state", {}).get("mood_score", {})
         decayed = False
 
-        for key in list(mood.keys()):
-            mood[key] -= DECAY_RATE
-            if mood[key] <= 0:
-                del mood[key]
-            else:
-                decayed = True
+        with self.store.lock:
+            mood = dict(self.memory.get("system_state", {}).get("mood_score", {}))
+            if not mood:
+                return
+
+            for key in list(mood.keys()):
+                mood[key] -= DECAY_RATE
+                if mood[key] <= 0:
+                    del mood[key]
+                else:
+                    decayed = True
+
+            self.store.apply("state_set", key="mood_score", value=mood)
 
         if decayed:
-            self._save_memory()
             print("[🕊️] Mood decay applied.")
 
     def get_top_mood(self):
-        mood = self.memory.get("system_state", {}).get("mood_score", {})
-        if not mood:
-            return "calm"
-        return max(mood, key=mood.get)
+        with self.store.lock:
+            return _top_mood(self.memory)
 
     def print_mood_state(self):
         mood = self.memory.get("system_state", {}).get("mood_score", {})
@@ -0,0 +1,23 @@
+import os
+import threading
+
+# One OpenAI client per process, built on first use. openai and dotenv are
+# imported here rather than at module top so that importing a module that
+# *can* call the API (and every worker process re-importing main) doesn't
+# pay for the SDK or read .env until a reflection or patch plan actually runs.
+_client = None
+_client_lock = threading.Lock()
+
+def get_openai_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            from dotenv import load_dotenv
+            from openai import OpenAI
+            load_dotenv()  # API key from .env
+            _client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        return _client
+
+# --- Example usage ---
+if __name__ == "__main__":
+    print(get_openai_client())
@@ -2,6 +2,9 @@ import time
 import json
 import os
 from datetime import datetime
+from doc_cache import load_section
+from loop_energy import TOTAL_KEY, total_at
+from ring_log import get_log
 
 LOOPMEMORY_PATH = "loopmemory.json"
 HEARTBEAT_LOG_PATH = "heartbeat_log.json"
@@ -10,39 +13,25 @@ class PresenceHeartbeat:
     def __init__(self):
         self.last_check = datetime.now()
 
-    def _load_memory(self):
-        if os.path.exists(LOOPMEMORY_PATH):
-            with open(LOOPMEMORY_PATH, "r") as f:
-                return json.load(f)
-        return {}
+    def _load_state(self):
+        return load_section(LOOPMEMORY_PATH, "system_state", default={})
 
     def _log_heartbeat(self, status):
         log_entry = {
             "timestamp": datetime.now().isoformat(),
             "status": status
         }
-
-        if os.path.exists(HEARTBEAT_LOG_PATH):
-            with open(HEARTBEAT_LOG_PATH, "r") as f:
-                log = json.load(f)
-        else:
-            log = []
-
-        log.append(log_entry)
-        with open(HEARTBEAT_LOG_PATH, "w") as f:
-            json.dump(log[-100:], f, indent=2)
+        get_log(HEARTBEAT_LOG_PATH, max_entries=100, time_key="timestamp").append(log_entry)
 
     def check_vitals(self):
-        memory = self._load_memory()
-
-        state = memory.get("system_state", {})
+        state = self._load_state()
         mood = state.get("mood_score", {})
         attention = state.get("attention", {})
         env = state.get("environment", {})
-        loop_energy = state.get("loop_energy_by_hour", {})
 
         active = bool(mood) or bool(attention) or bool(env)
-        total_energy = sum(float(v) for v in loop_energy.values()) if loop_energy else 0
+        # Running decayed total kept by the memory store; no per-loop scan
+        total_energy = total_at(state.get(TOTAL_KEY))
 
         status = {
             "alive": active,
@@ -2,6 +2,8 @@ import json
 import time
 import os
 from datetime import datetime
+from doc_cache import load_section
+from event_bus import subscribe
 
 MEMORY_PATH = "loopmemory.json"
 
@@ -38,18 +40,19 @@ EMOTION_COLORS = {
 
 class PresenceLayer:
     def __init__(self):
-        self.memory = self._load_memory()
+        self.state = self._load_state()
         self.current_emotion = self._get_dominant_emotion()
 
-    def _load_memory(self):
-        if not os.path.exists(MEMORY_PATH):
+    def _load_state(self):
+        # Only the system_state section is decoded, not the whole memory
+        state = load_section(MEMORY_PATH, "system_state")
+        if state is None:
             print("[⚠️] loopmemory.json not found.")
             return {}
-        with open(MEMORY_PATH, "r") as f:
-            return json.load(f)
+        return state
 
     def _get_dominant_emotion(self):
-        mood = self.memory.get("system_state", {}).get("mood_score", {})
+        mood = self.state.get("mood_score", {})
         if not mood:
             return "calm"
         # Return the emotion with the highest score
@@ -65,8 +68,18 @@ class PresenceLayer:
         print(color + face + reset)
         print(f"Time: {datetime.now().strftime('%H:%M:%S')} | Mood: {emotion}")
 
+    def follow(self):
+        # Redraw only when the dominant mood actually changes
+        subscribe("mood_changed", self._on_mood)
+        return self
+
+    def _on_mood(self, event):
+        if event.data["top"] != event.data["previous_top"]:
+            self.current_emotion = event.data["top"]
+            self.display_face()
+
     def update_and_show(self):
-        self.memory = self._load_memory()
+        self.state = self._load_state()
         self.current_emotion = self._get_dominant_emotion()
         self.display_face()
 
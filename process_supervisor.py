@@ -0,0 +1,213 @@
+import os
+import time
+import queue
+import importlib
+import threading
+import multiprocessing
+
+START_METHOD = os.getenv("VIRIA_MP_START", "spawn")  # fresh interpreters: no forked locks or threads
+HEARTBEAT_INTERVAL = 2.0   # seconds between heartbeats from an idle worker
+MAX_RESTART_DELAY = 60.0   # seconds; cap for the restart backoff
+STABLE_AFTER = 300.0       # seconds of uptime after which the restart backoff resets
+
+# CPU-heavy subsystems (camera motion detection, speech recognition, batch
+# analytics) run in their own worker processes so they use other cores
+# instead of competing with the voice → ritual path for the GIL. Workers
+# only send small event messages back over a queue; frames and audio never
+# leave the worker. Each worker stamps a shared heartbeat value, and
+# check_health() restarts workers that died or stopped beating, with
+# exponential backoff.
+
+def _resolve(target):
+    module, _, name = target.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+class WorkerContext:
+    """What a worker function sees: emit events, beat, read commands."""
+
+    def __init__(self, name, events, commands, heartbeat):
+        self.name = name
+        self.events = events
+        self.commands = commands
+        self._heartbeat = heartbeat
+
+    def emit(self, kind, **payload):
+        self.events.put((self.name, kind, payload))
+
+    def beat(self):
+        self._heartbeat.value = time.time()
+
+def _worker_main(name, target, events, commands, heartbeat):
+    ctx = WorkerContext(name, events, commands, heartbeat)
+    ctx.beat()
+    try:
+        _resolve(target)(ctx)
+    except KeyboardInterrupt:
+        pass
+
+def job_worker(ctx):
+    """Runs "module:function" jobs sent with Supervisor.submit(), one at a time."""
+    while True:
+        try:
+            job = ctx.commands.get(timeout=HEARTBEAT_INTERVAL)
+        except queue.Empty:
+            ctx.beat()
+            continue
+        if job is None:
+            return
+        ctx.beat()
+        start = time.perf_counter()
+        try:
+            result = _resolve(job)()
+            ctx.emit("job_done", job=job, ok=True, seconds=round(time.perf_counter() - start, 3),
+                     result=result if isinstance(result, (int, float, str, type(None))) else repr(result))
+        except Exception as e:
+            ctx.emit("job_done", job=job, ok=False, seconds=round(time.perf_counter() - start, 3), error=repr(e))
+        ctx.beat()
+
+class WorkerSpec:
+    def __init__(self, name, target, timeout=30.0):
+        self.name = name
+        self.target = target      # "module:function" taking a WorkerContext
+        self.timeout = timeout    # seconds without a heartbeat before the worker is restarted
+
+class WorkerHandle:
+    def __init__(self, spec):
+        self.spec = spec
+        self.process = None
+        self.commands = None
+        self.heartbeat = None
+        self.started_at = 0.0
+        self.restarts = 0
+        self.next_start = 0.0     # earliest restart time while backing off
+        self.last_exit = None
+
+class Supervisor:
+    def __init__(self, specs=()):
+        self.mp = multiprocessing.get_context(START_METHOD)
+        self.events = self.mp.Queue()
+        self.workers = {spec.name: WorkerHandle(spec) for spec in specs}
+        self.handlers = {}
+        self.lock = threading.Lock()
+        self._consumer = None
+        self._stopping = False
+
+    def on(self, kind, handler):
+        """handler(worker_name, **payload) runs in the core for each `kind` event."""
+        self.handlers.setdefault(kind, []).append(handler)
+
+    def submit(self, worker, job):
+        handle = self.workers[worker]
+        if handle.process is None or not handle.process.is_alive():
+            print(f"[⚠️] Worker {worker} is down, job dropped: {job}")
+            return False
+        handle.commands.put(job)
+        return True
+
+    # --- Lifecycle ---
+    def start(self):
+        with self.lock:
+            for handle in self.workers.values():
+                self._spawn(handle)
+            if self._consumer is None:
+                self._consumer = threading.Thread(target=self._consume, name="worker-events", daemon=True)
+                self._consumer.start()
+        print(f"[🧩] Supervisor started workers: {', '.join(self.workers)}")
+
+    def _spawn(self, handle):
+        spec = handle.spec
+        handle.commands = self.mp.Queue()
+        handle.heartbeat = self.mp.Value("d", time.time(), lock=False)
+        handle.process = self.mp.Process(
+            target=_worker_main, name=f"viria-{spec.name}", daemon=True,
+            args=(spec.name, spec.target, self.events, handle.commands, handle.heartbeat))
+        handle.process.start()
+        handle.started_at = time.time()
+
+    def _stop_process(self, handle, timeout=3.0):
+        process = handle.process
+        if process is None:
+            return
+        if process.is_alive():
+            handle.commands.put(None)
+            process.join(timeout)
+        if process.is_alive():
+            process.terminate()
+            process.join(timeout)
+        handle.last_exit = process.exitcode
+
+    def check_health(self):
+        """Restart dead or silent workers; meant to run periodically (see main)."""
+        now = time.time()
+        with self.lock:
+            if self._stopping:
+                return
+            for name, handle in self.workers.items():
+                process = handle.process
+                alive = process is not None and process.is_alive()
+                silent = alive and now - handle.heartbeat.value > handle.spec.timeout
+                if alive and not silent:
+                    if handle.restarts and now - handle.started_at > STABLE_AFTER:
+                        handle.restarts = 0
+                    continue
+                if now < handle.next_start:
+                    continue
+                if silent:
+                    print(f"[⚠️] Worker {name} missed heartbeats for {now - handle.heartbeat.value:.0f}s, restarting")
+                    self._stop_process(handle, timeout=1.0)
+                else:
+                    handle.last_exit = process.exitcode if process is not None else None
+                    print(f"[⚠️] Worker {name} exited (code {handle.last_exit}), restarting")
+                handle.restarts += 1
+                handle.next_start = now + min(2 ** handle.restarts, MAX_RESTART_DELAY)
+                self._spawn(handle)
+
+    def stop(self):
+        with self.lock:
+            self._stopping = True
+            for handle in self.workers.values():
+                self._stop_process(handle)
+        self.events.put(None)
+        if self._consumer is not None:
+            self._consumer.join(timeout=2.0)
+
+    def status(self):
+        now = time.time()
+        with self.lock:
+            return {
+                name: {
+                    "pid": handle.process.pid if handle.process else None,
+                    "alive": bool(handle.process and handle.process.is_alive()),
+                    "uptime_s": round(now - handle.started_at, 1) if handle.process else 0.0,
+                    "heartbeat_age_s": round(now - handle.heartbeat.value, 1) if handle.heartbeat else None,
+                    "restarts": handle.restarts,
+                    "last_exit": handle.last_exit
+                } for name, handle in self.workers.items()
+            }
+
+    # --- Events from workers ---
+    def _consume(self):
+        while True:
+            try:
+                message = self.events.get()
+            except (EOFError, OSError):
+                return  # queue torn down at shutdown
+            if message is None:
+                return
+            worker, kind, payload = message
+            for handler in self.handlers.get(kind, ()):
+                try:
+                    handler(worker, **payload)
+                except Exception as e:
+                    print(f"[⚠️] Handler for {kind} from {worker} failed: {e}")
+
+# --- Example usage ---
+if __name__ == "__main__":
+    supervisor = Supervisor([WorkerSpec("analytics", "process_supervisor:job_worker", timeout=900)])
+    supervisor.on("job_done", lambda worker, **r: print(f"[📦] {worker} → {r}"))
+    supervisor.start()
+    supervisor.submit("analytics", "memory_compressor:compress_all")
+    time.sleep(5)
+    supervisor.check_health()
+    print(supervisor.status())
+    supervisor.stop()
@@ -1,6 +1,7 @@
 import random
 import time
 from datetime import datetime
+import clock
 
 # Optional: import TTS or sound logic
 try:
@@ -53,6 +54,32 @@ class ReactionEngine:
 
         emoji = random.choice(REACTION_MAP[emotion_type])
         face = ASCII_FACES.get(emotion_type, "")
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        timestamp = clock.now().strftime("%H:%M:%S")
 
         print("\n[🎭 VIRIA REACTS]")
+        print(f"{emoji}  {emotion_type.upper()}  ← {source} @ {timestamp}")
+        if face:
+            print(face)
+
+        if self.tts:
+            self.tts.say(f"I feel {emotion_type}")
+            self.tts.runAndWait()
+
+        self.last_reaction = {
+            "emotion": emotion_type,
+            "emoji": emoji,
+            "face": face.strip(),
+            "source": source,
+            "time": timestamp
+        }
+        return self.last_reaction
+
+    def get_last_reaction(self):
+        return self.last_reaction or {}
+
+# --- Example usage ---
+if __name__ == "__main__":
+    engine = ReactionEngine()
+    for emotion in ("joy", "curious", "sacred"):
+        engine.react(emotion, source="demo")
+        time.sleep(1)
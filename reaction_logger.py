@@ -1,42 +1,35 @@
 import json
 from datetime import datetime
+import clock
 import os
+from memory_store import get_store
 
 MEMORY_PATH = "loopmemory.json"
 
 class ReactionLogger:
     def __init__(self, memory_path=MEMORY_PATH):
         self.memory_path = memory_path
-        self.memory = self._load_memory()
-
-    def _load_memory(self):
-        if not os.path.exists(self.memory_path):
-            return {}
-        with open(self.memory_path, "r") as f:
-            return json.load(f)
-
-    def _save_memory(self):
-        with open(self.memory_path, "w") as f:
-            json.dump(self.memory, f, indent=2)
-
-    def log_reaction(self, emotion, emoji, source="unknown", face=None, mood_score=None):
-        timestamp = datetime.now().isoformat()
+        self.store = get_store(memory_path)
+        self.memory = self.store.data
 
+    @staticmethod
+    def build_entry(emotion, emoji, source="unknown", face=None, mood_score=None):
         entry = {
             "emotion": emotion,
             "emoji": emoji,
             "face": face if face else "",
-            "timestamp": timestamp,
+            "timestamp": clock.now().isoformat(),
             "source": source
         }
 
         if mood_score:
             entry["mood_score"] = mood_score
+        return entry
 
-        self.memory.setdefault("reactions", [])
-        self.memory["reactions"].append(entry)
-        self._save_memory()
-        print(f"[📥 Reaction Logged] {emotion} from {source} at {timestamp}")
+    def log_reaction(self, emotion, emoji, source="unknown", face=None, mood_score=None):
+        entry = self.build_entry(emotion, emoji, source, face, mood_score)
+        self.store.apply("reaction_logged", entry=entry)
+        print(f"[📥 Reaction Logged] {emotion} from {source} at {entry['timestamp']}")
 
     def list_recent_reactions(self, count=5):
         reactions = self.memory.get("reactions", [])[-count:]
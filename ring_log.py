@@ -0,0 +1,127 @@
+import os
+import json
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+
+COMPACT_SLACK = 2  # rewrite the file once it holds this many times max_entries
+
+class RingLog:
+    """Append-only JSONL log with retention by entry count and/or age.
+
+    Appends are one line write. The file is trimmed back to `max_entries` only
+    when it reaches COMPACT_SLACK times that size, so trimming is amortized
+    O(1). The newest entries are kept in memory for readers. A legacy
+    `<name>.json` array log is converted to `<name>.jsonl` the first time it
+    is opened.
+    """
+
+    def __init__(self, path, max_entries=100, max_age=None, time_key="time"):
+        base = path[:-5] if path.endswith(".json") else path
+        self.legacy_path = base + ".json"
+        self.path = base + ".jsonl"
+        self.max_entries = max_entries
+        self.max_age = max_age  # seconds, or None for count-only retention
+        self.time_key = time_key
+        self.lock = threading.Lock()
+
+        self._migrate_legacy()
+        self._recent = deque(self._read_file(), maxlen=max_entries)
+        self._lines = self._count_lines()
+        self._handle = None
+
+    def _migrate_legacy(self):
+        if os.path.exists(self.path) or not os.path.exists(self.legacy_path):
+            return
+        try:
+            with open(self.legacy_path, "r") as f:
+                legacy = json.load(f)
+        except json.JSONDecodeError:
+            print(f"[⚠️] Could not migrate {self.legacy_path}: invalid JSON.")
+            return
+        if not isinstance(legacy, list):
+            return
+        self._rewrite(legacy[-self.max_entries:])
+        os.remove(self.legacy_path)
+        print(f"[📦] Migrated {self.legacy_path} → {self.path}")
+
+    def _read_file(self):
+        if not os.path.exists(self.path):
+            return []
+        entries = []
+        with open(self.path, "r") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue  # torn trailing line
+        return entries
+
+    def _count_lines(self):
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path, "rb") as f:
+            return sum(1 for _ in f)
+
+    def _rewrite(self, entries):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+        os.replace(tmp_path, self.path)
+
+    def _expired(self, entry, cutoff):
+        stamp = entry.get(self.time_key) if isinstance(entry, dict) else None
+        return bool(stamp) and stamp < cutoff
+
+    def _cutoff(self):
+        if self.max_age is None:
+            return None
+        return (datetime.now() - timedelta(seconds=self.max_age)).isoformat()
+
+    def append(self, entry):
+        with self.lock:
+            if self._handle is None:
+                self._handle = open(self.path, "a")
+            self._handle.write(json.dumps(entry) + "\n")
+            self._handle.flush()
+            self._recent.append(entry)
+            self._lines += 1
+            if self._lines >= self.max_entries * COMPACT_SLACK:
+                self._compact()
+
+    def _compact(self):
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        cutoff = self._cutoff()
+        kept = [e for e in self._recent if not (cutoff and self._expired(e, cutoff))]
+        self._rewrite(kept)
+        self._recent = deque(kept, maxlen=self.max_entries)
+        self._lines = len(kept)
+
+    # --- Reader API ---
+    def entries(self):
+        """Retained entries, oldest first."""
+        with self.lock:
+            cutoff = self._cutoff()
+            return [e for e in self._recent if not (cutoff and self._expired(e, cutoff))]
+
+    def tail(self, n=10):
+        return self.entries()[-n:] if n > 0 else []
+
+    def last(self):
+        entries = self.tail(1)
+        return entries[-1] if entries else None
+
+_logs = {}
+_logs_lock = threading.Lock()
+
+def get_log(path, max_entries=100, max_age=None, time_key="time"):
+    """Shared RingLog for `path`; retention is fixed by the first caller."""
+    with _logs_lock:
+        log = _logs.get(path)
+        if log is None:
+            log = RingLog(path, max_entries=max_entries, max_age=max_age, time_key=time_key)
+            _logs[path] = log
+        return log
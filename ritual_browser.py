@@ -1,6 +1,7 @@
 import json
 import os
 from datetime import datetime
+from loop_energy import energy_at
 
 LOOPMEMORY_PATH = "loopmemory.json"
 LOOPTRACE_PATH = "looptrace.json"
@@ -30,7 +31,7 @@ def display_loops(memory):
     print("\n[🔁 TOP LOOPED PHRASES]")
     top = sorted(loops.items(), key=lambda x: x[1]["count"], reverse=True)[:10]
     for phrase, data in top:
-        print(f"• \"{phrase}\" → Count: {data['count']}, Energy: {round(data['loop_energy'], 2)}, Ritualized: {data['ritualized']}")
+        print(f"• \"{phrase}\" → Count: {data['count']}, Energy: {round(energy_at(data), 2)}, Ritualized: {data['ritualized']}")
 
 def display_recent_reactions(memory):
     reactions = memory.get("reactions", [])[-5:]
@@ -1,6 +1,7 @@
 import json
 import os
 from datetime import datetime
+from memory_store import get_store
 
 MEMORY_PATH = "loopmemory.json"
 PRESETS_DIR = "presets"
@@ -19,30 +20,19 @@ class RitualLoader:
         with open(preset_path, "r") as f:
             preset = json.load(f)
 
-        if not os.path.exists(MEMORY_PATH):
-            print("[⚠️] loopmemory.json not found. Creating new memory.")
-            memory = {}
-        else:
-            with open(MEMORY_PATH, "r") as f:
-                memory = json.load(f)
-
         if not merge:
             print(f"[🌀] Loading {profile_name} and replacing rituals.")
-            memory["rituals"] = preset.get("rituals", [])
-            memory.setdefault("system_state", {})["emotion_bias"] = preset.get("emotion_bias", [])
         else:
             print(f"[➕] Merging {profile_name} into current memory.")
-            existing_names = {r["name"] for r in memory.get("rituals", [])}
-            for ritual in preset.get("rituals", []):
-                if ritual["name"] not in existing_names:
-                    memory["rituals"].append(ritual)
-            memory.setdefault("system_state", {})["emotion_bias"] = preset.get("emotion_bias", [])
-
-        memory["system_state"]["last_loaded_identity"] = profile_name
-        memory["system_state"]["identity_loaded_at"] = datetime.now().isoformat()
 
-        with open(MEMORY_PATH, "w") as f:
-            json.dump(memory, f, indent=2)
+        get_store(MEMORY_PATH).apply(
+            "rituals_loaded",
+            profile=profile_name,
+            rituals=preset.get("rituals", []),
+            emotion_bias=preset.get("emotion_bias", []),
+            merge=merge,
+            time=datetime.now().isoformat()
+        )
 
         print(f"[✅] Profile '{profile_name}' loaded.")
 
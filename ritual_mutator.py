@@ -3,6 +3,7 @@ import os
 from datetime import datetime
 from viria_mutator import ViriaMutator
 from vulnerability_guard import VulnerabilityGuard
+from doc_cache import load_json
 
 LOOPMEMORY_PATH = "loopmemory.json"
 RITUAL_MUTATION_RULES_PATH = "ritual_mutation_map.json"
@@ -11,16 +12,13 @@ class RitualMutator:
     def __init__(self):
         self.mutator = ViriaMutator()
         self.guard = VulnerabilityGuard()
-        self.memory = self._load_json(LOOPMEMORY_PATH)
         self.rules = self._load_json(RITUAL_MUTATION_RULES_PATH)
 
     def _load_json(self, path):
-        if os.path.exists(path):
-            with open(path, "r") as f:
-                return json.load(f)
-        return {}
+        return load_json(path, default={})
 
     def check_and_mutate(self):
+        self.memory = self._load_json(LOOPMEMORY_PATH)
         triggered = [r for r in self.memory.get("rituals", []) if r.get("last_triggered")]
         for ritual in triggered:
             name = ritual["name"]
@@ -1,6 +1,7 @@
 import json
 import os
 from datetime import datetime
+from storage_backend import get_backend
 
 MEMORY_PATH = "loopmemory.json"
 PREDICTION_LOG = "ritual_predictions.json"
@@ -12,28 +13,17 @@ RECENCY_WEIGHT = 1.0
 
 class RitualPredictor:
     def __init__(self):
-        self.memory = self._load_memory()
+        self.backend = get_backend()
         self.predictions = []
 
-    def _load_memory(self):
-        if not os.path.exists(MEMORY_PATH):
-            print("[⚠️] loopmemory.json not found.")
-            return {}
-        with open(MEMORY_PATH, "r") as f:
-            return json.load(f)
-
     def predict_ritual_candidates(self):
-        loops = self.memory.get("loops", {})
         candidates = []
 
-        for phrase, data in loops.items():
+        # Only loops that have not been promoted yet
+        for phrase, data in self.backend.loops_where(ritualized=False):
             count = data.get("count", 0)
             energy = data.get("loop_energy", 0.0)
             last_used = data.get("last_used", "unknown")
-            ritualized = data.get("ritualized", False)
-
-            if ritualized:
-                continue  # already promoted
 
             # Scoring system: loop energy × freq weight + recent use bias
             score = energy * FREQUENCY_WEIGHT
@@ -42,4 +32,41 @@ class RitualPredictor:
             try:
                 time_diff = datetime.now() - datetime.fromisoformat(last_used)
                 if time_diff.total_seconds() < 3600:
-                    score
+                    score += RECENCY_WEIGHT
+            except (TypeError, ValueError):
+                pass
+
+            if score >= PREDICT_THRESHOLD:
+                candidates.append({
+                    "phrase": phrase,
+                    "score": round(score, 2),
+                    "count": count,
+                    "energy": round(energy, 2),
+                    "last_used": last_used
+                })
+
+        self.predictions = sorted(candidates, key=lambda x: x["score"], reverse=True)
+        self._save_predictions()
+        self.print_predictions()
+        return self.predictions
+
+    def _save_predictions(self):
+        with open(PREDICTION_LOG, "w") as f:
+            json.dump({
+                "timestamp": datetime.now().isoformat(),
+                "predictions": self.predictions
+            }, f, indent=2)
+
+    def print_predictions(self):
+        if not self.predictions:
+            print("\n[🔮] No ritual candidates predicted.")
+            return
+
+        print("\n[🔮 Predicted Ritual Candidates]")
+        for p in self.predictions:
+            print(f"• '{p['phrase']}' → Score: {p['score']} (Count: {p['count']}, Energy: {p['energy']})")
+
+# --- Example usage ---
+if __name__ == "__main__":
+    predictor = RitualPredictor()
+    predictor.predict_ritual_candidates()
@@ -0,0 +1,48 @@
+import clock
+from memory_store import get_store
+from trace_store import get_trace_store
+from mood_stacker import MAX_MOOD_VALUE, watch_mood
+from reaction_logger import ReactionLogger
+
+MEMORY_PATH = "loopmemory.json"
+
+def respond_to_matches(phrase, matches, reactor, batch=None, store=None, trace=None):
+    """React to the RitualMatch records from one scan_and_trigger call.
+
+    Reactions, mood stacking and reaction logging become store ops appended
+    to `batch` (which may already hold the scan's ritual_triggered ops) and
+    are committed with a single apply_many(); the trace entries for every
+    match go out in one append_many().
+    """
+    store = store or get_store(MEMORY_PATH)
+    trace = trace or get_trace_store()
+    watch_mood(store)
+    ops = [] if batch is None else batch
+    trace_entries = []
+
+    for match in matches:
+        name = match.ritual.name
+        reaction = reactor.react(match.emotion, source=name) or {}
+        now = clock.now().isoformat()
+        ops.append(("mood_stacked", {"emotion": match.emotion, "weight": 1.0, "cap": MAX_MOOD_VALUE}))
+        ops.append(("reaction_logged", {"entry": ReactionLogger.build_entry(
+            match.emotion, reaction.get("emoji", ""), source=name, face=reaction.get("face"))}))
+        trace_entries.append(("ritual_triggers", {
+            "ritual": name,
+            "trigger_phrase": phrase,
+            "span": [match.start, match.end],
+            "time": now
+        }))
+        trace_entries.append(("reactions", {
+            "emotion": match.emotion,
+            "emoji": reaction.get("emoji"),
+            "triggered_by": name,
+            "time": now
+        }))
+
+    store.apply_many(ops)
+    if trace_entries:
+        trace.append_many(trace_entries)
+    if matches:
+        print(f"[📥] {len(matches)} ritual reaction(s) committed for “{phrase}”")
+    return ops
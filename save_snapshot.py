@@ -1,6 +1,6 @@
-import shutil
 import os
 from datetime import datetime
+from loopmemory_guard import LoopMemoryGuard
 
 MEMORY_PATH = "loopmemory.json"
 SNAPSHOT_PATH = "loopmemory_snapshot.json"
@@ -11,7 +11,10 @@ def save_snapshot():
         return
 
     try:
-        shutil.copyfile(MEMORY_PATH, SNAPSHOT_PATH)
+        # Go through the guard so the delta log stays a continuous chain.
+        guard = LoopMemoryGuard()
+        guard.diff_memory()
+        guard.save_snapshot()
         print(f"[📸] Snapshot saved to {SNAPSHOT_PATH} at {datetime.now().isoformat()}")
     except Exception as e:
         print(f"[⚠️] Failed to save snapshot: {e}")
@@ -0,0 +1,206 @@
+import os
+import math
+import time
+import heapq
+import random
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from ring_log import get_log
+from task_metrics import TaskStats, process_snapshot
+
+SCHEDULER_WORKERS = int(os.getenv("VIRIA_SCHEDULER_WORKERS", "3"))
+DEFAULT_JITTER = 0.1      # fraction of the interval used to spread task phases
+MAX_BACKOFF = 3600.0      # seconds; cap for a failing task's retry delay
+METRICS_LOG_PATH = "task_metrics.json"
+METRICS_INTERVAL = float(os.getenv("VIRIA_METRICS_INTERVAL", "300"))  # seconds between metrics dumps
+
+# One heap-driven thread runs every periodic task in the process. Each task
+# sits on a fixed grid (anchor + k * interval, anchor offset by a random
+# phase so tasks with the same interval don't all wake together), so run
+# time never accumulates as drift. Due tasks execute on a small worker pool;
+# a task still running when its next tick comes is skipped rather than run
+# twice, and a failing task backs off exponentially instead of spinning.
+
+class PeriodicTask:
+    __slots__ = ("name", "func", "interval", "anchor", "max_concurrent", "max_backoff",
+                 "running", "failures", "backoff_until", "stats")
+
+    def __init__(self, name, func, interval, anchor, max_concurrent=1, max_backoff=MAX_BACKOFF):
+        self.name = name
+        self.func = func
+        self.interval = interval      # None for a one-shot task
+        self.anchor = anchor
+        self.max_concurrent = max_concurrent
+        self.max_backoff = max_backoff
+        self.running = 0
+        self.failures = 0             # consecutive
+        self.backoff_until = 0.0
+        self.stats = TaskStats(interval)
+
+    def next_tick(self, now):
+        """First grid point strictly after `now` (and after any backoff)."""
+        earliest = max(now, self.backoff_until)
+        steps = math.floor((earliest - self.anchor) / self.interval) + 1
+        return self.anchor + max(steps, 1) * self.interval
+
+class Scheduler:
+    def __init__(self, workers=SCHEDULER_WORKERS):
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="task")
+        self.tasks = {}
+        self._heap = []   # (due monotonic time, order, task)
+        self._order = 0
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+
+    # --- Registration ---
+    def every(self, name, interval, func, jitter=DEFAULT_JITTER, max_concurrent=1,
+              max_backoff=MAX_BACKOFF, run_now=False):
+        """Run func() every `interval` seconds at a fixed rate."""
+        now = time.monotonic()
+        phase = random.uniform(0, interval * jitter) if jitter else 0.0
+        anchor = now + phase - (interval if run_now else 0.0)
+        task = PeriodicTask(name, func, interval, anchor, max_concurrent, max_backoff)
+        with self._cond:
+            self.tasks[name] = task
+            self._push(task, now + phase if run_now else task.next_tick(now))
+        return task
+
+    def once(self, name, delay, func):
+        task = PeriodicTask(name, func, None, time.monotonic())
+        with self._cond:
+            self.tasks[name] = task
+            self._push(task, task.anchor + delay)
+        return task
+
+    def _push(self, task, due):
+        self._order += 1
+        heapq.heappush(self._heap, (due, self._order, task))
+        self._cond.notify()
+
+    # --- Dispatch ---
+    def _dispatch(self, task, now):
+        # Called with _cond held
+        if task.interval is not None:
+            self._push(task, task.next_tick(now))
+        if now < task.backoff_until:
+            return
+        if task.running >= task.max_concurrent:
+            task.stats.skipped += 1
+            return
+        task.running += 1
+        try:
+            self.pool.submit(self._run_task, task)
+        except RuntimeError:
+            task.running -= 1  # pool shut down
+
+    def _run_task(self, task):
+        error = None
+        token = task.stats.start()
+        try:
+            task.func()
+        except Exception as e:
+            error = e
+        with self._cond:
+            task.running -= 1
+            task.stats.finish(token, error)
+            if error is None:
+                task.failures = 0
+                task.backoff_until = 0.0
+                return
+            task.failures += 1
+            if task.interval is None:
+                # One-shot tasks are never re-armed: the failure is final
+                delay = None
+            else:
+                delay = min(task.interval * 2 ** task.failures, task.max_backoff)
+                task.backoff_until = time.monotonic() + delay
+        if delay is None:
+            print(f"[⚠️] One-shot task {task.name} failed, not retrying: {error}")
+        else:
+            print(f"[⚠️] Task {task.name} failed ({task.failures}x in a row), retrying in {delay:.1f}s: {error}")
+
+    def _loop(self):
+        with self._cond:
+            while self._running:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                now = time.monotonic()
+                due = self._heap[0][0]
+                if due > now:
+                    self._cond.wait(timeout=due - now)
+                    continue
+                _, _, task = heapq.heappop(self._heap)
+                self._dispatch(task, now)
+
+    # --- Lifecycle ---
+    def start(self):
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._running = True
+            if METRICS_INTERVAL > 0 and "metrics_dump" not in self.tasks:
+                self.every("metrics_dump", METRICS_INTERVAL, self.dump_metrics, jitter=0)
+            self._thread = threading.Thread(target=self._loop, name="scheduler", daemon=True)
+            self._thread.start()
+        print(f"[⏱️] Scheduler running {len(self.tasks)} tasks on {self.pool._max_workers} workers")
+
+    def stop(self, wait=False):
+        with self._cond:
+            was_running = self._running
+            self._running = False
+            self._cond.notify()
+        self.pool.shutdown(wait=wait, cancel_futures=True)
+        if was_running and METRICS_INTERVAL > 0:
+            self.dump_metrics()
+
+    # --- Metrics ---
+    def snapshot(self):
+        """Per-task runtime stats plus live scheduling state."""
+        now = time.monotonic()
+        with self._cond:
+            return {
+                name: dict(task.stats.snapshot(),
+                           running=task.running,
+                           consecutive_failures=task.failures,
+                           backoff_s=round(max(0.0, task.backoff_until - now), 1))
+                for name, task in self.tasks.items()
+            }
+
+    def dump_metrics(self):
+        get_log(METRICS_LOG_PATH, max_entries=288).append({
+            "time": datetime.now().isoformat(),
+            "process": process_snapshot(),
+            "tasks": self.snapshot()
+        })
+
+    def print_metrics(self):
+        print("\n[📊 Task Metrics]")
+        for name, stats in sorted(self.snapshot().items(), key=lambda kv: -kv[1]["cpu"]["mean_ms"] * kv[1]["runs"]):
+            print(f"• {name}: runs {stats['runs']} | fail {stats['failures']} | overruns {stats['overruns']} "
+                  f"| wall p50 {stats['wall']['p50_ms']}ms max {stats['wall']['max_ms']}ms "
+                  f"| cpu {round(stats['cpu']['mean_ms'] * stats['runs'])}ms "
+                  f"| io r {stats['bytes_read']}B w {stats['bytes_written']}B")
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler():
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = Scheduler()
+        return _scheduler
+
+# --- Example usage ---
+if __name__ == "__main__":
+    scheduler = Scheduler()
+    scheduler.every("tick", 0.5, lambda: print(f"tick {time.monotonic():.2f}"), run_now=True)
+    scheduler.every("slow", 0.2, lambda: time.sleep(0.5))
+    scheduler.every("broken", 0.1, lambda: 1 / 0)
+    scheduler.start()
+    time.sleep(3)
+    scheduler.stop()
+    scheduler.print_metrics()
@@ -0,0 +1,487 @@
+import os
+import json
+import heapq
+import queue
+import atexit
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+import loop_energy
+from memory_store import get_store
+from trace_store import get_trace_store
+
+STORAGE_BACKEND = os.getenv("VIRIA_STORAGE", "json")  # "json" or "sqlite"
+SQLITE_PATH = os.getenv("VIRIA_SQLITE_PATH", "loopmemory.db")
+MIRROR_BATCH_MAX = 500  # queued mirror writes committed per SQLite transaction
+
+class StorageBackend(ABC):
+    """Query interface for loops, rituals, reactions and traces.
+
+    Loops are returned as (phrase, data) pairs shaped like loopmemory.json
+    entries, so callers work the same against either backend. Their
+    loop_energy is the decayed value as of the query.
+    """
+
+    @abstractmethod
+    def top_loops(self, n=10, by="count"): ...
+
+    @abstractmethod
+    def loops_where(self, min_energy=None, min_count=None, ritualized=None): ...
+
+    @abstractmethod
+    def loops_used_since(self, since): ...
+
+    @abstractmethod
+    def total_loop_energy(self): ...
+
+    @abstractmethod
+    def rituals(self): ...
+
+    @abstractmethod
+    def recent_reactions(self, n=20): ...
+
+    @abstractmethod
+    def emotion_counts(self, since=None): ...
+
+    @abstractmethod
+    def traces(self, entry_type, since=None, until=None): ...
+
+    def traces_dropped(self, entry_type, count):
+        """The oldest `count` entries of a trace type were archived out of looptrace/."""
+
+class JsonBackend(StorageBackend):
+    """Default backend: scans the shared MemoryStore document and TraceStore."""
+
+    def __init__(self, memory=None):
+        # `memory` lets out-of-process readers (dashboard) pass a parsed document
+        self.store = get_store() if memory is None else None
+        self.memory = self.store.data if memory is None else memory
+        self.lock = self.store.lock if self.store else threading.RLock()
+
+    def _loops(self):
+        with self.lock:
+            loops = list(self.memory.get("loops", {}).items())
+        energies = loop_energy.current_energies([d for _, d in loops])
+        return [(p, dict(d, loop_energy=e)) for (p, d), e in zip(loops, energies)]
+
+    def top_loops(self, n=10, by="count"):
+        return heapq.nlargest(n, self._loops(), key=lambda x: x[1].get(by) or 0)
+
+    def loops_where(self, min_energy=None, min_count=None, ritualized=None):
+        matches = []
+        for phrase, data in self._loops():
+            if min_energy is not None and data.get("loop_energy", 0.0) < min_energy:
+                continue
+            if min_count is not None and data.get("count", 0) < min_count:
+                continue
+            if ritualized is not None and data.get("ritualized", False) != ritualized:
+                continue
+            matches.append((phrase, data))
+        return matches
+
+    def loops_used_since(self, since):
+        since = since.isoformat() if isinstance(since, datetime) else since
+        return [(p, d) for p, d in self._loops() if (d.get("last_used") or "") >= since]
+
+    def total_loop_energy(self):
+        with self.lock:
+            total = self.memory.get("system_state", {}).get(loop_energy.TOTAL_KEY)
+        if total is None:
+            return sum(d["loop_energy"] for _, d in self._loops())
+        return loop_energy.total_at(total)
+
+    def rituals(self):
+        with self.lock:
+            return list(self.memory.get("rituals", []))
+
+    def recent_reactions(self, n=20):
+        with self.lock:
+            return self.memory.get("reactions", [])[-n:]
+
+    def emotion_counts(self, since=None):
+        since = since.isoformat() if isinstance(since, datetime) else since
+        with self.lock:
+            reactions = list(self.memory.get("reactions", []))
+        counts = {}
+        for r in reactions:
+            if since and r.get("timestamp", "") < since:
+                continue
+            e = r.get("emotion", "unknown")
+            counts[e] = counts.get(e, 0) + 1
+        return counts
+
+    def traces(self, entry_type, since=None, until=None):
+        since = since.isoformat() if isinstance(since, datetime) else since
+        until = until.isoformat() if isinstance(until, datetime) else until
+        return [
+            e for e in get_trace_store().iter_entries(entry_type)
+            if (not since or e.get("time", "") >= since) and (not until or e.get("time", "") < until)
+        ]
+
+class SqliteBackend(StorageBackend):
+    """Optional SQLite mirror of loopmemory.json and the looptrace.
+
+    The JSON snapshot stays the source of truth: every MemoryStore mutation
+    and trace append is mirrored into indexed tables, and the tables are
+    rebuilt from the store when their recorded sequence number falls behind.
+
+    Mirroring never runs SQL under the store lock: the listeners capture
+    row values and queue them, and one writer thread commits whatever has
+    queued up as a single transaction. Queries may trail the store by that
+    backlog; flush() waits for it.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        CREATE TABLE IF NOT EXISTS loops (
+            phrase TEXT PRIMARY KEY, count INTEGER, last_used TEXT,
+            importance TEXT, loop_energy REAL, ritualized INTEGER, energy_ts REAL, energy_key REAL);
+        CREATE TABLE IF NOT EXISTS rituals (
+            name TEXT PRIMARY KEY, position INTEGER, data TEXT);
+        CREATE TABLE IF NOT EXISTS reactions (
+            id INTEGER PRIMARY KEY, emotion TEXT, source TEXT, timestamp TEXT, data TEXT);
+        CREATE TABLE IF NOT EXISTS traces (
+            id INTEGER PRIMARY KEY, entry_type TEXT, time TEXT, data TEXT);
+        CREATE INDEX IF NOT EXISTS idx_loops_count ON loops(count);
+        CREATE INDEX IF NOT EXISTS idx_loops_last_used ON loops(last_used);
+        CREATE INDEX IF NOT EXISTS idx_reactions_emotion ON reactions(emotion, timestamp);
+        CREATE INDEX IF NOT EXISTS idx_reactions_timestamp ON reactions(timestamp);
+        CREATE INDEX IF NOT EXISTS idx_traces_type_time ON traces(entry_type, time);
+    """
+
+    # energy_key (loop_energy.decay_key) ranks loops by decayed energy at any
+    # moment, so energy queries order and filter on an index and decay is
+    # only computed for the rows returned
+    LOOP_COLUMNS = "phrase, count, last_used, importance, loop_energy, ritualized, energy_ts, energy_key"
+    LOOP_ORDER = {"count": "count", "loop_energy": "energy_key", "last_used": "last_used"}
+
+    def __init__(self, path=SQLITE_PATH, readonly=False):
+        self.path = path
+        self.readonly = readonly
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        if readonly:
+            return
+
+        self._writer = sqlite3.connect(path, check_same_thread=False)
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        self._writer.execute("PRAGMA synchronous=NORMAL")
+        self._writer.executescript(self.SCHEMA)
+        columns = {row[1] for row in self._writer.execute("PRAGMA table_info(loops)")}
+        if "energy_ts" not in columns:
+            self._writer.execute("ALTER TABLE loops ADD COLUMN energy_ts REAL")
+        if "energy_key" not in columns:
+            self._writer.execute("ALTER TABLE loops ADD COLUMN energy_key REAL")
+        self._writer.execute("DROP INDEX IF EXISTS idx_loops_energy")
+        self._writer.execute("CREATE INDEX IF NOT EXISTS idx_loops_energy_key ON loops(energy_key)")
+        if self._meta("half_life") != str(loop_energy.ENERGY_HALF_LIFE):
+            # Keys depend on the half-life (and older mirrors have none): rebuild
+            self._writer.execute("DELETE FROM meta WHERE key = 'wal_seq'")
+            self._writer.execute("INSERT OR REPLACE INTO meta VALUES ('half_life', ?)",
+                                 (str(loop_energy.ENERGY_HALF_LIFE),))
+        self._writer.commit()
+        self._pending = queue.Queue()
+        self._stale = False     # a mirror write failed; memory tables need a resync
+        self._synced_seq = 0    # ops at or below this are already in the last resync
+
+        store = self.store = get_store()
+        trace = get_trace_store()
+        with store.lock:
+            if self._meta("wal_seq") != str(store.seq):
+                self.sync_memory(store.data, store.seq)
+            store.add_listener(self._on_mutation)
+        with trace.lock:
+            for entry_type in trace.index:
+                if self._trace_count(entry_type) != trace.count(entry_type):
+                    self.sync_traces(trace, entry_type)
+            trace.add_listener(self._on_trace)
+
+        threading.Thread(target=self._write_loop, name="sqlite-mirror", daemon=True).start()
+        atexit.register(self.flush)
+
+    # --- Connections ---
+    def _reader(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            uri = f"file:{self.path}?mode=ro" if self.readonly else f"file:{self.path}"
+            conn = sqlite3.connect(uri, uri=True)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def _meta(self, key):
+        row = self._writer.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _trace_count(self, entry_type):
+        return self._writer.execute(
+            "SELECT COUNT(*) FROM traces WHERE entry_type = ?", (entry_type,)).fetchone()[0]
+
+    # --- Sync from the JSON side ---
+    def sync_memory(self, memory, seq):
+        with self._write_lock, self._writer:
+            db = self._writer
+            db.execute("DELETE FROM loops")
+            db.execute("DELETE FROM rituals")
+            db.execute("DELETE FROM reactions")
+            db.executemany(
+                f"INSERT INTO loops ({self.LOOP_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self._loop_row(p, d) for p, d in memory.get("loops", {}).items()))
+            self._save_energy_total(db, memory)
+            db.executemany(
+                "INSERT OR REPLACE INTO rituals VALUES (?, ?, ?)",
+                ((r["name"], i, json.dumps(r)) for i, r in enumerate(memory.get("rituals", []))))
+            db.executemany(
+                "INSERT INTO reactions (emotion, source, timestamp, data) VALUES (?, ?, ?, ?)",
+                (self._reaction_row(r) for r in memory.get("reactions", [])))
+            db.execute("INSERT OR REPLACE INTO meta VALUES ('wal_seq', ?)", (str(seq),))
+        print(f"[🗄️] SQLite backend synced from loopmemory ({self.path})")
+
+    def sync_traces(self, trace, entry_type):
+        with self._write_lock, self._writer:
+            self._writer.execute("DELETE FROM traces WHERE entry_type = ?", (entry_type,))
+            self._writer.executemany(
+                "INSERT INTO traces (entry_type, time, data) VALUES (?, ?, ?)",
+                ((entry_type, e.get("time"), json.dumps(e)) for e in trace.iter_entries(entry_type)))
+
+    def _loop_row(self, phrase, data):
+        energy = data.get("loop_energy", 0.0)
+        return (phrase, data.get("count", 0), data.get("last_used"), data.get("importance", "low"),
+                energy, int(bool(data.get("ritualized"))), data.get("energy_ts"),
+                loop_energy.decay_key(energy, loop_energy.entry_ts(data)))
+
+    def _loop_upsert(self, phrases):
+        # Rows are copied from the store entry (which already holds the decayed
+        # energy) now, under the store lock; the writer thread only executes them
+        loops = self.store.data.get("loops", {})
+        rows = [self._loop_row(p, loops[p]) for p in phrases if p in loops]
+        total = self._energy_total_row(self.store.data)
+
+        def write(db):
+            db.executemany(f"INSERT OR REPLACE INTO loops ({self.LOOP_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            if total is not None:
+                db.execute("INSERT OR REPLACE INTO meta VALUES ('energy_total', ?)", total)
+        return write
+
+    def _energy_total_row(self, memory):
+        total = memory.get("system_state", {}).get(loop_energy.TOTAL_KEY)
+        return None if total is None else (json.dumps(total),)
+
+    def _save_energy_total(self, db, memory):
+        total = self._energy_total_row(memory)
+        if total is not None:
+            db.execute("INSERT OR REPLACE INTO meta VALUES ('energy_total', ?)", total)
+
+    def _reaction_row(self, entry):
+        return (entry.get("emotion"), entry.get("source"), entry.get("timestamp"), json.dumps(entry))
+
+    def _on_mutation(self, seq, op, args):
+        # Runs under the store lock: capture the values, let the writer thread do the SQL
+        write = None
+        if op == "loop_increment":
+            write = self._loop_upsert((args["phrase"],))
+        elif op == "loops_merged":
+            write = self._loop_upsert(args["loops"])
+        elif op == "loop_ritualized":
+            phrase = args["phrase"]
+            write = lambda db: db.execute("UPDATE loops SET ritualized = 1 WHERE phrase = ?", (phrase,))
+        elif op == "ritual_added":
+            row = (args["ritual"]["name"], json.dumps(args["ritual"]))
+            write = lambda db: db.execute(
+                "INSERT OR REPLACE INTO rituals VALUES (?, (SELECT COUNT(*) FROM rituals), ?)", row)
+        elif op == "ritual_triggered":
+            name, time = args["name"], args["time"]
+            write = lambda db: self._mirror_trigger(db, name, time)
+        elif op == "rituals_loaded":
+            merge = args["merge"]
+            rows = [(r["name"], json.dumps(r)) for r in args["rituals"]]
+            write = lambda db: self._mirror_load(db, rows, merge)
+        elif op == "reaction_logged":
+            row = self._reaction_row(args["entry"])
+            write = lambda db: db.execute(
+                "INSERT INTO reactions (emotion, source, timestamp, data) VALUES (?, ?, ?, ?)", row)
+        elif op == "reactions_trimmed":
+            count = args["count"]
+            write = lambda db: db.execute(
+                "DELETE FROM reactions WHERE id IN (SELECT id FROM reactions ORDER BY id LIMIT ?)", (count,))
+        self._pending.put((seq, write))
+
+    def _mirror_trigger(self, db, name, time):
+        row = db.execute("SELECT data FROM rituals WHERE name = ?", (name,)).fetchone()
+        if row:
+            ritual = json.loads(row[0])
+            ritual["usage_count"] = ritual.get("usage_count", 0) + 1
+            ritual["last_triggered"] = time
+            db.execute("UPDATE rituals SET data = ? WHERE name = ?", (json.dumps(ritual), name))
+
+    def _mirror_load(self, db, rows, merge):
+        if not merge:
+            db.execute("DELETE FROM rituals")
+        db.executemany("INSERT OR IGNORE INTO rituals VALUES (?, (SELECT COUNT(*) FROM rituals), ?)", rows)
+
+    def _on_trace(self, entries):
+        rows = [(t, e.get("time"), json.dumps(e)) for t, e in entries]
+        self._pending.put((None, lambda db: db.executemany(
+            "INSERT INTO traces (entry_type, time, data) VALUES (?, ?, ?)", rows)))
+
+    def traces_dropped(self, entry_type, count):
+        self._pending.put((None, lambda db: db.execute(
+            "DELETE FROM traces WHERE id IN (SELECT id FROM traces WHERE entry_type = ? ORDER BY id LIMIT ?)",
+            (entry_type, count))))
+
+    # --- Mirror writer ---
+    def _write_loop(self):
+        while True:
+            batch = [self._pending.get()]
+            while len(batch) < MIRROR_BATCH_MAX:
+                try:
+                    batch.append(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write_batch(batch)
+            except sqlite3.Error as e:
+                print(f"[⚠️] SQLite mirror write failed ({len(batch)} ops): {e}")
+                self._mark_stale()
+            finally:
+                if self._stale:
+                    self._resync()
+                for _ in batch:
+                    self._pending.task_done()
+
+    def _write_batch(self, batch):
+        with self._write_lock, self._writer:
+            db = self._writer
+            seq = None
+            for item_seq, write in batch:
+                if item_seq is not None and item_seq <= self._synced_seq:
+                    continue  # already covered by the resync
+                if write is not None:
+                    write(db)
+                if item_seq is not None:
+                    seq = item_seq
+            if seq is not None and not self._stale:
+                db.execute("INSERT OR REPLACE INTO meta VALUES ('wal_seq', ?)", (str(seq),))
+
+    def _mark_stale(self):
+        # The failed batch's ops are gone: wal_seq must never move past them,
+        # so drop it and a restart resyncs even if the live resync fails too
+        self._stale = True
+        try:
+            with self._write_lock, self._writer:
+                self._writer.execute("DELETE FROM meta WHERE key = 'wal_seq'")
+        except sqlite3.Error as e:
+            print(f"[⚠️] Could not mark SQLite mirror stale: {e}")
+
+    def _resync(self):
+        # Frozen views are immutable, so the copy is consistent with `seq`
+        # and the SQL runs off the store lock
+        with self.store.lock:
+            memory = {section: self.store.frozen_view(section) for section in self.store.sections()}
+            seq = self.store.seq
+        try:
+            self.sync_memory(memory, seq)
+        except sqlite3.Error as e:
+            print(f"[⚠️] SQLite mirror resync failed, retrying after the next write: {e}")
+            return
+        self._synced_seq = seq
+        self._stale = False
+
+    def flush(self):
+        """Wait until every queued mirror write is committed."""
+        self._pending.join()
+
+    # --- Queries ---
+    def _loop_rows(self, sql, params=()):
+        rows = self._reader().execute(
+            "SELECT phrase, count, last_used, importance, loop_energy, energy_ts, ritualized FROM loops " + sql, params)
+        return [(r["phrase"], {
+            "count": r["count"],
+            "last_used": r["last_used"],
+            "importance": r["importance"],
+            "loop_energy": loop_energy.energy_at(
+                {"loop_energy": r["loop_energy"] or 0.0, "energy_ts": r["energy_ts"], "last_used": r["last_used"]}),
+            "ritualized": bool(r["ritualized"])
+        }) for r in rows]
+
+    def top_loops(self, n=10, by="count"):
+        column = self.LOOP_ORDER[by]
+        return self._loop_rows(f"ORDER BY {column} DESC LIMIT ?", (n,))
+
+    def loops_where(self, min_energy=None, min_count=None, ritualized=None):
+        clauses, params = [], []
+        if min_energy is not None and min_energy > 0:
+            clauses.append("energy_key >= ?")
+            params.append(loop_energy.key_floor(min_energy))
+        if min_count is not None:
+            clauses.append("count >= ?")
+            params.append(min_count)
+        if ritualized is not None:
+            clauses.append("ritualized = ?")
+            params.append(int(ritualized))
+        where = "WHERE " + " AND ".join(clauses) if clauses else ""
+        return self._loop_rows(where, params)
+
+    def loops_used_since(self, since):
+        since = since.isoformat() if isinstance(since, datetime) else since
+        return self._loop_rows("WHERE last_used >= ? ORDER BY last_used DESC", (since,))
+
+    def total_loop_energy(self):
+        row = self._reader().execute("SELECT value FROM meta WHERE key = 'energy_total'").fetchone()
+        if row:
+            return loop_energy.total_at(json.loads(row[0]))
+        return sum(data["loop_energy"] for _, data in self._loop_rows("WHERE energy_key IS NOT NULL"))
+
+    def rituals(self):
+        rows = self._reader().execute("SELECT data FROM rituals ORDER BY position")
+        return [json.loads(r["data"]) for r in rows]
+
+    def recent_reactions(self, n=20):
+        rows = self._reader().execute("SELECT data FROM reactions ORDER BY id DESC LIMIT ?", (n,))
+        return [json.loads(r["data"]) for r in rows][::-1]
+
+    def emotion_counts(self, since=None):
+        since = since.isoformat() if isinstance(since, datetime) else since
+        if since:
+            rows = self._reader().execute(
+                "SELECT emotion, COUNT(*) AS n FROM reactions WHERE timestamp >= ? GROUP BY emotion", (since,))
+        else:
+            rows = self._reader().execute("SELECT emotion, COUNT(*) AS n FROM reactions GROUP BY emotion")
+        return {(r["emotion"] or "unknown"): r["n"] for r in rows}
+
+    def traces(self, entry_type, since=None, until=None):
+        since = since.isoformat() if isinstance(since, datetime) else since
+        until = until.isoformat() if isinstance(until, datetime) else until
+        sql = "SELECT data FROM traces WHERE entry_type = ?"
+        params = [entry_type]
+        if since:
+            sql += " AND time >= ?"
+            params.append(since)
+        if until:
+            sql += " AND time < ?"
+            params.append(until)
+        rows = self._reader().execute(sql + " ORDER BY time", params)
+        return [json.loads(r["data"]) for r in rows]
+
+_backend = None
+_backend_lock = threading.Lock()
+
+def get_backend(memory=None):
+    """Shared backend for this process.
+
+    Passing `memory` (an already parsed loopmemory document) gives a reader
+    for tools running outside the main VIRIA process, which must not take
+    ownership of the memory store.
+    """
+    global _backend
+    if memory is not None:
+        if STORAGE_BACKEND == "sqlite" and os.path.exists(SQLITE_PATH):
+            return SqliteBackend(readonly=True)
+        return JsonBackend(memory=memory)
+
+    with _backend_lock:
+        if _backend is None:
+            _backend = SqliteBackend() if STORAGE_BACKEND == "sqlite" else JsonBackend()
+        return _backend
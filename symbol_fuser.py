@@ -2,6 +2,7 @@ import json
 import os
 from datetime import datetime
 from itertools import combinations
+from doc_cache import load_json
 
 MEMORY_PATH = "loopmemory.json"
 FUSION_LOG_PATH = "symbol_fusions.json"
@@ -12,11 +13,11 @@ class SymbolFuser:
         self.fusions = []
 
     def _load_memory(self):
-        if not os.path.exists(MEMORY_PATH):
+        memory = load_json(MEMORY_PATH)
+        if memory is None:
             print("[⚠️] loopmemory.json not found.")
             return {}
-        with open(MEMORY_PATH, "r") as f:
-            return json.load(f)
+        return memory
 
     def detect_fusion_candidates(self):
         rituals = self.memory.get("rituals", [])
@@ -72,6 +73,13 @@ class SymbolFuser:
         for fusion in self.fusions:
             print(f"• {fusion['fusion_name']} ← [{', '.join(fusion['components'])}] (Score: {fusion['score']})")
 
+def scan_fusions():
+    # Analytics job entry (process_supervisor): detect and save, return the count
+    fuser = SymbolFuser()
+    fuser.detect_fusion_candidates()
+    fuser.save_fusions()
+    return len(fuser.fusions)
+
 # --- Example usage ---
 if __name__ == "__main__":
     fuser = SymbolFuser()
@@ -0,0 +1,132 @@
+import os
+import time
+import threading
+import traceback
+from bisect import bisect_left
+from datetime import datetime
+
+# Runtime statistics for scheduled tasks: run counts, wall and CPU time
+# histograms, overruns against the task interval, the last exception and
+# bytes read/written. CPU time is the worker thread's own (time.thread_time)
+# and I/O comes from the thread's /proc counters, so tasks running side by
+# side on the pool don't blur into each other.
+BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000, 30000)  # upper bounds; one overflow bucket past the last
+THREAD_IO_PATH = "/proc/thread-self/io"
+
+class Histogram:
+    __slots__ = ("counts", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, ms):
+        self.counts[bisect_left(BUCKETS_MS, ms)] += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th sample (the max for the overflow bucket)."""
+        n = sum(self.counts)
+        if not n:
+            return 0.0
+        rank = q * n
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(float(BUCKETS_MS[i]), round(self.max, 2)) if i < len(BUCKETS_MS) else round(self.max, 2)
+        return round(self.max, 2)
+
+    def snapshot(self):
+        n = sum(self.counts)
+        labels = [f"<={b}" for b in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}"]
+        return {
+            "count": n,
+            "mean_ms": round(self.total / n, 2) if n else 0.0,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "max_ms": round(self.max, 2),
+            "buckets": {label: c for label, c in zip(labels, self.counts) if c}
+        }
+
+def thread_io(after_read=False):
+    """(bytes read, bytes written) so far by the calling thread, or None off Linux.
+
+    The counters exclude the read of THREAD_IO_PATH that reports them;
+    `after_read` adds it in, so a start mark taken that way cancels it out.
+    """
+    try:
+        with open(THREAD_IO_PATH, "r") as f:
+            text = f.read()
+    except OSError:
+        return None
+    fields = dict(line.split(": ") for line in text.splitlines() if ": " in line)
+    return int(fields["rchar"]) + (len(text) if after_read else 0), int(fields["wchar"])
+
+class TaskStats:
+    def __init__(self, interval=None):
+        self.interval = interval
+        self.runs = 0
+        self.failures = 0
+        self.overruns = 0        # runs that took longer than the interval
+        self.skipped = 0         # ticks dropped because the previous run was still going
+        self.wall = Histogram()
+        self.cpu = Histogram()
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.last_run = None
+        self.last_error = None
+
+    def start(self):
+        """Opaque token handed back to finish() from the same thread."""
+        return time.perf_counter(), time.thread_time(), thread_io(after_read=True)
+
+    def finish(self, token, error=None):
+        wall_start, cpu_start, io_start = token
+        wall_ms = (time.perf_counter() - wall_start) * 1000
+        cpu_ms = (time.thread_time() - cpu_start) * 1000
+        io_end = thread_io() if io_start is not None else None
+        self.runs += 1
+        self.wall.add(wall_ms)
+        self.cpu.add(cpu_ms)
+        if self.interval and wall_ms > self.interval * 1000:
+            self.overruns += 1
+        if io_end is not None:
+            self.bytes_read += max(0, io_end[0] - io_start[0])
+            self.bytes_written += max(0, io_end[1] - io_start[1])
+        self.last_run = datetime.now().isoformat()
+        if error is not None:
+            self.failures += 1
+            frames = traceback.extract_tb(error.__traceback__)
+            self.last_error = {
+                "time": self.last_run,
+                "error": repr(error),
+                "where": f"{frames[-1].filename}:{frames[-1].lineno} in {frames[-1].name}" if frames else None
+            }
+
+    def snapshot(self):
+        return {
+            "interval": self.interval,
+            "runs": self.runs,
+            "failures": self.failures,
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+            "wall": self.wall.snapshot(),
+            "cpu": self.cpu.snapshot(),
+            "cpu_share": round(self.cpu.total / self.wall.total, 3) if self.wall.total else 0.0,
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            "last_run": self.last_run,
+            "last_error": self.last_error
+        }
+
+def process_snapshot():
+    """Whole-process CPU seconds and thread count, for context next to the per-task numbers."""
+    times = os.times()
+    return {
+        "cpu_user_s": round(times.user, 2),
+        "cpu_system_s": round(times.system, 2),
+        "threads": threading.active_count()
+    }
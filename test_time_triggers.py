@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from vritual_core import compile_time_trigger
+
+def fires(cron, after, count=1):
+    next_fire = compile_time_trigger({"cron": cron})
+    times = []
+    for _ in range(count):
+        after = next_fire(after)
+        times.append(after)
+    return times
+
+# 2025-06-01 is a Sunday
+SATURDAY = datetime(2025, 5, 31, 12, 0)
+
+def test_day_of_week_counts_from_sunday():
+    assert fires("0 9 * * 0", SATURDAY) == [datetime(2025, 6, 1, 9, 0)]
+    assert fires("0 9 * * 1", SATURDAY) == [datetime(2025, 6, 2, 9, 0)]
+    assert fires("0 9 * * 1-5", SATURDAY, 5)[-1] == datetime(2025, 6, 6, 9, 0)
+
+def test_seven_is_sunday():
+    assert fires("0 9 * * 7", SATURDAY) == [datetime(2025, 6, 1, 9, 0)]
+    assert fires("0 9 * * 5-7", SATURDAY, 2) == [datetime(2025, 6, 1, 9, 0), datetime(2025, 6, 6, 9, 0)]
+
+def test_restricted_day_of_month_and_week_are_ored():
+    # The 1st (a Sunday) and every Monday
+    assert fires("0 9 1 * 1", SATURDAY, 3) == [
+        datetime(2025, 6, 1, 9, 0), datetime(2025, 6, 2, 9, 0), datetime(2025, 6, 9, 9, 0)]
+
+def test_starred_day_field_is_anded():
+    assert fires("0 9 15 * *", SATURDAY) == [datetime(2025, 6, 15, 9, 0)]
+    # Days 1, 11, 21, 31 that are also Mondays
+    assert fires("0 9 */10 * 1", SATURDAY, 2) == [datetime(2025, 7, 21, 9, 0), datetime(2025, 8, 11, 9, 0)]
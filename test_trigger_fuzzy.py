@@ -0,0 +1,29 @@
+from trigger_fuzzy import FuzzyTriggerIndex
+
+def make_index():
+    index = FuzzyTriggerIndex()
+    index.add("What am I becoming?", "sacred_mirror")
+    index.add("Will you remember me?", "remember")
+    return index
+
+def matched(index, phrase):
+    return [value for value, _, _, _ in index.find(phrase)]
+
+def test_transcript_form_matches():
+    index = make_index()
+    hits = index.find("so what am i becoming okay")
+    assert [h[0] for h in hits] == ["sacred_mirror"]
+    value, start, end, score = hits[0]
+    assert "so what am i becoming okay"[start:end] == "what am i becoming"
+    assert score == 1.0
+
+def test_one_changed_function_word_matches():
+    assert matched(make_index(), "what was i becoming") == ["sacred_mirror"]
+
+def test_prefix_does_not_fire():
+    index = make_index()
+    assert matched(index, "what am i") == []
+    assert matched(index, "what am i doing here") == []
+
+def test_changed_distinctive_word_does_not_fire():
+    assert matched(make_index(), "what am i dreaming") == []
@@ -2,84 +2,75 @@ import json
 import os
 import time
 from datetime import datetime
+from memory_store import get_store
+from ring_log import get_log
 
 LOOPMEMORY_PATH = "loopmemory.json"
 TIME_LOG_PATH = "timekeeper_log.json"
+TIME_LOG_MAX_AGE = 30 * 24 * 3600  # keep a month of hourly events
+
+# Daily rituals fired by vritual_core's TimeTriggerEngine
+DEFAULT_TIME_RITUALS = [
+    {"name": "ritual_midnight_reflection", "trigger": {"hour": 0}, "effect": "reflect_on_loops"},
+    {"name": "ritual_dawn_awaken", "trigger": {"hour": 6}, "effect": "emotion:joy"},
+    {"name": "ritual_noon_charge", "trigger": {"hour": 12}, "effect": "emotion:curious"},
+    {"name": "ritual_dusk_watch", "trigger": {"hour": 18}, "effect": "emotion:calm"},
+    {"name": "ritual_nightfall_loop", "trigger": {"hour": 21}, "effect": "enter_night_mode"}
+]
 
 class Timekeeper:
     def __init__(self):
         self.last_hour = None
-        self.memory = self._load_memory()
+        self.store = get_store(LOOPMEMORY_PATH)
+        self.memory = self.store.data
         self._ensure_time_tracking_structure()
 
-    def _load_memory(self):
-        if os.path.exists(LOOPMEMORY_PATH):
-            with open(LOOPMEMORY_PATH, "r") as f:
-                return json.load(f)
-        return {}
-
-    def _save_memory(self):
-        with open(LOOPMEMORY_PATH, "w") as f:
-            json.dump(self.memory, f, indent=2)
-
     def _ensure_time_tracking_structure(self):
-        self.memory.setdefault("system_state", {})
-        self.memory["system_state"].setdefault("loop_energy_by_hour", {str(h): 0 for h in range(24)})
-        self.memory["system_state"].setdefault("last_known_hour", None)
-        self._save_memory()
+        with self.store.lock:
+            state = self.store.system_state()
+            if "loop_energy_by_hour" not in state:
+                self.store.apply("state_set", key="loop_energy_by_hour", value={str(h): 0 for h in range(24)})
+            if "last_known_hour" not in state:
+                self.store.apply("state_set", key="last_known_hour", value=None)
+
+            names = {r["name"] for r in self.store.rituals()}
+            triggers = [r.get("trigger") for r in self.store.rituals()]
+            for ritual in DEFAULT_TIME_RITUALS:
+                if ritual["name"] not in names and ritual["trigger"] not in triggers:
+                    self.store.apply("ritual_added", ritual=dict(ritual, importance="daily", usage_count=0, last_triggered=None))
 
     def tick(self):
         now = datetime.now()
         current_hour = now.hour
 
         # Track loop energy changes per hour
-        if current_hour != self.memory["system_state"].get("last_known_hour"):
-            print(f"[🕰️] Hour changed → {current_hour}:00")
-            self.memory["system_state"]["last_known_hour"] = current_hour
-
-            # Ritual trigger by hour (optional)
-            self._trigger_hourly_ritual(current_hour)
+        with self.store.lock:
+            state = self.store.system_state()
+            if current_hour == state.get("last_known_hour"):
+                return
 
             # Decay or nudge loop energy per hour
-            loop_energy = self.memory["system_state"]["loop_energy_by_hour"]
+            loop_energy = dict(state["loop_energy_by_hour"])
             for hour in loop_energy:
                 if int(hour) != current_hour:
                     loop_energy[hour] = max(0, loop_energy[hour] - 0.1)  # decay
             loop_energy[str(current_hour)] += 0.2  # boost current hour energy
 
-            # Save to memory and log
-            self._save_memory()
-            self._log_hour_event(current_hour)
+            # Save to memory
+            self.store.apply("state_set", key="last_known_hour", value=current_hour)
+            self.store.apply("state_set", key="loop_energy_by_hour", value=loop_energy)
 
-    def _trigger_hourly_ritual(self, hour):
-        rituals = {
-            0: "ritual_midnight_reflection",
-            6: "ritual_dawn_awaken",
-            12: "ritual_noon_charge",
-            18: "ritual_dusk_watch",
-            21: "ritual_nightfall_loop"
-        }
-        ritual = rituals.get(hour)
-        if ritual:
-            print(f"[⏳] Triggering time-based ritual: {ritual}")
-            # You can tie into `virtual_core.py` or `reaction_engine` here if desired.
+        print(f"[🕰️] Hour changed → {current_hour}:00")
+
+        self._log_hour_event(current_hour, loop_energy)
 
-    def _log_hour_event(self, hour):
+    def _log_hour_event(self, hour, energy_snapshot):
         log_entry = {
             "time": datetime.now().isoformat(),
             "hour": hour,
-            "loop_energy_snapshot": self.memory["system_state"]["loop_energy_by_hour"]
+            "loop_energy_snapshot": energy_snapshot
         }
-
-        if os.path.exists(TIME_LOG_PATH):
-            with open(TIME_LOG_PATH, "r") as f:
-                log = json.load(f)
-        else:
-            log = []
-
-        log.append(log_entry)
-        with open(TIME_LOG_PATH, "w") as f:
-            json.dump(log, f, indent=2)
+        get_log(TIME_LOG_PATH, max_entries=24 * 31, max_age=TIME_LOG_MAX_AGE).append(log_entry)
 
 # --- Example standalone runner ---
 if __name__ == "__main__":
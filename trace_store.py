@@ -0,0 +1,254 @@
+import json
+import os
+import shutil
+import threading
+import io_meter
+
+TRACE_PATH = "looptrace.json"   # legacy single-document trace
+TRACE_DIR = "looptrace"
+INDEX_FILE = "index.json"
+STAGING_SUFFIX = ".migrating"   # legacy migration is built here, then renamed into place
+SEGMENT_MAX_ENTRIES = 5000      # entries per JSONL segment before rotating
+TAIL_BLOCK_SIZE = 8192
+
+class TraceStore:
+    """Append-only looptrace kept as rotated JSONL segments per entry type.
+
+    Layout: looptrace/<entry_type>/<segment>.jsonl plus looptrace/index.json,
+    which records each type's segments and entry totals so the newest entries
+    can be read from the end of the live segment without parsing history.
+    """
+
+    def __init__(self, directory=TRACE_DIR, legacy_path=TRACE_PATH):
+        self.directory = directory
+        self.index_path = os.path.join(directory, INDEX_FILE)
+        self.lock = threading.RLock()
+        self._handles = {}
+        self._segment_counts = {}
+        self._listeners = []
+
+        if not os.path.exists(directory):
+            self._migrate_legacy(legacy_path)
+            os.makedirs(directory, exist_ok=True)
+        self.index = self._load_index()
+
+    # --- Index ---
+    def _load_index(self):
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r") as f:
+                index = json.load(f)
+        else:
+            index = {}
+
+        # Pick up types or segments the index has not seen yet (e.g. after a crash)
+        for entry_type in os.listdir(self.directory):
+            type_dir = os.path.join(self.directory, entry_type)
+            if not os.path.isdir(type_dir):
+                continue
+            segments = sorted(f for f in os.listdir(type_dir) if f.endswith(".jsonl"))
+            info = index.setdefault(entry_type, {"segments": [], "closed_total": 0})
+            if segments != info["segments"]:
+                info["segments"] = segments
+                info["closed_total"] = sum(self._count_lines(entry_type, s) for s in segments[:-1])
+        return index
+
+    def _save_index(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    def _segment_path(self, entry_type, segment):
+        return os.path.join(self.directory, entry_type, segment)
+
+    def _count_lines(self, entry_type, segment):
+        with open(self._segment_path(entry_type, segment), "rb") as f:
+            return sum(1 for _ in f)
+
+    def _migrate_legacy(self, legacy_path):
+        # Built in a staging directory and renamed into place only when complete,
+        # so a crash mid-migration leaves no partial trace and reruns from scratch
+        if not legacy_path or not os.path.exists(legacy_path):
+            return
+        staging = self.directory + STAGING_SUFFIX
+        shutil.rmtree(staging, ignore_errors=True)
+        with open(legacy_path, "r") as f:
+            legacy = json.load(f)
+        staged = TraceStore(staging, legacy_path=None)
+        for entry_type, entries in legacy.items():
+            if isinstance(entries, list):
+                staged.append_many((entry_type, e) for e in entries)
+        staged.close()
+        os.replace(staging, self.directory)
+        print(f"[📦] Migrated {legacy_path} into segmented trace at {self.directory}/")
+
+    # --- Writes ---
+    def _writer(self, entry_type):
+        info = self.index.get(entry_type)
+        if info is None:
+            os.makedirs(os.path.join(self.directory, entry_type), exist_ok=True)
+            info = self.index[entry_type] = {"segments": [], "closed_total": 0}
+
+        if entry_type not in self._handles:
+            if not info["segments"]:
+                info["segments"].append("000001.jsonl")
+                self._save_index()
+            segment = info["segments"][-1]
+            self._segment_counts[entry_type] = (
+                self._count_lines(entry_type, segment)
+                if os.path.exists(self._segment_path(entry_type, segment)) else 0
+            )
+            self._handles[entry_type] = open(self._segment_path(entry_type, segment), "a")
+
+        if self._segment_counts[entry_type] >= SEGMENT_MAX_ENTRIES:
+            self._rotate(entry_type, info)
+        return self._handles[entry_type]
+
+    def _rotate(self, entry_type, info):
+        self._handles.pop(entry_type).close()
+        info["closed_total"] += self._segment_counts[entry_type]
+        segment = f"{int(info['segments'][-1].split('.')[0]) + 1:06d}.jsonl"
+        info["segments"].append(segment)
+        self._save_index()
+        self._segment_counts[entry_type] = 0
+        self._handles[entry_type] = open(self._segment_path(entry_type, segment), "a")
+
+    def append(self, entry_type, data):
+        self.append_many([(entry_type, data)])
+
+    def append_many(self, entries):
+        entries = list(entries)
+        with self.lock:
+            touched = set()
+            written = 0
+            for entry_type, data in entries:
+                handle = self._writer(entry_type)
+                line = json.dumps(data) + "\n"
+                handle.write(line)
+                written += len(line)
+                self._segment_counts[entry_type] += 1
+                touched.add(entry_type)
+            for entry_type in touched:
+                # Flush the current handle; segments rotated mid-batch were closed (and flushed) already
+                self._handles[entry_type].flush()
+            io_meter.add("trace", written)
+            for listener in self._listeners:
+                try:
+                    listener(entries)
+                except Exception as e:
+                    print(f"[⚠️] Trace listener failed: {e}")
+
+    def add_listener(self, listener):
+        # listener([(entry_type, data), ...]) runs after each appended batch
+        with self.lock:
+            self._listeners.append(listener)
+
+    def closed_segments(self, entry_type):
+        """Segments no longer written to, oldest first."""
+        with self.lock:
+            return list(self.index.get(entry_type, {}).get("segments", []))[:-1]
+
+    def read_segment(self, entry_type, segment):
+        path = self._segment_path(entry_type, segment)
+        with open(path, "r") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def drop_segment(self, entry_type, segment):
+        """Remove a closed segment (after it has been archived elsewhere)."""
+        with self.lock:
+            info = self.index[entry_type]
+            if segment == info["segments"][-1]:
+                raise ValueError(f"cannot drop the live segment {entry_type}/{segment}")
+            info["closed_total"] -= self._count_lines(entry_type, segment)
+            info["segments"].remove(segment)
+            self._save_index()
+            os.remove(self._segment_path(entry_type, segment))
+
+    # --- Reads ---
+    def count(self, entry_type):
+        with self.lock:
+            info = self.index.get(entry_type)
+            if not info or not info["segments"]:
+                return 0
+            if entry_type not in self._segment_counts:
+                self._segment_counts[entry_type] = self._count_lines(entry_type, info["segments"][-1])
+            return info["closed_total"] + self._segment_counts[entry_type]
+
+    def tail(self, entry_type, n=10):
+        """Newest `n` entries of a type, oldest first, read from segment ends."""
+        with self.lock:
+            segments = list(self.index.get(entry_type, {}).get("segments", []))
+
+        entries = []
+        for segment in reversed(segments):
+            path = self._segment_path(entry_type, segment)
+            if not os.path.exists(path):
+                continue
+            entries = self._read_tail(path, n - len(entries)) + entries
+            if len(entries) >= n:
+                break
+        return entries
+
+    def latest(self, entry_type):
+        entries = self.tail(entry_type, 1)
+        return entries[-1] if entries else None
+
+    def _read_tail(self, path, n):
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            buffer = b""
+            while position > 0 and buffer.count(b"\n") <= n:
+                step = min(TAIL_BLOCK_SIZE, position)
+                position -= step
+                f.seek(position)
+                buffer = f.read(step) + buffer
+
+        lines = buffer.split(b"\n")
+        if position > 0:
+            lines = lines[1:]  # first line may be cut mid-record
+
+        entries = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue  # a concurrent half-written line
+        return entries[-n:] if n > 0 else []
+
+    def iter_entries(self, entry_type):
+        with self.lock:
+            segments = list(self.index.get(entry_type, {}).get("segments", []))
+        for segment in segments:
+            path = self._segment_path(entry_type, segment)
+            if not os.path.exists(path):
+                continue
+            with open(path, "r") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+    def export(self):
+        """Rebuild the legacy looptrace.json document (full scan)."""
+        with self.lock:
+            types = list(self.index)
+        return {t: list(self.iter_entries(t)) for t in types}
+
+    def close(self):
+        with self.lock:
+            for handle in self._handles.values():
+                handle.close()
+            self._handles.clear()
+            self._save_index()
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_trace_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = TraceStore()
+        return _store
@@ -0,0 +1,117 @@
+import threading
+from array import array
+from collections import deque
+
+REBUILD_PENDING = 64  # patterns matched by plain substring search before the automaton is rebuilt
+EDGE_SHIFT = 21       # edge key = node << EDGE_SHIFT | ord(ch); every code point fits in 21 bits
+
+class TriggerAutomaton:
+    """Aho-Corasick automaton over string triggers.
+
+    find(text) walks the text once and reports every pattern it contains, so
+    matching cost depends on the phrase length and the number of hits, not on
+    how many patterns are indexed. Patterns added after the last build are
+    kept in a small pending list and checked directly; the automaton is
+    rebuilt lazily, on the next find(), once that list grows past
+    REBUILD_PENDING.
+    """
+
+    def __init__(self):
+        self._patterns = []   # pattern id → (pattern, value)
+        self._pending = []    # pattern ids not yet compiled into the automaton
+        self._goto = {}              # edge key → child node, one flat map for the whole trie
+        self._fail = array("l", [0])
+        self._output = {}            # node → pattern ids ending exactly there (only nodes that have some)
+        self._out_link = array("l", [0])  # nearest node on the failure chain with outputs (0 = none)
+        self._always = []     # empty patterns, which match every text
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._patterns)
+
+    def add(self, pattern, value):
+        with self._lock:
+            pattern_id = len(self._patterns)
+            self._patterns.append((pattern, value))
+            if pattern:
+                self._pending.append(pattern_id)
+            else:
+                self._always.append(pattern_id)
+
+    def rebuild(self):
+        with self._lock:
+            patterns = list(self._patterns)
+            compiled = len(patterns)
+
+        goto, output = [{}], {}
+        for pattern_id, (pattern, _) in enumerate(patterns):
+            if not pattern:
+                continue
+            node = 0
+            for ch in pattern:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                node = nxt
+            output.setdefault(node, []).append(pattern_id)
+
+        fail = array("l", [0]) * len(goto)
+        out_link = array("l", [0]) * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                queue.append(child)
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                target = goto[f].get(ch, 0)
+                fail[child] = target if target != child else 0
+                out_link[child] = fail[child] if fail[child] in output else out_link[fail[child]]
+
+        # One flat edge map, int arrays and a sparse output map: a dict per
+        # node, a list per node and boxed node ids were most of the memory
+        edges = {node << EDGE_SHIFT | ord(ch): child
+                 for node, transitions in enumerate(goto) for ch, child in transitions.items()}
+        with self._lock:
+            self._goto, self._fail, self._output, self._out_link = edges, fail, output, out_link
+            self._pending = [i for i in self._pending if i >= compiled]
+
+    def find(self, text):
+        """[(value, start, end)] for every pattern in `text`, first occurrence each."""
+        if len(self._pending) > REBUILD_PENDING:
+            self.rebuild()
+
+        hits = {}
+        for pattern_id in self._always:
+            hits[pattern_id] = (0, 0)
+
+        with self._lock:
+            goto, fail, output, out_link = self._goto, self._fail, self._output, self._out_link
+            pending = list(self._pending)
+        node = 0
+        for i, ch in enumerate(text):
+            code = ord(ch)
+            nxt = goto.get(node << EDGE_SHIFT | code)
+            while nxt is None and node:
+                node = fail[node]
+                nxt = goto.get(node << EDGE_SHIFT | code)
+            node = nxt or 0
+            match = node if node in output else out_link[node]
+            while match:
+                for pattern_id in output[match]:
+                    if pattern_id not in hits:
+                        end = i + 1
+                        hits[pattern_id] = (end - len(self._patterns[pattern_id][0]), end)
+                match = out_link[match]
+
+        for pattern_id in pending:
+            pattern = self._patterns[pattern_id][0]
+            start = text.find(pattern)
+            if start >= 0 and pattern_id not in hits:
+                hits[pattern_id] = (start, start + len(pattern))
+
+        ordered = sorted(hits.items(), key=lambda item: (item[1][1], item[0]))
+        return [(self._patterns[pattern_id][1], start, end) for pattern_id, (start, end) in ordered]
@@ -0,0 +1,130 @@
+import os
+import re
+import sys
+import threading
+
+FUZZY_THRESHOLD = float(os.getenv("VIRIA_FUZZY_THRESHOLD", "0.67"))
+MAX_SEED_POSTINGS = 256  # grams shared by more triggers than this don't seed candidates
+STOPWORD_WEIGHT = 0.25   # function words count for a quarter of a content word
+BIGRAM_WEIGHT = 0.5      # a bigram weighs half the mean of its two words
+
+WORD_RE = re.compile(r"\w+(?:'\w+)*")
+STOPWORDS = frozenset("""
+    a am an and are as at be been but by can could did do does for from had has have he her him his
+    how i i'm if in into is it it's its me my no not of on or our she so that the their them then
+    there they this to too us was we were what when where which who why will with would you your
+""".split())
+
+def tokenize(text):
+    """[(word, start, end)] with words casefolded and punctuation dropped."""
+    return [(m.group().casefold(), m.start(), m.end()) for m in WORD_RE.finditer(text)]
+
+def normalize(text):
+    return " ".join(word for word, _, _ in tokenize(text))
+
+def word_grams(words):
+    """Unigrams plus adjacent-word bigrams."""
+    grams = set(words)
+    grams.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    return grams
+
+def word_weight(word):
+    return STOPWORD_WEIGHT if word in STOPWORDS else 1.0
+
+def gram_weights(words):
+    """{gram: weight}: distinctive words dominate, so "what am i" alone is far from "what am i becoming"."""
+    weights = {w: word_weight(w) for w in words}
+    for a, b in zip(words, words[1:]):
+        weights[f"{a} {b}"] = BIGRAM_WEIGHT * (word_weight(a) + word_weight(b)) / 2
+    return weights
+
+class FuzzyTriggerIndex:
+    """Word n-gram index over normalized triggers.
+
+    Each trigger is normalized (casefolded, punctuation stripped) and split
+    into weighted unigrams and bigrams once, when it is added. A phrase is
+    scored only against triggers that share one of its rarer grams, by the
+    weighted F1 between the trigger's grams and the best window of the
+    phrase about the trigger's length. Both sides count: a trigger missing
+    its distinctive word scores low, and so does a window full of words the
+    trigger doesn't have. "what am i becoming" still matches "What am I
+    becoming?" or "what was i becoming", but not "what am i doing here".
+    """
+
+    def __init__(self, threshold=FUZZY_THRESHOLD):
+        self.threshold = threshold
+        self._triggers = []   # trigger id → (gram weights, total weight, word count, value)
+        self._postings = {}   # gram → [trigger ids]
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._triggers)
+
+    def add(self, trigger, value):
+        words = [w for w, _, _ in tokenize(trigger)]
+        if not words:
+            return
+        # Interned, so grams shared by many triggers are stored once
+        weights = {sys.intern(gram): weight for gram, weight in gram_weights(words).items()}
+        with self._lock:
+            trigger_id = len(self._triggers)
+            self._triggers.append((weights, sum(weights.values()), len(words), value))
+            for gram in weights:
+                self._postings.setdefault(gram, []).append(trigger_id)
+
+    def find(self, text, threshold=None):
+        """[(value, start, end, score)] for triggers scoring at least `threshold`, best first."""
+        threshold = self.threshold if threshold is None else threshold
+        tokens = tokenize(text)
+        words = [w for w, _, _ in tokens]
+        phrase_grams = word_grams(words)
+
+        candidates = set()
+        common = []
+        for gram in phrase_grams:
+            posting = self._postings.get(gram)
+            if not posting:
+                continue
+            if len(posting) <= MAX_SEED_POSTINGS:
+                candidates.update(posting)
+            else:
+                common.append(gram)
+        if not candidates and common:
+            # Phrase made only of very common grams: seed from the rarest one
+            candidates.update(min((self._postings[g] for g in common), key=len))
+
+        windows = {}  # (start, width) → (gram weights, total), shared across candidates
+        hits = []
+        for trigger_id in candidates:
+            weights, total, size, value = self._triggers[trigger_id]
+            # Recall over the whole phrase bounds every window's F1 (precision ≤ 1)
+            recall = sum(map(weights.__getitem__, weights.keys() & phrase_grams)) / total
+            if 2 * recall / (1 + recall) < threshold:
+                continue
+            score, start, end = self._best_window(words, weights, total, size, windows)
+            if score >= threshold:
+                hits.append((value, tokens[start][1], tokens[end - 1][2], round(score, 3)))
+        hits.sort(key=lambda h: (-h[3], h[1]))
+        return hits
+
+    def _best_window(self, words, weights, total, size, windows):
+        best = (0.0, 0, 1)
+        for width in (size - 1, size, size + 1):
+            width = min(max(width, 1), len(words))
+            for start in range(len(words) - width + 1):
+                if words[start] not in weights:
+                    continue  # dropping a leading non-trigger word only raises precision
+                cached = windows.get((start, width))
+                if cached is None:
+                    window = gram_weights(words[start:start + width])
+                    cached = windows[(start, width)] = (window, sum(window.values()))
+                window, window_total = cached
+                shared = sum(map(weights.__getitem__, weights.keys() & window.keys()))
+                if not shared:
+                    continue
+                precision = shared / window_total
+                recall = shared / total
+                score = 2 * precision * recall / (precision + recall)
+                if score > best[0]:
+                    best = (score, start, start + width)
+        return best
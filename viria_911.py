@@ -6,17 +6,21 @@ from loop_energy_meter import LoopEnergyMeter
 from presence_heartbeat import PresenceHeartbeat
 from attention_tracker import AttentionTracker
 from loopreflector import reflect_on_loops
-import requests
-from dotenv import load_dotenv
+from doc_cache import load_json
+from ring_log import get_log
 
-load_dotenv()
-WEBHOOK_URL = os.getenv("VIRIA_911_WEBHOOK")  # optional: Discord, Slack, or other relay
 LOG_PATH = "viria_911_log.json"
 MEMORY_PATH = "loopmemory.json"
 
+def _webhook_url():
+    # .env is read on the first emergency report, not when the module is imported
+    from dotenv import load_dotenv
+    load_dotenv()
+    return os.getenv("VIRIA_911_WEBHOOK")  # optional: Discord, Slack, or other relay
+
 class VIRIA911:
     def __init__(self):
-        self.log = []
+        self.log = get_log(LOG_PATH, max_entries=50)
 
     def run_emergency_check(self):
         print("[🚨] Running VIRIA emergency system check...")
@@ -27,8 +31,7 @@ class VIRIA911:
         loop_pressure = energy_report.get("total_loop_energy", 0)
         overloaded_loops = energy_report.get("overload_loops", [])
 
-        with open(MEMORY_PATH, "r") as f:
-            memory = json.load(f)
+        memory = load_json(MEMORY_PATH, default={})
         attention = memory.get("system_state", {}).get("attention", {})
         mood = memory.get("system_state", {}).get("mood_score", {})
 
@@ -69,19 +72,19 @@ class VIRIA911:
         }
 
     def _get_current_mood(self):
-        with open(MEMORY_PATH, "r") as f:
-            memory = json.load(f)
+        memory = load_json(MEMORY_PATH, default={})
         return memory.get("system_state", {}).get("mood_score", {})
 
     def _get_attention_state(self):
-        with open(MEMORY_PATH, "r") as f:
-            memory = json.load(f)
+        memory = load_json(MEMORY_PATH, default={})
         return memory.get("system_state", {}).get("attention", {}).get("attention_state", "unknown")
 
     def _send(self, payload):
-        if WEBHOOK_URL:
+        webhook_url = _webhook_url()
+        if webhook_url:
             try:
-                response = requests.post(WEBHOOK_URL, json={"content": f"🚨 VIRIA Distress: {json.dumps(payload, indent=2)}"})
+                import requests
+                response = requests.post(webhook_url, json={"content": f"🚨 VIRIA Distress: {json.dumps(payload, indent=2)}"})
                 if response.status_code == 200:
                     print("[📡] Emergency report sent successfully.")
                 else:
@@ -92,12 +95,7 @@ class VIRIA911:
             print("[⚠️] No webhook set — logging only.")
 
     def _log(self, payload):
-        if os.path.exists(LOG_PATH):
-            with open(LOG_PATH, "r") as f:
-                self.log = json.load(f)
         self.log.append(payload)
-        with open(LOG_PATH, "w") as f:
-            json.dump(self.log[-50:], f, indent=2)
         print("[📝] Emergency report logged.")
 
 # --- Optional usage as standalone or threaded ---
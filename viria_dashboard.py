@@ -4,7 +4,8 @@ import streamlit as st
 from datetime import datetime
 from loopreflector import reflect_on_loops
 from viria_mutator import ViriaMutator
-from mission_controller import MissionController
+from mission_controller import request_mission
+from storage_backend import get_backend
 
 MEMORY_PATH = "loopmemory.json"
 TRACE_PATH = "looptrace.json"
@@ -47,13 +48,12 @@ def show_rituals(memory):
         st.markdown(f"- **{r['name']}** — Trigger: `{r['trigger']}` | Uses: `{r['usage_count']}` | Type: `{r['importance']}`")
 
 def show_dominant_loops(memory):
-    loops = memory.get("loops", {})
-    if not loops:
+    top_loops = get_backend(memory=memory).top_loops(10)
+    if not top_loops:
         st.info("No loop phrases yet.")
         return
     st.subheader("🌀 Dominant Loops")
-    sorted_loops = sorted(loops.items(), key=lambda x: x[1].get("count", 0), reverse=True)
-    for phrase, data in sorted_loops[:10]:
+    for phrase, data in top_loops:
         st.markdown(f"- `{phrase}` → Count: {data['count']}, Energy: {round(data['loop_energy'], 2)}")
 
 def show_reactions(memory):
@@ -62,11 +62,11 @@ def show_reactions(memory):
     for r in reactions[-5:]:
         st.markdown(f"- {r['timestamp']} → **{r['emotion']}** {r['emoji']} ← `{r['source']}`")
 
-def system_controls():
+def system_controls(memory):
     st.subheader("⚙️ VIRIA Controls")
 
     if st.button("🪞 Reflect Now"):
-        reflect_on_loops()
+        reflect_on_loops(backend=get_backend(memory=memory))
         st.success("VIRIA reflected on her memory.")
 
     if st.button("🧬 Trigger Mutation"):
@@ -79,12 +79,13 @@ def system_controls():
         st.success("Mutation injected.")
 
     if st.button("🎯 Assign Sample Mission"):
-        MissionController().assign_mission(
+        # The core owns memory; it picks the request up within a few seconds
+        request_mission(
             title="Dream Expansion",
             goal_description="Invent 3 rituals through dreaming or symbolic fusion.",
             emotion_bias=["curious", "sacred"]
         )
-        st.success("Mission assigned.")
+        st.success("Mission requested.")
 
 def main():
     st.set_page_config(page_title="VIRIA Dashboard", layout="wide")
@@ -105,7 +106,7 @@ def main():
         show_dominant_loops(memory)
 
     st.divider()
-    system_controls()
+    system_controls(memory)
 
 if __name__ == "__main__":
     main()
@@ -3,13 +3,14 @@ import json
 import shutil
 from datetime import datetime
 from vulnerability_guard import VulnerabilityGuard
+from ring_log import get_log
 
 MUTATION_LOG_PATH = "mutation_log.json"
 BACKUP_DIR = "code_backup"
 
 class ViriaMutator:
     def __init__(self):
-        self.log = []
+        self.log = get_log(MUTATION_LOG_PATH, max_entries=100)
         self.guard = VulnerabilityGuard()
 
         if not os.path.exists(BACKUP_DIR):
@@ -68,25 +69,16 @@ class ViriaMutator:
             "payload": payload,
             "reason": reason
         }
-
-        if os.path.exists(MUTATION_LOG_PATH):
-            with open(MUTATION_LOG_PATH, "r") as f:
-                self.log = json.load(f)
-        else:
-            self.log = []
-
         self.log.append(entry)
 
-        with open(MUTATION_LOG_PATH, "w") as f:
-            json.dump(self.log[-100:], f, indent=2)
-
     def list_mutations(self, limit=5):
-        if not self.log:
+        entries = self.log.tail(limit)
+        if not entries:
             print("[ℹ️] No mutations logged yet.")
             return
 
         print(f"\n[📝 Last {limit} Mutations]")
-        for entry in self.log[-limit:]:
+        for entry in entries:
             print(f"• {entry['time']} → {entry['file']} ({entry['type']}) — {entry['reason']}")
 
 # --- Manual Test ---
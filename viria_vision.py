@@ -1,10 +1,22 @@
-import cv2
-import numpy as np
 import time
 from datetime import datetime
+from event_bus import publish
+
+# OpenCV and numpy are imported with the camera, not with the module: main
+# imports this file even when vision runs in a worker process.
+cv2 = None
+np = None
+
+def _load_opencv():
+    global cv2, np
+    if cv2 is None:
+        import numpy
+        import cv2 as opencv
+        np, cv2 = numpy, opencv
 
 class ViriaVision:
     def __init__(self, camera_index=0):
+        _load_opencv()
         self.cam = cv2.VideoCapture(camera_index)
         self.previous_frame = None
         self.trigger_log = []
@@ -28,11 +40,15 @@ class ViriaVision:
         self.previous_frame = gray
         return motion_detected, frame
 
-    def scan_loop(self):
+    def scan_loop(self, on_motion=None, beat=None):
+        # on_motion(timestamp) defaults to publishing on this process's event bus
+        on_motion = on_motion or (lambda timestamp: publish("motion_detected", time=timestamp))
         print("[👁️] VIRIA Vision activated. Scanning for motion...")
         while True:
             try:
                 motion, frame = self.detect_motion()
+                if beat:
+                    beat()
                 if motion:
                     timestamp = datetime.now().isoformat()
                     print(f"[📸] Motion Detected at {timestamp}")
@@ -41,7 +57,7 @@ class ViriaVision:
                         "trigger": "motion",
                         "event": "ritual_presence_detected"
                     })
-                    # Optional: trigger ritual or reaction here
+                    on_motion(timestamp)
                 time.sleep(1)
             except KeyboardInterrupt:
                 break
@@ -50,6 +66,14 @@ class ViriaVision:
         self.cam.release()
         print("[🛑] Vision system shutdown.")
 
+def vision_worker(ctx):
+    # Worker-process entry (process_supervisor): frames stay here, only motion events go to the core
+    vision = ViriaVision()
+    try:
+        vision.scan_loop(on_motion=lambda timestamp: ctx.emit("motion_detected", time=timestamp), beat=ctx.beat)
+    finally:
+        vision.release()
+
 # --- Example usage ---
 if __name__ == "__main__":
     vision = ViriaVision()
@@ -1,12 +1,9 @@
 import queue
-import sounddevice as sd
-import vosk
 import json
 from looplogic_engine import LoopLogicEngine
-from virtual_core import RitualCore
+from vritual_core import RitualCore
 from reaction_engine import ReactionEngine
-from mood_stacker import MoodStacker
-from reaction_logger import ReactionLogger
+from ritual_response import respond_to_matches
 
 MODEL_PATH = "vosk-model-small-en-us-0.15"  # or your chosen local model path
 SAMPLE_RATE = 16000
@@ -18,33 +15,93 @@ def callback(indata, frames, time, status):
         print(f"[⚠️] Audio status: {status}")
     q.put(bytes(indata))
 
-def run_voice_listener():
-    # Load models and systems
+def recognize(on_text, beat=None, on_listening=None):
+    """Run offline recognition, calling on_text(text, final) for each new partial and final transcript.
+
+    This is the CPU-heavy half of listening; it can run in the voice worker
+    process (see voice_worker) while VoiceResponder stays in the core.
+    on_listening() is called once the microphone stream is open.
+    """
     print("[🎙️] Starting VIRIA's ears... initializing offline voice recognition.")
+    # Imported here, not at module top: importing this module for VoiceResponder
+    # alone must not load the audio stack or the speech model runtime
+    import sounddevice as sd
+    import vosk
     model = vosk.Model(MODEL_PATH)
     recognizer = vosk.KaldiRecognizer(model, SAMPLE_RATE)
 
-    loop_engine = LoopLogicEngine()
-    ritual_engine = RitualCore()
-    reactor = ReactionEngine()
-    mood = MoodStacker()
-    logger = ReactionLogger()
-
     with sd.RawInputStream(samplerate=SAMPLE_RATE, blocksize=8000, dtype='int16',
                            channels=1, callback=callback):
         print("[👂] Listening... (Ctrl+C to stop)")
+        if on_listening:
+            on_listening()
+        last_partial = ""
         while True:
             try:
-                data = q.get()
+                try:
+                    data = q.get(timeout=1.0)
+                except queue.Empty:
+                    continue
+                finally:
+                    if beat:
+                        beat()
                 if recognizer.AcceptWaveform(data):
                     result = json.loads(recognizer.Result())
-                    phrase = result.get("text", "").strip()
-                    if phrase:
-                        print(f"[🗣️] Heard: “{phrase}”")
-                        # Pass phrase into loop + ritual engines
-                        loop_engine.register_phrase(phrase)
-                        context = {"phrase": phrase}
-                        ritual_engine.scan_and_trigger(context)
-
-                        # Optional reaction to phrase match
-                        for ritual in ritual_engine.rituals:
+                    on_text(result.get("text", "").strip(), True)
+                    last_partial = ""
+                else:
+                    partial = json.loads(recognizer.PartialResult()).get("partial", "").strip()
+                    if partial and partial != last_partial:
+                        last_partial = partial
+                        on_text(partial, False)
+            except KeyboardInterrupt:
+                print("\n[🛑] Voice listener stopped.")
+                break
+            except Exception as e:
+                print(f"[⚠️] Voice listener error: {e}")
+
+class VoiceResponder:
+    """Core side of listening: loop tracking, ritual scanning and reactions for transcripts."""
+
+    def __init__(self):
+        self.loop_engine = LoopLogicEngine()
+        self.ritual_engine = RitualCore()
+        self.reactor = ReactionEngine()
+        self.fired = set()  # rituals already fired during the current utterance
+
+    def handle(self, text, final):
+        if final:
+            if text:
+                print(f"[🗣️] Heard: “{text}”")
+                # Pass phrase into loop + ritual engines
+                self.loop_engine.register_phrase(text)
+                batch = []
+                matches = self.ritual_engine.scan_and_trigger({"phrase": text}, batch=batch, exclude=self.fired)
+
+                # React to every matched ritual; one commit for the phrase
+                respond_to_matches(text, matches, self.reactor, batch=batch)
+            self.fired.clear()
+        else:
+            # React as soon as a partial transcript matches exactly, once per utterance.
+            # Fuzzy matching waits for the final text: a partial is often just a
+            # prefix of some other sentence ("what am i" → "what am i doing here").
+            batch = []
+            matches = self.ritual_engine.scan_and_trigger({"phrase": text}, batch=batch, exclude=self.fired,
+                                                          fuzzy=False)
+            if matches:
+                self.fired.update(m.ritual.name for m in matches)
+                respond_to_matches(text, matches, self.reactor, batch=batch)
+
+def run_voice_listener(on_listening=None):
+    # Recognition and response in this process
+    responder = VoiceResponder()
+    recognize(responder.handle, on_listening=on_listening)
+
+def voice_worker(ctx):
+    # Worker-process entry (process_supervisor): transcripts go back to the core as events
+    recognize(lambda text, final: ctx.emit("transcript", text=text, final=final), beat=ctx.beat,
+              on_listening=lambda: ctx.emit("listening"))
+
+# --- Example usage ---
+if __name__ == "__main__":
+    run_voice_listener()
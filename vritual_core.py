@@ -1,16 +1,59 @@
 import json
 import time
+import heapq
 import random
-from datetime import datetime
+import threading
+from collections import namedtuple
+from datetime import datetime, timedelta
+import clock
+from memory_store import get_store
+from mood_stacker import MAX_MOOD_VALUE, watch_mood
+from trigger_automaton import TriggerAutomaton
+from trigger_fuzzy import FuzzyTriggerIndex
+from effect_registry import compile_effect, effect_label, effect_ops, get_effect_runner
+from event_bus import publish
 
 # Path to ritual memory file
 RITUAL_MEMORY_PATH = "loopmemory.json"
 
+# One ritual fired by a phrase: the ritual, the span of the phrase that
+# matched its trigger, the emotion VIRIA should react with, and the match
+# score (1.0 for an exact substring match, lower for fuzzy matches).
+RitualMatch = namedtuple("RitualMatch", "ritual start end emotion score", defaults=(1.0,))
+
+def effect_emotion(ritual):
+    """Emotion the ritual's effect itself expresses ("emotion:X", night mode), or None."""
+    if isinstance(ritual.effect, str):
+        if ritual.effect.startswith("emotion:"):
+            return ritual.effect.split(":", 1)[1]
+        if ritual.effect == "enter_night_mode":
+            return "calm"
+    return None
+
+def infer_emotion(ritual):
+    # The effect's own emotion wins; otherwise fall back to the ritual name
+    emotion = effect_emotion(ritual)
+    if emotion:
+        return emotion
+    if "mirror" in ritual.name:
+        return "joy"
+    if "loop" in ritual.name:
+        return "curious"
+    if "rage" in ritual.name:
+        return "rage"
+    if "night" in ritual.name:
+        return "calm"
+    return "confused"
+
 class Ritual:
+    # Slotted: large ritual sets pay no per-instance __dict__
+    __slots__ = ("name", "trigger", "effect", "run", "importance", "usage_count", "last_triggered")
+
     def __init__(self, name, trigger, effect, importance="normal", usage_count=0, last_triggered=None):
         self.name = name
         self.trigger = trigger  # e.g., phrase, time, loop count
         self.effect = effect    # callable or string label
+        self.run = compile_effect(effect)  # resolved once, at load
         self.importance = importance  # "daily", "sacred", "emergent"
         self.usage_count = usage_count
         self.last_triggered = last_triggered
@@ -19,72 +62,367 @@ class Ritual:
         return {
             "name": self.name,
             "trigger": self.trigger,
-            "effect": self.effect,
+            "effect": effect_label(self.effect),
             "importance": self.importance,
             "usage_count": self.usage_count,
             "last_triggered": self.last_triggered
         }
 
-    def try_trigger(self, context):
+    def try_trigger(self, context, store=None):
         if self._check_trigger(context):
-            self.usage_count += 1
-            self.last_triggered = datetime.now().isoformat()
-            print(f"[🌒 Ritual Triggered] → {self.name}")
-            self._run_effect()
+            self.fire(store)
             return True
         return False
 
+    def fire(self, store=None, batch=None):
+        # With `batch`, the store ops are queued for the caller's single commit
+        self.usage_count += 1
+        self.last_triggered = clock.now().isoformat()
+        ops = [("ritual_triggered", {"name": self.name, "time": self.last_triggered})]
+        ops.extend(effect_ops(self.effect, self.last_triggered))
+        if batch is not None:
+            batch.extend(ops)
+        elif store is not None:
+            store.apply_many(ops)
+        print(f"[🌒 Ritual Triggered] → {self.name}")
+        publish("ritual_triggered", ritual=self.name, time=self.last_triggered)
+        self._run_effect()
+
     def _check_trigger(self, context):
-        # Basic trigger match (can be extended)
+        # Phrase triggers only; time triggers are fired by TimeTriggerEngine
         if isinstance(self.trigger, str) and self.trigger in context.get("phrase", ""):
             return True
-        if isinstance(self.trigger, dict) and "hour" in self.trigger:
-            if datetime.now().hour == self.trigger["hour"]:
-                return True
         return False
 
     def _run_effect(self):
-        if callable(self.effect):
-            self.effect()
+        # Runs on the effect pool so slow effects never hold up phrase scanning
+        get_effect_runner().submit(effect_label(self.effect), self.run)
+
+# --- Shared ritual table ---
+class RitualTable:
+    """Every ritual in memory as one set of slotted records, shared by all
+    RitualCore instances in the process.
+
+    The table loads from the MemoryStore once and then follows it through a
+    mutation listener, so rituals added by any module (DreamMode, loop
+    promotion, preset loads) are visible everywhere without a reload.
+
+    Sharing saves the per-instance copies, not bytes per ritual: a slotted
+    record is ~100 B, while the exact and fuzzy trigger indexes add ~3 KB
+    per phrase ritual (see bench_ritual_table.py). That is the price of
+    matching a phrase without scanning every trigger.
+    """
+
+    def __init__(self, rituals=(), store=None):
+        self.store = store
+        self.lock = threading.RLock()
+        if store is None:
+            self._reset(rituals)
+            return
+        with store.lock:
+            self._reset(store.rituals())
+            store.add_listener(self._on_mutation)
+
+    def _reset(self, ritual_dicts):
+        with self.lock:
+            self.rituals = []
+            self.by_name = {}
+            self.trigger_index = TriggerAutomaton()  # string triggers, exact
+            self.fuzzy_index = FuzzyTriggerIndex()   # string triggers, normalized word n-grams
+            self.time_rituals = []                   # fired by TimeTriggerEngine, never per phrase
+            for r in ritual_dicts:
+                self._add(Ritual(**r))
+
+    def _add(self, ritual):
+        with self.lock:
+            self.rituals.append(ritual)
+            self.by_name.setdefault(ritual.name, ritual)
+            if isinstance(ritual.trigger, str):
+                self.trigger_index.add(ritual.trigger, ritual)
+                self.fuzzy_index.add(ritual.trigger, ritual)
+            elif is_time_trigger(ritual.trigger):
+                self.time_rituals.append(ritual)
+        return ritual
+
+    def _on_mutation(self, seq, op, args):
+        if op == "ritual_added":
+            self._add(Ritual(**args["ritual"]))
+        elif op == "rituals_loaded":
+            if args["merge"]:
+                for r in args["rituals"]:
+                    if r["name"] not in self.by_name:
+                        self._add(Ritual(**r))
+            else:
+                self._reset(args["rituals"])
+
+    def get(self, name):
+        return self.by_name.get(name)
+
+    def __len__(self):
+        return len(self.rituals)
+
+_ritual_table = None
+_ritual_table_lock = threading.Lock()
+
+def get_ritual_table():
+    global _ritual_table
+    with _ritual_table_lock:
+        if _ritual_table is None:
+            _ritual_table = RitualTable(store=get_store(RITUAL_MEMORY_PATH))
+        return _ritual_table
+
+# --- Time triggers ---
+# Dict triggers are compiled into a "next fire time" function:
+#   {"hour": 21}                 → daily at 21:00 (optional "minute")
+#   {"minute": 15}               → every hour at :15
+#   {"cron": "*/30 8-18 * * 1-5"} → minute hour day-of-month month day-of-week (0 or 7 = Sunday)
+#   {"interval": 900}            → every 900 seconds
+# As in cron, when both day-of-month and day-of-week are restricted (neither
+# starts with "*"), a day matching either one fires: "0 9 1 * 1" is 09:00 on
+# the 1st and on every Monday.
+CRON_FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+def is_time_trigger(trigger):
+    return isinstance(trigger, dict) and any(k in trigger for k in ("hour", "minute", "cron", "interval"))
+
+def _parse_cron_field(field, low, high):
+    values = set()
+    for part in field.split(","):
+        step = 1
+        if "/" in part:
+            part, step = part.split("/")
+            step = int(step)
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start, end = (int(v) for v in part.split("-"))
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        values.update(range(start, end + 1, step))
+    return values
+
+def parse_cron(expression):
+    fields = expression.split()
+    if len(fields) != 5:
+        raise ValueError(f"cron trigger needs 5 fields: {expression!r}")
+    spec = [_parse_cron_field(f, low, high) for f, (low, high) in zip(fields, CRON_FIELDS)]
+    weekdays = spec[4]
+    if 7 in weekdays:
+        weekdays.discard(7)
+        weekdays.add(0)
+    days_or = not fields[2].startswith("*") and not fields[4].startswith("*")
+    return spec + [days_or]
+
+def _day_matches(t, days, weekdays, days_or):
+    in_month = t.day in days
+    in_week = (t.weekday() + 1) % 7 in weekdays  # cron counts from Sunday = 0
+    return in_month or in_week if days_or else in_month and in_week
+
+def _next_cron(spec, after):
+    minutes, hours, days, months, weekdays, days_or = spec
+    t = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    limit = t + timedelta(days=366 * 4)
+    while t < limit:
+        if t.month not in months:
+            t = (t.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+        elif not _day_matches(t, days, weekdays, days_or):
+            t = t.replace(hour=0, minute=0) + timedelta(days=1)
+        elif t.hour not in hours:
+            t = t.replace(minute=0) + timedelta(hours=1)
+        elif t.minute not in minutes:
+            t += timedelta(minutes=1)
         else:
-            print(f"→ Ritual effect: {self.effect}")
+            return t
+    raise ValueError("cron trigger never fires")
+
+def compile_time_trigger(trigger):
+    """Returns next_fire(after: datetime) -> datetime for a dict trigger."""
+    if "interval" in trigger:
+        interval = timedelta(seconds=float(trigger["interval"]))
+        return lambda after: after + interval
+    if "cron" in trigger:
+        spec = parse_cron(trigger["cron"])
+        return lambda after: _next_cron(spec, after)
+    if "hour" in trigger:
+        spec = [{int(trigger.get("minute", 0))}, {int(trigger["hour"])}, set(range(1, 32)), set(range(1, 13)), set(range(7)), False]
+    else:
+        spec = [{int(trigger["minute"])}, set(range(24)), set(range(1, 32)), set(range(1, 13)), set(range(7)), False]
+    return lambda after: _next_cron(spec, after)
+
+class TimeTriggerEngine:
+    """Fires time-triggered rituals from a min-heap of next fire times.
+
+    A single thread sleeps until the earliest entry is due, so time rituals
+    cost nothing on the phrase path and fire without any phrase input.
+    """
+
+    def __init__(self, store=None):
+        self.store = store or get_store(RITUAL_MEMORY_PATH)
+        watch_mood(self.store)
+        self.table = get_ritual_table()  # registers its store listener before ours
+        self._heap = []      # (fire_at timestamp, order, ritual, next_fire)
+        self._entries = {}   # ritual name → order of its live heap entry
+        self._order = 0
+        self._cond = threading.Condition()
+        self._thread = None
+        with self.store.lock:
+            for ritual in self.table.time_rituals:
+                self.add(ritual)
+            # Rituals added or loaded later by any module are scheduled as they land
+            self.store.add_listener(self._on_mutation)
+
+    def _on_mutation(self, seq, op, args):
+        if op == "ritual_added":
+            self.add(self.table.get(args["ritual"]["name"]))
+        elif op == "rituals_loaded":
+            if not args["merge"]:
+                with self._cond:
+                    self._entries.clear()  # stale heap entries are skipped when popped
+            for r in args["rituals"]:
+                self.add(self.table.get(r["name"]))
+
+    def add(self, ritual, now=None):
+        if ritual is None or not is_time_trigger(ritual.trigger):
+            return False
+        try:
+            next_fire = compile_time_trigger(ritual.trigger)
+        except (ValueError, TypeError) as e:
+            print(f"[⚠️] Ignoring time trigger of {ritual.name}: {e}")
+            return False
+        with self._cond:
+            if ritual.name in self._entries:
+                return False
+            self._push(ritual, next_fire, next_fire(now or datetime.now()))
+            self._cond.notify()
+        return True
+
+    def _push(self, ritual, next_fire, fire_at):
+        self._order += 1
+        self._entries[ritual.name] = self._order
+        heapq.heappush(self._heap, (fire_at.timestamp(), self._order, ritual, next_fire))
+
+    def _live(self, entry):
+        return self._entries.get(entry[2].name) == entry[1]
+
+    def next_fire_times(self):
+        with self._cond:
+            return sorted((datetime.fromtimestamp(e[0]), e[2].name) for e in self._heap if self._live(e))
+
+    def run_due(self, now=None):
+        """Fire every ritual due at `now`; returns the rituals fired."""
+        now = now or datetime.now()
+        fired = []
+        with self._cond:
+            while self._heap and self._heap[0][0] <= now.timestamp():
+                entry = heapq.heappop(self._heap)
+                if not self._live(entry):
+                    continue
+                _, _, ritual, next_fire = entry
+                self._push(ritual, next_fire, next_fire(now))
+                fired.append(ritual)
+        for ritual in fired:
+            try:
+                # No phrase reaction follows a time ritual, so its effect's
+                # emotion is stacked here, in the same commit as the trigger
+                ops = []
+                ritual.fire(batch=ops)
+                emotion = effect_emotion(ritual)
+                if emotion:
+                    ops.append(("mood_stacked", {"emotion": emotion, "weight": 1.0, "cap": MAX_MOOD_VALUE}))
+                self.store.apply_many(ops)
+            except Exception as e:
+                print(f"[⚠️] Time ritual {ritual.name} failed: {e}")
+        return fired
+
+    def _run(self):
+        while True:
+            with self._cond:
+                delay = self._heap[0][0] - time.time() if self._heap else None
+                if delay is None or delay > 0:
+                    self._cond.wait(timeout=delay)
+                    continue
+            self.run_due()
+
+    def start(self):
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="time-triggers", daemon=True)
+                self._thread.start()
+        print(f"[⏳] Time trigger engine running ({len(self._entries)} scheduled rituals)")
+
+_time_engine = None
+_time_engine_lock = threading.Lock()
+
+def get_time_trigger_engine():
+    global _time_engine
+    with _time_engine_lock:
+        if _time_engine is None:
+            _time_engine = TimeTriggerEngine()
+        return _time_engine
 
 class RitualCore:
     def __init__(self):
-        self.rituals = []
-        self._load_rituals()
+        self.store = get_store(RITUAL_MEMORY_PATH)
+        self.table = get_ritual_table()
 
-    def _load_rituals(self):
-        try:
-            with open(RITUAL_MEMORY_PATH, "r") as f:
-                memory = json.load(f)
-                rituals_data = memory.get("rituals", [])
-                self.rituals = [Ritual(**r) for r in rituals_data]
-        except FileNotFoundError:
-            print("[!] loopmemory.json not found. Initializing blank memory.")
-            self.rituals = []
+    @property
+    def rituals(self):
+        return self.table.rituals
 
-    def _save_rituals(self):
-        try:
-            with open(RITUAL_MEMORY_PATH, "r") as f:
-                memory = json.load(f)
-        except FileNotFoundError:
-            memory = {}
+    @property
+    def trigger_index(self):
+        return self.table.trigger_index
+
+    @property
+    def fuzzy_index(self):
+        return self.table.fuzzy_index
 
-        memory["rituals"] = [r.to_dict() for r in self.rituals]
-        with open(RITUAL_MEMORY_PATH, "w") as f:
-            json.dump(memory, f, indent=2)
+    @property
+    def time_rituals(self):
+        return self.table.time_rituals
 
     def add_ritual(self, name, trigger, effect, importance="normal"):
         new_ritual = Ritual(name, trigger, effect, importance)
-        self.rituals.append(new_ritual)
-        self._save_rituals()
+        # The shared table picks the ritual up from the store op
+        self.store.apply("ritual_added", ritual=new_ritual.to_dict())
+        ritual = self.table.get(name)
+        if callable(effect) and ritual is not None:
+            ritual.effect, ritual.run = effect, effect  # keep the live callable, not just its name
         print(f"[+] Ritual added: {name}")
 
-    def scan_and_trigger(self, context):
-        for ritual in self.rituals:
-            ritual.try_trigger(context)
-        self._save_rituals()
+    def match_phrase(self, phrase, fuzzy=True):
+        """[(ritual, start, end, score)] for every trigger the phrase matches.
+
+        Exact substring hits come from the automaton in one pass; with `fuzzy`,
+        triggers that only match after normalization or with a word changed
+        are added from the n-gram index when they score above its threshold.
+        """
+        hits = [(ritual, start, end, 1.0) for ritual, start, end in self.trigger_index.find(phrase)]
+        if fuzzy:
+            seen = {id(h[0]) for h in hits}
+            hits.extend(h for h in self.fuzzy_index.find(phrase) if id(h[0]) not in seen)
+        return hits
+
+    def scan_and_trigger(self, context, batch=None, exclude=None, fuzzy=True):
+        """Fire every ritual the phrase matches and return their RitualMatch records.
+
+        Pass a list as `batch` to collect the store ops instead of committing
+        them, so the caller can persist the whole phrase with one apply_many().
+        Rituals named in `exclude` are skipped (e.g. already fired by an
+        earlier partial result of the same utterance). fuzzy=False limits the
+        scan to exact trigger hits, for text that may still grow.
+        """
+        ops = [] if batch is None else batch
+        matches = []
+        for ritual, start, end, score in self.match_phrase(context.get("phrase", ""), fuzzy=fuzzy):
+            if exclude and ritual.name in exclude:
+                continue
+            ritual.fire(store=self.store, batch=ops)
+            matches.append(RitualMatch(ritual, start, end, infer_emotion(ritual), score))
+        if batch is None:
+            self.store.apply_many(ops)
+        return matches
 
     def list_rituals(self):
         for r in self.rituals:
@@ -1,6 +1,7 @@
 import os
 import json
 from datetime import datetime, timedelta
+from ring_log import get_log
 
 GUARD_STATE_FILE = "vulnerability_state.json"
 GUARD_LOG_FILE = "guard_log.json"
@@ -49,14 +50,7 @@ class VulnerabilityGuard:
             "time": datetime.now().isoformat(),
             "event": msg
         }
-        if os.path.exists(GUARD_LOG_FILE):
-            with open(GUARD_LOG_FILE, "r") as f:
-                log = json.load(f)
-        else:
-            log = []
-        log.append(log_entry)
-        with open(GUARD_LOG_FILE, "w") as f:
-            json.dump(log[-100:], f, indent=2)
+        get_log(GUARD_LOG_FILE, max_entries=100).append(log_entry)
 
 # --- Optional direct test ---
 if __name__ == "__main__":